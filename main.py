@@ -1,14 +1,39 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from argparse import ArgumentParser
+import os
+import signal
+from argparse import ArgumentParser, ArgumentTypeError
+from dataclasses import replace
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
-from MLOps_service import run_training_with_tracking
+from MLOps_service import (
+    run_cross_validation_with_tracking,
+    run_incremental_training_with_tracking,
+    run_training_with_tracking,
+    run_tuning_with_tracking,
+)
 
 from MLOps_service import register_run
-from feature_delivery_service import ingest_and_label
+from feature_delivery_service import (
+    backfill_and_label,
+    ingest_and_label,
+    PollingSource,
+    ReplaySource,
+    StreamIngestor,
+    materialize_features,
+    repair_gaps_and_label,
+    run_multi_stream_ingestion,
+)
+from feature_delivery_service.tools.async_binance_client import AsyncBinanceClient
+from feature_delivery_service.tools.config import (
+    load_ingestion_config,
+    load_multi_stream_config,
+)
+from feature_delivery_service.tools.singletons import get_duckdb_storage_manager
 from reporting import generate_ingestion_report
 
 LOG_FORMAT = "%(asctime)s | %(name)s | %(levelname)s | %(message)s"
@@ -22,6 +47,19 @@ logging.getLogger().addHandler(file_handler)
 logger = logging.getLogger(__name__)
 
 
+def _epoch_ms(value: str) -> int:
+    """Parse an ISO date/datetime (UTC unless offset given) or epoch ms."""
+    if value.isdigit():
+        return int(value)
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError as exc:
+        raise ArgumentTypeError(f"Invalid timestamp: {value}") from exc
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp() * 1000)
+
+
 def build_parser() -> ArgumentParser:
     parser = ArgumentParser(
         description="Bitcoin-ML-cycle-sandbox-project orchestration CLI"
@@ -34,6 +72,110 @@ def build_parser() -> ArgumentParser:
         help="Fetch Bitcoin candles and persist them via DuckDB",
     )
 
+    # Flags reserved for the long-running streaming daemon.
+    stream_parser = subparsers.add_parser(
+        "stream",
+        help="Continuously ingest closed candles and keep labels/features current",
+    )
+    stream_parser.add_argument(
+        "--replay-file",
+        type=Path,
+        default=None,
+        help="Replay klines from a JSON file instead of polling Binance",
+    )
+    stream_parser.add_argument(
+        "--follow-clock",
+        action="store_true",
+        help="Release replayed klines only once their close time has passed",
+    )
+    stream_parser.add_argument(
+        "--push-url",
+        default=os.getenv("STREAM_PUSH_URL"),
+        help="API /features URL to push fresh feature rows to",
+    )
+    stream_parser.add_argument(
+        "--max-batch-rows",
+        type=int,
+        default=1000,
+        help="Maximum klines written per transaction",
+    )
+    stream_parser.add_argument(
+        "--poll-delay",
+        type=float,
+        default=1.0,
+        help="Seconds after each candle close before polling Binance",
+    )
+
+    # Flags reserved for many (symbol, interval) streams at once.
+    streams_parser = subparsers.add_parser(
+        "ingest-streams",
+        help="Fetch every configured (symbol, interval) stream into one table",
+    )
+    streams_parser.add_argument(
+        "--config",
+        type=Path,
+        default=None,
+        help="Multi-stream config JSON (default: MULTI_STREAM_INGEST_CONFIG)",
+    )
+    streams_parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=None,
+        help="Maximum number of concurrent Binance requests",
+    )
+
+    # Flags reserved for historical backfills.
+    backfill_parser = subparsers.add_parser(
+        "backfill",
+        help="Fetch a historical range of Bitcoin candles page by page",
+    )
+    backfill_parser.add_argument(
+        "--start",
+        required=True,
+        type=_epoch_ms,
+        help="Range start as ISO date/datetime (UTC) or epoch milliseconds",
+    )
+    backfill_parser.add_argument(
+        "--end",
+        required=True,
+        type=_epoch_ms,
+        help="Range end (exclusive) as ISO date/datetime (UTC) or epoch milliseconds",
+    )
+    backfill_parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=4,
+        help="Maximum number of concurrent Binance requests",
+    )
+
+    # Flags reserved for repairing missing candles.
+    repair_parser = subparsers.add_parser(
+        "repair-gaps",
+        help="Find missing Bitcoin candles and refetch only those windows",
+    )
+    repair_parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=4,
+        help="Maximum number of concurrent Binance requests",
+    )
+    repair_parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only report gaps without fetching anything",
+    )
+
+    # Flags reserved for rebuilding engineered features.
+    features_parser = subparsers.add_parser(
+        "features",
+        help="Materialize the registered feature set from stored candles",
+    )
+    features_parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Recompute every row instead of only the newest candles",
+    )
+
     # Flags reserved for tracking experiments.
     track_parser = subparsers.add_parser(
         "track", help="Train model and log results with MLFlow"
@@ -49,6 +191,149 @@ def build_parser() -> ArgumentParser:
         help="Optional MLFlow run name",
     )
 
+    # Flags reserved for out-of-core incremental training.
+    incremental_parser = subparsers.add_parser(
+        "train-incremental",
+        help="Stream labeled candles from DuckDB into an SGD classifier",
+    )
+    incremental_parser.add_argument(
+        "--experiment",
+        default="default",
+        help="MLFlow experiment name",
+    )
+    incremental_parser.add_argument(
+        "--run-name",
+        default=None,
+        help="Optional MLFlow run name",
+    )
+    incremental_parser.add_argument(
+        "--resume-run-id",
+        default=None,
+        help="Continue from this run's model using only newer candles",
+    )
+    incremental_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=100_000,
+        help="Rows streamed from DuckDB per partial_fit call",
+    )
+    incremental_parser.add_argument(
+        "--epochs",
+        type=int,
+        default=1,
+        help="Passes over the streamed candles",
+    )
+    incremental_parser.add_argument(
+        "--alpha",
+        type=float,
+        default=1e-4,
+        help="SGDClassifier regularization strength",
+    )
+
+    # Flags reserved for hyperparameter tuning.
+    tune_parser = subparsers.add_parser(
+        "tune",
+        help="Search hyperparameters in parallel and log trials as MLFlow child runs",
+    )
+    tune_parser.add_argument(
+        "--experiment",
+        default="default",
+        help="MLFlow experiment name",
+    )
+    tune_parser.add_argument(
+        "--run-name",
+        default=None,
+        help="Optional name for the parent MLFlow run",
+    )
+    tune_parser.add_argument(
+        "--search-space",
+        default="config/tuning_search_space.json",
+        help="JSON file mapping model families to hyperparameter grids",
+    )
+    tune_parser.add_argument(
+        "--metric",
+        default="roc_auc",
+        choices=["roc_auc", "accuracy", "f1"],
+        help="Held-out metric used to pick the best trial",
+    )
+    tune_parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=None,
+        help="Trials fitted in parallel (default: all cores)",
+    )
+    tune_parser.add_argument(
+        "--limit",
+        type=int,
+        default=5000,
+        help="Number of labeled candles to train on",
+    )
+    tune_parser.add_argument(
+        "--model-name",
+        default=None,
+        help="Register the best trial under this model name",
+    )
+    tune_parser.add_argument(
+        "--alias",
+        default=None,
+        help="Optional alias for the registered best trial",
+    )
+
+    # Flags reserved for walk-forward cross-validation.
+    cv_parser = subparsers.add_parser(
+        "cv",
+        help="Walk-forward cross-validate the classifier and log folds to MLFlow",
+    )
+    cv_parser.add_argument(
+        "--experiment",
+        default="default",
+        help="MLFlow experiment name",
+    )
+    cv_parser.add_argument(
+        "--run-name",
+        default=None,
+        help="Optional MLFlow run name",
+    )
+    cv_parser.add_argument(
+        "--folds",
+        type=int,
+        default=5,
+        help="Number of consecutive test windows",
+    )
+    cv_parser.add_argument(
+        "--family",
+        default="logistic_regression",
+        choices=["logistic_regression", "xgboost"],
+        help="Model family to evaluate",
+    )
+    cv_parser.add_argument(
+        "--limit",
+        type=int,
+        default=None,
+        help="Only use the first N labeled candles (default: all)",
+    )
+    cv_parser.add_argument(
+        "--gap",
+        type=int,
+        default=1,
+        help=(
+            "Rows skipped between each training window and its test window "
+            "(at least the one-candle label horizon)"
+        ),
+    )
+    cv_parser.add_argument(
+        "--max-train-size",
+        type=int,
+        default=None,
+        help="Use a sliding training window of this many rows instead of expanding",
+    )
+    cv_parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=None,
+        help="Folds evaluated in parallel (default: all cores)",
+    )
+
     # Flags reserved for model registration
     register_parser = subparsers.add_parser(
         "register",
@@ -69,6 +354,46 @@ def build_parser() -> ArgumentParser:
     return parser
 
 
+async def _run_stream(args) -> dict[str, float]:
+    """Run the streaming daemon until its source ends or SIGINT/SIGTERM."""
+    config = load_ingestion_config()
+    ingestor = StreamIngestor(
+        table=config.table,
+        interval=config.interval,
+        max_batch_rows=args.max_batch_rows,
+        push_url=args.push_url,
+    )
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    if args.replay_file is not None:
+        source = ReplaySource.from_file(
+            args.replay_file, follow_clock=args.follow_clock
+        )
+        stats = await ingestor.run(source, stop)
+        return stats.summary()
+
+    high_water_mark = get_duckdb_storage_manager().max_value(config.table, "open_time")
+    async with AsyncBinanceClient() as client:
+        source = PollingSource(
+            client,
+            interval=config.interval,
+            # Naive timestamps are local time, as stored by the decoders. The
+            # high-water-mark candle itself is refetched: REST ingest may have
+            # stored it while still in progress, and the upsert is idempotent.
+            start_time=(
+                int(high_water_mark.timestamp() * 1000)
+                if high_water_mark is not None
+                else None
+            ),
+            poll_delay=args.poll_delay,
+        )
+        stats = await ingestor.run(source, stop)
+    return stats.summary()
+
+
 def main(argv: Optional[list[str]] = None) -> None:
     parser = build_parser()
     args = parser.parse_args(argv)
@@ -81,19 +406,131 @@ def main(argv: Optional[list[str]] = None) -> None:
             summary["total_rows"],
         )
         logger.info(
-            "Materialized %s labeled BTC candles",
+            "Materialized %s labeled BTC candles and %s feature rows",
             summary["labeled_rows"],
+            summary["feature_rows"],
         )
         report_path = generate_ingestion_report()
         logger.info("Generated ingestion report at %s", report_path)
         return
 
+    if args.command == "stream":
+        logger.info("Starting streaming ingestion")
+        summary = asyncio.run(_run_stream(args))
+        logger.info("Streaming ingestion stopped: %s", summary)
+        return
+
+    if args.command == "ingest-streams":
+        config = load_multi_stream_config(args.config)
+        if args.max_workers is not None:
+            config = replace(config, max_workers=args.max_workers)
+        new_rows, total_rows = run_multi_stream_ingestion(config)
+        logger.info(
+            "Stored %s new candles across %s streams (total=%s)",
+            new_rows,
+            len(config.streams),
+            total_rows,
+        )
+        return
+
+    if args.command == "backfill":
+        summary = backfill_and_label(
+            args.start,
+            args.end,
+            max_workers=args.max_workers,
+        )
+        logger.info(
+            "Backfilled %s new BTC candles (total=%s)",
+            summary["ingested_rows"],
+            summary["total_rows"],
+        )
+        logger.info(
+            "Materialized %s labeled BTC candles and %s feature rows",
+            summary["labeled_rows"],
+            summary["feature_rows"],
+        )
+        return
+
+    if args.command == "repair-gaps":
+        summary = repair_gaps_and_label(
+            max_workers=args.max_workers, dry_run=args.dry_run
+        )
+        logger.info(
+            "Found %s gaps (%s missing candles); repaired %s candles",
+            summary["gaps_found"],
+            summary["missing_rows"],
+            summary["gap_rows_repaired"],
+        )
+        if summary["gap_rows_repaired"]:
+            logger.info(
+                "Materialized %s labeled BTC candles and %s feature rows",
+                summary["labeled_rows"],
+                summary["feature_rows"],
+            )
+        return
+
+    if args.command == "features":
+        rows = materialize_features(incremental=not args.full)
+        logger.info("Materialized %s feature rows", rows)
+        return
+
     if args.command == "track":
         logger.info("Executing tracked training run")
         run_training_with_tracking(args.experiment, args.run_name)
         logger.info("Tracking run finished")
         return
 
+    if args.command == "train-incremental":
+        logger.info("Executing incremental training run")
+        result = run_incremental_training_with_tracking(
+            args.experiment,
+            args.run_name,
+            resume_run_id=args.resume_run_id,
+            batch_size=args.batch_size,
+            epochs=args.epochs,
+            alpha=args.alpha,
+        )
+        if result is not None:
+            logger.info(
+                "Incremental training finished on %s candles", result.rows_trained
+            )
+        return
+
+    if args.command == "tune":
+        logger.info("Executing hyperparameter search")
+        result = run_tuning_with_tracking(
+            args.experiment,
+            args.run_name,
+            search_space_path=args.search_space,
+            metric=args.metric,
+            max_workers=args.max_workers,
+            limit=args.limit,
+            model_name=args.model_name,
+            alias=args.alias,
+        )
+        logger.info(
+            "Tuning finished: best trial %s (%s) with metrics %s",
+            result.best.trial.number,
+            result.best.trial.family,
+            result.best.metrics,
+        )
+        return
+
+    if args.command == "cv":
+        logger.info("Executing walk-forward cross-validation")
+        result = run_cross_validation_with_tracking(
+            args.experiment,
+            args.run_name,
+            n_folds=args.folds,
+            family=args.family,
+            limit=args.limit,
+            gap=args.gap,
+            max_train_size=args.max_train_size,
+            max_workers=args.max_workers,
+        )
+        logger.info("Cross-validation finished: %s", result.aggregate())
+        return
+
     if args.command == "register":
         logger.info(
             "Registering run %s into model %s",
@@ -1,6 +1,17 @@
 """Public API for MLOps service"""
 
-from .tracking import run_training_with_tracking
+from .tracking import (
+    run_cross_validation_with_tracking,
+    run_incremental_training_with_tracking,
+    run_training_with_tracking,
+    run_tuning_with_tracking,
+)
 from .registry import register_run
 
-__all__ = ["run_training_with_tracking", "register_run"]
+__all__ = [
+    "run_training_with_tracking",
+    "run_tuning_with_tracking",
+    "run_cross_validation_with_tracking",
+    "run_incremental_training_with_tracking",
+    "register_run",
+]
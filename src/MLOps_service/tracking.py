@@ -3,12 +3,34 @@
 from __future__ import annotations
 
 import logging
+from datetime import datetime
+from pathlib import Path
 from typing import Optional
 
 import mlflow
 import mlflow.sklearn
 
 from model_training_service import train_next_move_logistic_classifier
+from model_training_service.cross_validation import (
+    LABEL_HORIZON,
+    CrossValidationResult,
+    cross_validate_next_move_classifier,
+)
+from model_training_service.incremental import (
+    IncrementalTrainingResult,
+    train_incremental_sgd_classifier,
+)
+from model_training_service.training import load_training_split
+from model_training_service.tuning import (
+    DEFAULT_SEARCH_SPACE,
+    TuningResult,
+    expand_search_space,
+    iter_trial_results,
+    load_search_space,
+    trial_score,
+)
+
+from .registry import register_run
 
 logger = logging.getLogger(__name__)
 
@@ -36,3 +58,207 @@ def run_training_with_tracking(
             registered_model_name=None,
         )
         logger.info("Completed MLFlow run with metrics %s", result.metrics)
+
+
+def run_tuning_with_tracking(
+    experiment_name: str = "default",
+    run_name: Optional[str] = None,
+    *,
+    search_space_path: Optional[str | Path] = None,
+    metric: str = "roc_auc",
+    max_workers: Optional[int] = None,
+    limit: Optional[int] = 5000,
+    model_name: Optional[str] = None,
+    alias: Optional[str] = None,
+) -> TuningResult:
+    """Search hyperparameters in parallel, logging each trial as a child run.
+
+    The best trial's model is logged on the parent run and, when
+    ``model_name`` is given, registered in the MLFlow model registry. The
+    number of failed trials is logged too, and the run fails when every
+    trial of a family failed.
+    """
+    space = (
+        load_search_space(search_space_path)
+        if search_space_path is not None
+        else DEFAULT_SEARCH_SPACE
+    )
+    trials = expand_search_space(space)
+    split = load_training_split(limit=limit)
+    result = TuningResult(metric=metric)
+
+    mlflow.set_experiment(experiment_name)
+    with mlflow.start_run(run_name=run_name) as parent:
+        logger.info(
+            "Starting tuning run with %s trials in experiment %s",
+            len(trials),
+            experiment_name,
+        )
+        mlflow.log_params(
+            {
+                "tuning_metric": metric,
+                "tuning_trials": len(trials),
+                "training_rows": len(split[0]),
+            }
+        )
+        # Trials finish in worker processes; MLFlow logging stays here.
+        for trial_result in iter_trial_results(
+            split, trials, max_workers=max_workers, failed=result.failed
+        ):
+            trial = trial_result.trial
+            with mlflow.start_run(
+                run_name=f"trial-{trial.number:03d}-{trial.family}", nested=True
+            ):
+                mlflow.log_param("model_family", trial.family)
+                mlflow.log_params(trial.params)
+                mlflow.log_metrics(trial_result.metrics)
+                mlflow.log_metric("fit_seconds", trial_result.fit_seconds)
+            result.trials.append(trial_result)
+
+        mlflow.log_metric("failed_trials", len(result.failed))
+        if result.failed_families:
+            raise RuntimeError(
+                f"Every trial failed for: {', '.join(result.failed_families)}"
+            )
+        best = result.best
+        mlflow.log_param("best_trial", best.trial.number)
+        mlflow.log_param("model_family", best.trial.family)
+        mlflow.log_params({f"best_{k}": v for k, v in best.trial.params.items()})
+        mlflow.log_metrics(best.metrics)
+        mlflow.log_metric(f"best_{metric}", trial_score(best, metric))
+        mlflow.sklearn.log_model(
+            sk_model=best.model,
+            artifact_path="model",
+            input_example=split[1][:5],
+            registered_model_name=None,
+        )
+        logger.info(
+            "Best trial %s (%s %s) with metrics %s",
+            best.trial.number,
+            best.trial.family,
+            best.trial.params,
+            best.metrics,
+        )
+
+    if model_name:
+        register_run(parent.info.run_id, model_name, alias)
+    return result
+
+
+def run_cross_validation_with_tracking(
+    experiment_name: str = "default",
+    run_name: Optional[str] = None,
+    *,
+    n_folds: int = 5,
+    family: str = "logistic_regression",
+    limit: Optional[int] = None,
+    gap: int = LABEL_HORIZON,
+    max_train_size: Optional[int] = None,
+    max_workers: Optional[int] = None,
+) -> CrossValidationResult:
+    """Walk-forward cross-validate and log per-fold and aggregate metrics.
+
+    Per-fold metrics are logged with the fold number as their step, so the
+    MLFlow UI plots them across folds; ``cv_<metric>_mean``/``_std`` hold
+    the aggregate.
+    """
+    mlflow.set_experiment(experiment_name)
+    with mlflow.start_run(run_name=run_name):
+        logger.info("Starting walk-forward cross-validation in %s", experiment_name)
+        result = cross_validate_next_move_classifier(
+            n_folds=n_folds,
+            limit=limit,
+            family=family,
+            gap=gap,
+            max_train_size=max_train_size,
+            max_workers=max_workers,
+        )
+        mlflow.log_params(
+            {
+                "model_family": family,
+                "cv_folds": n_folds,
+                "cv_gap": gap,
+                "cv_window": "sliding" if max_train_size else "expanding",
+                "cv_max_train_size": max_train_size,
+            }
+        )
+        for fold_result in result.folds:
+            step = fold_result.fold.number
+            for name, value in fold_result.metrics.items():
+                mlflow.log_metric(f"fold_{name}", value, step=step)
+            mlflow.log_metric("fold_train_rows", fold_result.fold.train_rows, step=step)
+            mlflow.log_metric("fold_fit_seconds", fold_result.fit_seconds, step=step)
+        aggregate = result.aggregate()
+        mlflow.log_metrics(aggregate)
+        logger.info("Completed cross-validation with metrics %s", aggregate)
+    return result
+
+
+TRAINED_UNTIL_TAG = "trained_until"
+
+
+def run_incremental_training_with_tracking(
+    experiment_name: str = "default",
+    run_name: Optional[str] = None,
+    *,
+    resume_run_id: Optional[str] = None,
+    batch_size: int = 100_000,
+    epochs: int = 1,
+    alpha: float = 1e-4,
+) -> Optional[IncrementalTrainingResult]:
+    """Train out-of-core with ``partial_fit`` and log the model in MLFlow.
+
+    With ``resume_run_id`` the model logged by that run is loaded and only
+    candles newer than its ``trained_until`` tag are streamed. Returns
+    ``None`` without creating a run when there is nothing new to learn.
+    """
+    base_model = None
+    trained_until = None
+    if resume_run_id is not None:
+        run = mlflow.get_run(resume_run_id)
+        tag = run.data.tags.get(TRAINED_UNTIL_TAG)
+        if tag is None:
+            raise ValueError(f"Run {resume_run_id} has no {TRAINED_UNTIL_TAG} tag")
+        trained_until = datetime.fromisoformat(tag)
+        base_model = mlflow.sklearn.load_model(f"runs:/{resume_run_id}/model")
+        logger.info(
+            "Resuming run %s with candles after %s", resume_run_id, trained_until
+        )
+
+    result = train_incremental_sgd_classifier(
+        base_model=base_model,
+        trained_until=trained_until,
+        batch_size=batch_size,
+        epochs=epochs,
+        alpha=alpha,
+    )
+    if result.rows_trained == 0:
+        logger.info("No new labeled candles to train on")
+        return None
+
+    mlflow.set_experiment(experiment_name)
+    with mlflow.start_run(run_name=run_name):
+        mlflow.log_params(result.model.named_steps["clf"].get_params())
+        mlflow.log_params(
+            {
+                "batch_size": batch_size,
+                "epochs": epochs,
+                "rows_trained": result.rows_trained,
+                "resumed_from": resume_run_id,
+            }
+        )
+        mlflow.log_metrics(result.metrics)
+        mlflow.set_tag(TRAINED_UNTIL_TAG, result.trained_until.isoformat())
+        mlflow.sklearn.log_model(
+            sk_model=result.model,
+            artifact_path="model",
+            input_example=result.input_example,
+            registered_model_name=None,
+        )
+        logger.info(
+            "Trained on %s candles up to %s with metrics %s",
+            result.rows_trained,
+            result.trained_until,
+            result.metrics,
+        )
+    return result
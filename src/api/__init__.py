@@ -3,4 +3,3 @@
 from .app import app, create_app
 
 __all__ = ["app", "create_app"]
-
@@ -2,15 +2,32 @@
 
 from __future__ import annotations
 
+import io
 import logging
 import os
-from functools import lru_cache
-from typing import Any
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable
 
-import mlflow.pyfunc
-from fastapi import FastAPI, HTTPException
+import numpy as np
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
 
+from .batching import MicroBatcher
+from .cache import PredictionCache, feature_key
+from .features import FeatureStoreUnavailable, OnlineFeatureCache
+from .metrics import (
+    CONTENT_TYPE,
+    APIMetrics,
+    MetricsMiddleware,
+    format_labels,
+    process_metrics,
+    stage,
+)
+from .model_manager import get_model_manager
+from .scorers import Scorer
+
 logger = logging.getLogger(__name__)
 
 
@@ -31,12 +48,137 @@ class PredictionResponse(BaseModel):
     raw_output: Any
 
 
-@lru_cache
-def load_model() -> mlflow.pyfunc.PyFuncModel:
-    """Load the registered MLflow model exactly once per process."""
-    model_uri = os.getenv("MODEL_URI", "models:/bitcoin-model@production")
-    logger.info("Loading MLflow model from %s", model_uri)
-    return mlflow.pyfunc.load_model(model_uri=model_uri)
+class BatchPredictionRequest(BaseModel):
+    """Payload schema for batched inference requests."""
+
+    features: list[list[float]] = Field(
+        ...,
+        description="Row-major matrix; each row is one flat feature vector",
+        min_items=1,
+    )
+
+
+class BatchPredictionResponse(BaseModel):
+    """Response schema for batched inference results, in request row order."""
+
+    predictions: list[Any]
+
+
+class FeaturePredictionResponse(BaseModel):
+    """Response schema for predictions on feature-store candles."""
+
+    open_time: datetime
+    features: dict[str, float]
+    prediction: Any
+
+
+class FeatureRow(BaseModel):
+    """One materialized feature row keyed by candle open time."""
+
+    open_time: datetime
+    features: dict[str, float]
+
+
+class FeaturePushRequest(BaseModel):
+    """Payload schema for pushing fresh feature rows into the online cache."""
+
+    rows: list[FeatureRow] = Field(..., min_items=1)
+
+
+def load_model() -> Scorer:
+    """Return the currently served model scorer (hot-swapped on promotion)."""
+    return get_model_manager().get()
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI) -> AsyncIterator[None]:
+    manager = get_model_manager()
+    manager.start_watcher()
+    yield
+    manager.stop_watcher()
+
+
+def _get_model() -> Scorer:
+    try:
+        return load_model()
+    except Exception as exc:  # pragma: no cover - best effort logging
+        logger.exception("Unable to load MLflow model")
+        raise HTTPException(status_code=503, detail="Model is unavailable") from exc
+
+
+def _cached_features(lookup: Callable[..., Any], *args: Any) -> Any:
+    """Run a feature-cache lookup, mapping an unreadable store to 503."""
+    try:
+        return lookup(*args)
+    except FeatureStoreUnavailable as exc:
+        logger.warning("Feature store unavailable: %s", exc)
+        raise HTTPException(
+            status_code=503, detail="Feature store is unavailable"
+        ) from exc
+
+
+def _predict_matrix(matrix: np.ndarray) -> list[Any]:
+    """Score a 2-D feature matrix with one vectorized ``predict`` call."""
+    if matrix.ndim != 2 or matrix.shape[0] == 0:
+        raise HTTPException(
+            status_code=422, detail="features must be a non-empty 2-D matrix"
+        )
+    with stage("lookup"):
+        model = _get_model()
+    if model.n_features is not None and matrix.shape[1] != model.n_features:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Expected {model.n_features} features per row, "
+            f"got {matrix.shape[1]}",
+        )
+    try:
+        with stage("predict"):
+            raw_output = model.predict(matrix)
+    except Exception as exc:  # pragma: no cover - runtime inference errors
+        logger.exception("Batch inference failed")
+        raise HTTPException(status_code=500, detail="Inference failed") from exc
+    return np.asarray(raw_output).tolist()
+
+
+def _component_metrics(
+    manager: Any, batcher: MicroBatcher, prediction_cache: PredictionCache
+) -> list[str]:
+    """Render model, batching and cache state as Prometheus exposition lines."""
+    labels = format_labels(
+        ("uri", "version", "backend"),
+        (manager.model_uri, manager.version or "", manager.active_backend or ""),
+    )
+    lines = [
+        "# HELP api_model_info Model currently served by the API",
+        "# TYPE api_model_info gauge",
+        f"api_model_info{labels} {int(manager.is_loaded)}",
+        "# HELP api_model_generation Number of model swaps since start-up",
+        "# TYPE api_model_generation gauge",
+        f"api_model_generation {manager.generation}",
+    ]
+    cache = prediction_cache.stats()
+    for name in ("hits", "misses", "evictions"):
+        lines += [
+            f"# TYPE api_prediction_cache_{name}_total counter",
+            f"api_prediction_cache_{name}_total {cache[name]}",
+        ]
+    lines += [
+        "# TYPE api_prediction_cache_size gauge",
+        f"api_prediction_cache_size {cache['size']}",
+        "# HELP api_batch_size Rows per micro-batched predict call",
+        "# TYPE api_batch_size histogram",
+    ]
+    sizes = dict(batcher.batch_sizes)
+    for bound in (1, 2, 4, 8, 16, 32, 64, 128, 256):
+        cumulative = sum(count for size, count in sizes.items() if size <= bound)
+        lines.append(f'api_batch_size_bucket{{le="{bound}"}} {cumulative}')
+    batches = sum(sizes.values())
+    lines += [
+        f'api_batch_size_bucket{{le="+Inf"}} {batches}',
+        f"api_batch_size_sum {sum(size * count for size, count in sizes.items())}",
+        f"api_batch_size_count {batches}",
+    ]
+    return lines
 
 
 def create_app() -> FastAPI:
@@ -48,34 +190,193 @@ def create_app() -> FastAPI:
             "Set MODEL_URI to change which model version is loaded."
         ),
         version="0.1.0",
+        lifespan=_lifespan,
+    )
+    batcher = MicroBatcher(
+        _predict_matrix,
+        max_batch_size=int(os.getenv("PREDICT_MAX_BATCH_SIZE", "64")),
+        max_wait_ms=float(os.getenv("PREDICT_MAX_WAIT_MS", "2")),
+        expected_errors=(HTTPException,),
+    )
+    feature_cache = OnlineFeatureCache(
+        capacity=int(os.getenv("FEATURE_CACHE_SIZE", "10080")),
+        refresh_seconds=float(os.getenv("FEATURE_CACHE_REFRESH_SECONDS", "5")),
     )
 
-    @app.get("/health", tags=["system"])
-    def health() -> dict[str, str]:
-        """Basic readiness probe."""
-        return {"status": "ok"}
+    prediction_cache = PredictionCache(
+        max_entries=int(os.getenv("PREDICTION_CACHE_SIZE", "10000")),
+        ttl_seconds=float(os.getenv("PREDICTION_CACHE_TTL_SECONDS", "60")),
+    )
+    manager = get_model_manager()
+    manager.add_swap_listener(prediction_cache.clear)
 
-    @app.post("/predict", response_model=PredictionResponse, tags=["inference"])
-    def predict(payload: PredictionRequest) -> PredictionResponse:
-        """Run inference against the loaded model."""
-        try:
-            model = load_model()
-        except Exception as exc:  # pragma: no cover - best effort logging
-            logger.exception("Unable to load MLflow model")
-            raise HTTPException(status_code=503, detail="Model is unavailable") from exc
+    metrics = APIMetrics()
+    app.add_middleware(MetricsMiddleware, metrics=metrics)
+    metrics.registry.add_collector(
+        lambda: _component_metrics(manager, batcher, prediction_cache)
+    )
+    metrics.registry.add_collector(process_metrics)
 
+    async def _score_one(features: Any) -> Any:
+        """Score one feature vector through the prediction cache and batcher."""
+        # The model generation in the key keeps racing swaps from mixing models.
+        with stage("lookup"):
+            key = (manager.generation, feature_key(features))
+            hit, prediction = prediction_cache.get(key)
+        if hit:
+            return prediction
         try:
-            raw_output = model.predict([payload.features])
-        except Exception as exc:  # pragma: no cover - inference errors are runtime issues
-            logger.exception("Inference failed")
+            with stage("predict"):
+                prediction = await batcher.submit(features)
+        except HTTPException:
+            raise
+        except Exception as exc:  # pragma: no cover - logged by the batcher
             raise HTTPException(status_code=500, detail="Inference failed") from exc
+        prediction_cache.put(key, prediction)
+        return prediction
+
+    async def _predict_features(
+        open_time: datetime, vector: np.ndarray
+    ) -> FeaturePredictionResponse:
+        prediction = await _score_one(vector)
+        return FeaturePredictionResponse(
+            open_time=open_time,
+            features=dict(zip(feature_cache.feature_columns, vector.tolist())),
+            prediction=prediction,
+        )
+
+    @app.get("/health", tags=["system"])
+    def health() -> dict[str, Any]:
+        """Basic readiness probe, including the model version being served."""
+        return {
+            "status": "ok" if manager.is_loaded else "loading",
+            "model_uri": manager.model_uri,
+            "model_version": manager.version,
+            "model_backend": manager.active_backend,
+        }
+
+    @app.get("/metrics", tags=["system"], response_class=Response)
+    def prometheus_metrics() -> Response:
+        """Request, stage-latency and model metrics in Prometheus text format."""
+        return Response(content=metrics.render(), media_type=CONTENT_TYPE)
+
+    @app.get("/metrics/batching", tags=["system"])
+    def batching_metrics() -> dict[str, Any]:
+        """Micro-batcher settings and batch-size histogram for tuning."""
+        return batcher.stats()
+
+    @app.get("/metrics/cache", tags=["system"])
+    def cache_metrics() -> dict[str, Any]:
+        """Prediction cache size and hit/miss counters."""
+        return prediction_cache.stats()
+
+    @app.post("/predict", response_model=PredictionResponse, tags=["inference"])
+    async def predict(payload: PredictionRequest) -> PredictionResponse:
+        """Run inference, micro-batched with other concurrent requests."""
+        prediction = await _score_one(payload.features)
 
         # Standardize the response payload for downstream consumers.
-        prediction = raw_output[0] if raw_output is not None else None
-        return PredictionResponse(prediction=prediction, raw_output=raw_output)
+        return PredictionResponse(prediction=prediction, raw_output=[prediction])
+
+    @app.get(
+        "/predict/latest",
+        response_model=FeaturePredictionResponse,
+        tags=["inference"],
+    )
+    async def predict_latest() -> FeaturePredictionResponse:
+        """Score the newest candle in the feature store."""
+        with stage("lookup"):
+            latest = await run_in_threadpool(_cached_features, feature_cache.latest)
+        if latest is None:
+            raise HTTPException(status_code=404, detail="No candles available")
+        return await _predict_features(*latest)
+
+    @app.get(
+        "/predict/at",
+        response_model=FeaturePredictionResponse,
+        tags=["inference"],
+    )
+    async def predict_at(open_time: datetime) -> FeaturePredictionResponse:
+        """Score the cached candle opened at ``open_time``."""
+        if open_time.tzinfo is not None:
+            # Candles are stored as naive local timestamps.
+            open_time = open_time.astimezone().replace(tzinfo=None)
+        with stage("lookup"):
+            vector = await run_in_threadpool(
+                _cached_features, feature_cache.at, open_time
+            )
+        if vector is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"No cached candle with open_time {open_time.isoformat()}",
+            )
+        return await _predict_features(open_time, vector)
+
+    @app.post("/features", tags=["features"])
+    def push_features(payload: FeaturePushRequest) -> dict[str, int]:
+        """Add freshly materialized feature rows to the online feature cache."""
+        columns = feature_cache.feature_columns
+        try:
+            matrix = np.array(
+                [[row.features[name] for name in columns] for row in payload.rows],
+                dtype=np.float64,
+            )
+        except KeyError as exc:
+            raise HTTPException(
+                status_code=422, detail=f"Missing feature {exc.args[0]!r}"
+            ) from exc
+        open_times = np.array(
+            [
+                # Candles are stored as naive local timestamps.
+                row.open_time.astimezone().replace(tzinfo=None)
+                if row.open_time.tzinfo is not None
+                else row.open_time
+                for row in payload.rows
+            ],
+            dtype="datetime64[us]",
+        )
+        return {"rows": feature_cache.push(open_times, matrix)}
+
+    @app.post(
+        "/predict/batch",
+        response_model=BatchPredictionResponse,
+        tags=["inference"],
+    )
+    def predict_batch(payload: BatchPredictionRequest) -> BatchPredictionResponse:
+        """Score many feature vectors with a single model call."""
+        if len({len(row) for row in payload.features}) != 1:
+            raise HTTPException(
+                status_code=422, detail="All feature rows must have the same length"
+            )
+        matrix = np.asarray(payload.features, dtype=np.float64)
+        return BatchPredictionResponse(predictions=_predict_matrix(matrix))
+
+    @app.post(
+        "/predict/batch/npy",
+        response_model=BatchPredictionResponse,
+        tags=["inference"],
+    )
+    async def predict_batch_npy(request: Request) -> BatchPredictionResponse:
+        """Score a feature matrix sent as a binary NumPy ``.npy`` body."""
+        body = await request.body()
+        try:
+            matrix = np.load(io.BytesIO(body), allow_pickle=False)
+        except (EOFError, TypeError, ValueError) as exc:
+            # An empty body raises EOFError, a pickled object array ValueError.
+            raise HTTPException(
+                status_code=422, detail="Body must be a NumPy .npy array"
+            ) from exc
+        # Structured, string and complex arrays do not cast cleanly to float.
+        if matrix.ndim != 2 or matrix.dtype.kind not in "biuf":
+            raise HTTPException(
+                status_code=422, detail="Body must be a 2-D numeric .npy array"
+            )
+        predictions = await run_in_threadpool(
+            _predict_matrix, matrix.astype(np.float64, copy=False)
+        )
+        return BatchPredictionResponse(predictions=predictions)
 
     return app
 
 
 app = create_app()
-
@@ -0,0 +1,126 @@
+"""Server-side micro-batching of concurrent single-row predictions."""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import logging
+from collections import Counter
+from typing import Any, Callable, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+PredictFn = Callable[[np.ndarray], Sequence[Any]]
+
+
+class MicroBatcher:
+    """Coalesce concurrent single-row requests into one vectorized predict call.
+
+    Requests are queued until ``max_batch_size`` rows are waiting or
+    ``max_wait_ms`` has passed since the first one arrived; the stacked
+    matrix is then scored in a worker thread and each caller receives the
+    prediction for its own row. If scoring fails, every caller in the batch
+    gets the exception; ones not listed in ``expected_errors`` (e.g. the
+    app's 4xx responses) are logged first.
+    """
+
+    def __init__(
+        self,
+        predict_fn: PredictFn,
+        *,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 2.0,
+        expected_errors: tuple[type[Exception], ...] = (),
+    ) -> None:
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_wait_ms < 0:
+            raise ValueError("max_wait_ms must be non-negative")
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.expected_errors = expected_errors
+        self.batch_sizes: Counter[int] = Counter()
+        self._queue: asyncio.Queue | None = None
+        self._worker: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    async def submit(self, features: Sequence[float]) -> Any:
+        """Queue one feature vector and wait for its prediction."""
+        queue = self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await queue.put((np.asarray(features, dtype=np.float64), future))
+        return await future
+
+    def stats(self) -> dict[str, Any]:
+        """Return settings plus a histogram of executed batch sizes."""
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "batches": sum(self.batch_sizes.values()),
+            "rows": sum(size * count for size, count in self.batch_sizes.items()),
+            "batch_size_histogram": dict(sorted(self.batch_sizes.items())),
+        }
+
+    def _ensure_worker(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            # Start the worker in an empty context so it does not inherit the
+            # request-scoped state (e.g. stage timers) of whoever started it.
+            self._worker = contextvars.Context().run(
+                loop.create_task, self._run(self._queue)
+            )
+        return self._queue
+
+    async def _run(self, queue: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        max_wait = self.max_wait_ms / 1000
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Rows of different widths cannot be stacked; score each width apart.
+            groups: dict[int, list] = {}
+            for item in batch:
+                groups.setdefault(item[0].shape[-1], []).append(item)
+            for group in groups.values():
+                await self._score(group)
+
+    async def _score(self, group: list) -> None:
+        self.batch_sizes[len(group)] += 1
+        matrix = np.vstack([features for features, _ in group])
+        try:
+            outputs = list(await asyncio.to_thread(self.predict_fn, matrix))
+            if len(outputs) != len(group):
+                raise RuntimeError(
+                    f"Model returned {len(outputs)} predictions for {len(group)} rows"
+                )
+        except self.expected_errors as exc:
+            _fail(group, exc)
+            return
+        except Exception as exc:
+            logger.exception("Scoring a batch of %s rows failed", len(group))
+            _fail(group, exc)
+            return
+        for (_, future), output in zip(group, outputs):
+            if not future.done():
+                future.set_result(output)
+
+
+def _fail(group: list, exc: Exception) -> None:
+    """Raise ``exc`` in every caller still waiting on ``group``."""
+    for _, future in group:
+        if not future.done():
+            future.set_exception(exc)
@@ -0,0 +1,192 @@
+"""Online feature serving backed by the DuckDB feature store."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, Sequence
+
+import duckdb
+import numpy as np
+from numpy.typing import NDArray
+
+from feature_delivery_service import DEFAULT_FEATURE_SET, FeatureSet
+from feature_delivery_service.tools.duckdb_storage_manager import (
+    DEFAULT_FEATURE_DB_PATH,
+    DuckDBStorageManager,
+)
+from model_training_service.training import FEATURE_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+
+class FeatureStoreUnavailable(RuntimeError):
+    """The feature table cannot be read (missing, or locked by a writer)."""
+
+
+class OnlineFeatureCache:
+    """In-memory window of model inputs for the most recent candles.
+
+    Feature vectors are read in ``FEATURE_COLUMNS`` order from the
+    materialized feature table, which includes the newest (not yet labeled)
+    candle. Refreshes only load rows from the cached tail onward; lookups
+    are a binary search over an in-memory array. A streaming ingestor can
+    also :meth:`push` rows as soon as they are materialized.
+
+    Each refresh opens its own short-lived read-only connection to
+    ``db_path``, so the API never holds the DuckDB file lock that ingestion
+    needs between refreshes.
+    """
+
+    def __init__(
+        self,
+        *,
+        feature_set: FeatureSet = DEFAULT_FEATURE_SET,
+        capacity: int = 10_080,
+        refresh_seconds: float = 5.0,
+        feature_columns: Sequence[str] = FEATURE_COLUMNS,
+        db_path: str | Path = DEFAULT_FEATURE_DB_PATH,
+    ) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        missing = set(feature_columns) - set(feature_set.feature_names)
+        if missing:
+            raise ValueError(f"{feature_set.table} has no features {sorted(missing)}")
+        self.feature_set = feature_set
+        self.capacity = capacity
+        self.refresh_seconds = refresh_seconds
+        self.feature_columns = tuple(feature_columns)
+        self.db_path = Path(db_path)
+        # (open_times, matrix) is swapped as one tuple so readers never mix
+        # arrays from different refreshes.
+        self._window: tuple[NDArray[np.datetime64], NDArray[np.float64]] = (
+            np.array([], dtype="datetime64[us]"),
+            np.empty((0, len(self.feature_columns))),
+        )
+        self._last_refresh = 0.0
+        self._lock = threading.Lock()
+
+    def latest(self) -> tuple[datetime, NDArray[np.float64]] | None:
+        """Return the newest candle's open time and feature vector."""
+        self.maybe_refresh()
+        open_times, matrix = self._window
+        if len(open_times) == 0:
+            return None
+        return open_times[-1].item(), matrix[-1]
+
+    def at(self, open_time: datetime) -> NDArray[np.float64] | None:
+        """Return the feature vector for ``open_time`` if it is cached."""
+        self.maybe_refresh()
+        open_times, matrix = self._window
+        key = np.datetime64(open_time, "us")
+        index = int(np.searchsorted(open_times, key))
+        if index == len(open_times) or open_times[index] != key:
+            return None
+        return matrix[index]
+
+    def maybe_refresh(self) -> None:
+        """Refresh from DuckDB when the cache is older than ``refresh_seconds``."""
+        if time.monotonic() - self._last_refresh < self.refresh_seconds:
+            return
+        with self._lock:
+            if time.monotonic() - self._last_refresh < self.refresh_seconds:
+                return
+            try:
+                self.refresh()
+            except FeatureStoreUnavailable:
+                # e.g. the database is locked by a writer; serve what is cached.
+                if len(self._window[0]) == 0:
+                    raise
+                logger.warning("Feature cache refresh failed", exc_info=True)
+                self._last_refresh = time.monotonic()
+
+    def push(
+        self, open_times: NDArray[np.datetime64], matrix: NDArray[np.float64]
+    ) -> int:
+        """Merge freshly materialized rows into the window; newer values win."""
+        open_times = np.asarray(open_times, dtype="datetime64[us]")
+        matrix = np.asarray(matrix, dtype=np.float64).reshape(
+            -1, len(self.feature_columns)
+        )
+        with self._lock:
+            cached_times, cached_matrix = self._window
+            keep = ~np.isin(cached_times, open_times)
+            times = np.concatenate([cached_times[keep], open_times])
+            merged = np.vstack([cached_matrix[keep], matrix])
+            order = np.argsort(times, kind="stable")
+            self._window = (
+                times[order][-self.capacity :],
+                merged[order][-self.capacity :],
+            )
+        return len(open_times)
+
+    def refresh(self) -> int:
+        """Load rows from the cached tail onward and return the row count read."""
+        cached_times, cached_matrix = self._window
+        columns_to_read = ["open_time", *self.feature_columns]
+        if len(cached_times) == 0:
+            with self._read_only_storage() as storage:
+                columns = storage.fetch_columns(
+                    self.feature_set.table,
+                    columns_to_read,
+                    limit=self.capacity,
+                    order_by="open_time",
+                    order_desc=True,
+                )
+            columns = {name: values[::-1] for name, values in columns.items()}
+            open_times, matrix = self._to_matrix(columns)
+        else:
+            # Re-read the tail row too: it may have been an in-progress candle.
+            with self._read_only_storage() as storage:
+                columns = storage.fetch_columns(
+                    self.feature_set.table,
+                    columns_to_read,
+                    start=cached_times[-1].item(),
+                    order_by="open_time",
+                )
+            if len(columns["open_time"]) == 0:
+                self._last_refresh = time.monotonic()
+                return 0
+            open_times, matrix = self._to_matrix(columns)
+            open_times = np.concatenate([cached_times[:-1], open_times])
+            matrix = np.vstack([cached_matrix[:-1], matrix])
+
+        self._window = (open_times[-self.capacity :], matrix[-self.capacity :])
+        self._last_refresh = time.monotonic()
+        rows = len(columns["open_time"])
+        logger.debug("Refreshed online feature cache with %s rows", rows)
+        return rows
+
+    @contextmanager
+    def _read_only_storage(self) -> Iterator[DuckDBStorageManager]:
+        """Yield a read-only connection that is closed right after the read."""
+        if not self.db_path.exists():
+            raise FeatureStoreUnavailable(f"{self.db_path} does not exist")
+        try:
+            storage = DuckDBStorageManager(self.db_path, read_only=True)
+        except duckdb.Error as exc:
+            raise FeatureStoreUnavailable(f"Cannot open {self.db_path}") from exc
+        try:
+            if not storage.table_exists(self.feature_set.table):
+                raise FeatureStoreUnavailable(
+                    f"{self.feature_set.table} has not been materialized"
+                )
+            yield storage
+        finally:
+            storage.close()
+
+    def _to_matrix(
+        self, columns: dict[str, np.ndarray]
+    ) -> tuple[NDArray[np.datetime64], NDArray[np.float64]]:
+        matrix = np.column_stack(
+            [
+                np.asarray(columns[name], dtype=np.float64)
+                for name in self.feature_columns
+            ]
+        )
+        open_times = columns["open_time"].astype("datetime64[us]")
+        return open_times, matrix.reshape(-1, len(self.feature_columns))
@@ -0,0 +1,323 @@
+"""Lightweight Prometheus-style metrics and per-stage request timing."""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator, Mapping, Sequence
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+)
+
+LabelKey = tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)
+    )
+    return "{" + pairs + "}"
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Mapping[str, Any]) -> LabelKey:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, help, labelnames)
+        self._values: dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{format_labels(self.labelnames, key)} {value}")
+        return lines
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: Any) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+        # Per label set: [bucket counts..., +Inf count], sum.
+        self._values: dict[LabelKey, tuple[list[int], float]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.get(key) or (
+                [0] * (len(self.buckets) + 1),
+                0.0,
+            )
+            counts[index] += 1
+            self._values[key] = (counts, total + value)
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        with self._lock:
+            items = [
+                (key, list(counts), total)
+                for key, (counts, total) in self._values.items()
+            ]
+        bucket_names = (*self.labelnames, "le")
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                labels = format_labels(bucket_names, (*key, str(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {total}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metrics plus callbacks that render point-in-time values."""
+
+    def __init__(self) -> None:
+        self._metrics: list[_Metric] = []
+        self._collectors: list[Callable[[], list[str]]] = []
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def add_collector(self, collector: Callable[[], list[str]]) -> None:
+        """Register a callback returning exposition lines at scrape time."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+
+def _proc_kilobytes(path: str, fields: Sequence[str]) -> dict[str, int]:
+    values: dict[str, int] = {}
+    try:
+        with open(path) as handle:
+            for line in handle:
+                name, _, rest = line.partition(":")
+                if name in fields:
+                    values[name] = int(rest.split()[0]) * 1024
+    except OSError:
+        pass
+    return values
+
+
+def process_metrics() -> list[str]:
+    """Resident and proportional memory of this process (Linux only).
+
+    PSS splits pages shared with other processes (e.g. a model preloaded
+    before fork) evenly between them, so it shows the per-worker cost.
+    """
+    status = _proc_kilobytes("/proc/self/status", ("VmRSS",))
+    rollup = _proc_kilobytes("/proc/self/smaps_rollup", ("Pss",))
+    lines = [
+        "# TYPE process_pid gauge",
+        f"process_pid {os.getpid()}",
+    ]
+    if "VmRSS" in status:
+        lines += [
+            "# TYPE process_resident_memory_bytes gauge",
+            f"process_resident_memory_bytes {status['VmRSS']}",
+        ]
+    if "Pss" in rollup:
+        lines += [
+            "# TYPE process_proportional_memory_bytes gauge",
+            f"process_proportional_memory_bytes {rollup['Pss']}",
+        ]
+    return lines
+
+
+class RequestTimer:
+    """Per-request stage bookkeeping shared between middleware and handlers."""
+
+    __slots__ = ("first_stage", "last_stage_end", "metrics", "started")
+
+    def __init__(self, metrics: "APIMetrics") -> None:
+        self.metrics = metrics
+        self.started = time.perf_counter()
+        self.first_stage: float | None = None
+        self.last_stage_end: float | None = None
+
+
+_current_timer: ContextVar[RequestTimer | None] = ContextVar(
+    "api_request_timer", default=None
+)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time a handler stage; a no-op outside an instrumented request."""
+    timer = _current_timer.get()
+    if timer is None:
+        yield
+        return
+    start = time.perf_counter()
+    if timer.first_stage is None:
+        timer.first_stage = start
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        timer.last_stage_end = end
+        timer.metrics.stages.observe(end - start, stage=name)
+
+
+class APIMetrics:
+    """Metrics recorded by the inference API."""
+
+    def __init__(self) -> None:
+        self.registry = MetricsRegistry()
+        self.requests = self.registry.counter(
+            "api_requests_total", "HTTP requests handled", ("method", "path", "status")
+        )
+        self.errors = self.registry.counter(
+            "api_request_errors_total",
+            "HTTP requests that failed with a 5xx or an exception",
+            ("method", "path"),
+        )
+        self.latency = self.registry.histogram(
+            "api_request_duration_seconds",
+            "End-to-end HTTP request latency",
+            ("method", "path"),
+        )
+        self.stages = self.registry.histogram(
+            "api_stage_duration_seconds",
+            "Inference latency split into validation, lookup, predict and "
+            "serialization stages",
+            ("stage",),
+        )
+        self.in_flight = self.registry.gauge(
+            "api_requests_in_flight", "HTTP requests currently being handled"
+        )
+
+    def render(self) -> str:
+        return self.registry.render()
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording request counts, latency and in-flight."""
+
+    def __init__(self, app: Any, metrics: APIMetrics) -> None:
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: dict, receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = self.metrics
+        timer = RequestTimer(metrics)
+        token = _current_timer.set(timer)
+        status = 500
+
+        async def _send(message: dict) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        metrics.in_flight.inc()
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            end = time.perf_counter()
+            metrics.in_flight.dec()
+            _current_timer.reset(token)
+            route = scope.get("route")
+            path = getattr(route, "path", "unmatched")
+            method = scope["method"]
+            metrics.requests.inc(method=method, path=path, status=status)
+            metrics.latency.observe(end - timer.started, method=method, path=path)
+            if status >= 500:
+                metrics.errors.inc(method=method, path=path)
+            if timer.first_stage is not None and timer.last_stage_end is not None:
+                metrics.stages.observe(
+                    timer.first_stage - timer.started, stage="validation"
+                )
+                metrics.stages.observe(
+                    end - timer.last_stage_end, stage="serialization"
+                )
@@ -0,0 +1,168 @@
+"""Model lifecycle for the API: preload, registry polling and hot swaps."""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from typing import Any, Callable, Optional
+
+import mlflow
+import mlflow.pyfunc
+
+from .scorers import Scorer, build_scorer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_URI = "models:/bitcoin-model@production"
+
+
+def _parse_alias_uri(model_uri: str) -> tuple[str, str] | None:
+    """Return ``(name, alias)`` for ``models:/<name>@<alias>`` URIs."""
+    prefix = "models:/"
+    if not model_uri.startswith(prefix) or "@" not in model_uri:
+        return None
+    name, alias = model_uri[len(prefix) :].split("@", 1)
+    return name, alias
+
+
+class ModelManager:
+    """Serve one MLflow model and hot-swap it when its registry alias moves.
+
+    A background thread polls the alias, loads and warms up the new version
+    off the request path, then replaces the served model in a single
+    reference assignment, so in-flight requests finish on the old version.
+    """
+
+    def __init__(
+        self,
+        model_uri: str,
+        *,
+        poll_seconds: float = 30.0,
+        backend: str = "auto",
+    ) -> None:
+        self.model_uri = model_uri
+        self.poll_seconds = poll_seconds
+        self.backend = backend
+        self._alias = _parse_alias_uri(model_uri)
+        self._current: tuple[Scorer, Optional[str]] | None = None
+        self._swap_listeners: list[Callable[[], None]] = []
+        self.generation = 0
+        self._load_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher: threading.Thread | None = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._current is not None
+
+    @property
+    def active_backend(self) -> Optional[str]:
+        """Inference backend of the served model (pyfunc, native or compiled)."""
+        current = self._current
+        return current[0].backend if current else None
+
+    @property
+    def version(self) -> Optional[str]:
+        """Registry version currently served (``None`` for non-alias URIs)."""
+        current = self._current
+        return current[1] if current else None
+
+    def get(self) -> Scorer:
+        """Return the served model, loading it synchronously if still missing."""
+        current = self._current
+        if current is None:
+            with self._load_lock:
+                if self._current is None:
+                    self._swap_in(self._resolve_version())
+                current = self._current
+        return current[0]
+
+    def check_for_update(self) -> bool:
+        """Load, warm up and swap in a new version; return whether it changed."""
+        with self._load_lock:
+            version = self._resolve_version()
+            if self._current is not None and version == self._current[1]:
+                return False
+            self._swap_in(version)
+            return True
+
+    def add_swap_listener(self, callback: Callable[[], None]) -> None:
+        """Call ``callback`` after every model swap (e.g. to drop caches)."""
+        self._swap_listeners.append(callback)
+
+    def start_watcher(self) -> None:
+        """Preload the model and, for alias URIs, keep polling the registry."""
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+        self._stop.clear()
+        self._watcher = threading.Thread(
+            target=self._watch, name="model-watcher", daemon=True
+        )
+        self._watcher.start()
+
+    def stop_watcher(self) -> None:
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join(timeout=5)
+            self._watcher = None
+
+    def _watch(self) -> None:
+        while True:
+            try:
+                self.check_for_update()
+            except Exception:  # pragma: no cover - keep serving the old model
+                logger.exception("Model refresh from %s failed", self.model_uri)
+            if self._alias is None or self.poll_seconds <= 0:
+                return
+            if self._stop.wait(self.poll_seconds):
+                return
+
+    def _resolve_version(self) -> Optional[str]:
+        if self._alias is None:
+            return None
+        name, alias = self._alias
+        client = mlflow.MlflowClient()
+        return str(client.get_model_version_by_alias(name, alias).version)
+
+    def _swap_in(self, version: Optional[str]) -> None:
+        uri = self.model_uri
+        if version is not None and self._alias is not None:
+            uri = f"models:/{self._alias[0]}/{version}"
+        logger.info("Loading MLflow model from %s", uri)
+        model = mlflow.pyfunc.load_model(model_uri=uri)
+        scorer = build_scorer(model, self.backend)
+        _warm_up(scorer, getattr(model, "input_example", None))
+        self._current = (scorer, version)
+        self.generation += 1
+        for callback in self._swap_listeners:
+            callback()
+        logger.info(
+            "Serving MLflow model %s (version %s, backend %s)",
+            self.model_uri,
+            version,
+            scorer.backend,
+        )
+
+
+def _warm_up(scorer: Scorer, example: Any) -> None:
+    """Run one prediction on the logged input example, if there is one."""
+    if example is None:
+        logger.warning("Model has no input example; skipping warm-up")
+        return
+    scorer.predict(example)
+
+
+_model_manager: ModelManager | None = None
+
+
+def get_model_manager() -> ModelManager:
+    """Return a lazily-instantiated model manager configured from the env."""
+    global _model_manager
+    if _model_manager is None:
+        _model_manager = ModelManager(
+            os.getenv("MODEL_URI", DEFAULT_MODEL_URI),
+            poll_seconds=float(os.getenv("MODEL_POLL_SECONDS", "30")),
+            backend=os.getenv("MODEL_BACKEND", "auto"),
+        )
+    return _model_manager
@@ -0,0 +1,136 @@
+"""Inference backends: MLflow pyfunc, native sklearn and compiled NumPy."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Protocol
+
+import mlflow.pyfunc
+import numpy as np
+from numpy.typing import NDArray
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("auto", "compiled", "native", "pyfunc")
+
+
+class Scorer(Protocol):
+    """Anything that maps a 2-D feature matrix to one prediction per row."""
+
+    backend: str
+    # Columns the model expects, when it can tell; ``None`` skips the check.
+    n_features: int | None
+
+    def predict(self, features: Any) -> Any: ...
+
+
+class PyFuncScorer:
+    """Generic MLflow pyfunc path, with pandas conversion and schema checks."""
+
+    backend = "pyfunc"
+
+    def __init__(self, model: mlflow.pyfunc.PyFuncModel) -> None:
+        self.model = model
+        self.n_features = _signature_width(model)
+
+    def predict(self, features: Any) -> Any:
+        return self.model.predict(features)
+
+
+class NativeSklearnScorer:
+    """Call the fitted sklearn estimator directly, skipping pyfunc overhead."""
+
+    backend = "native"
+
+    def __init__(self, estimator: Any) -> None:
+        self.estimator = estimator
+        self.n_features: int | None = getattr(estimator, "n_features_in_", None)
+
+    def predict(self, features: Any) -> Any:
+        return self.estimator.predict(np.asarray(features, dtype=np.float64))
+
+
+class CompiledLinearScorer:
+    """``StandardScaler`` + binary linear classifier folded into one dot product.
+
+    Scaling is absorbed into the weights: ``(x - mean) / scale @ coef + b``
+    equals ``x @ (coef / scale) + (b - mean / scale @ coef)``, with ``mean``
+    or ``scale`` dropped when the scaler has ``with_mean``/``with_std`` off.
+    """
+
+    backend = "compiled"
+
+    def __init__(self, estimator: Any) -> None:
+        steps = getattr(estimator, "steps", None)
+        if not steps or len(steps) != 2:
+            raise TypeError("Expected a two-step scaler + classifier pipeline")
+        scaler, classifier = steps[0][1], steps[1][1]
+        if type(scaler).__name__ != "StandardScaler":
+            raise TypeError("First pipeline step must be a StandardScaler")
+        coef = getattr(classifier, "coef_", None)
+        classes = getattr(classifier, "classes_", None)
+        if coef is None or classes is None or coef.shape[0] != 1 or len(classes) != 2:
+            raise TypeError("Second pipeline step must be a binary linear classifier")
+
+        weights = np.asarray(coef[0], dtype=np.float64)
+        intercept = float(np.ravel(classifier.intercept_)[0])
+        # ``mean_`` is fitted even with ``with_mean=False``; only fold what
+        # the scaler actually applies.
+        if scaler.with_std:
+            weights = weights / scaler.scale_
+        if scaler.with_mean:
+            intercept -= float(scaler.mean_ @ weights)
+        self.weights: NDArray[np.float64] = weights
+        self.n_features = len(weights)
+        self.intercept = intercept
+        self.classes: NDArray = np.asarray(classes)
+
+    def predict(self, features: Any) -> NDArray:
+        matrix = np.asarray(features, dtype=np.float64)
+        return self.classes[(matrix @ self.weights + self.intercept > 0).astype(int)]
+
+
+def _signature_width(model: mlflow.pyfunc.PyFuncModel) -> int | None:
+    """Return the feature count from the logged input schema, if any."""
+    schema = model.metadata.get_input_schema()
+    if schema is None:
+        return None
+    if not schema.is_tensor_spec():
+        return len(schema.inputs)
+    shape = schema.inputs[0].shape
+    return shape[-1] if len(shape) == 2 and shape[-1] > 0 else None
+
+
+def build_scorer(model: mlflow.pyfunc.PyFuncModel, backend: str = "auto") -> Scorer:
+    """Pick the fastest backend ``model`` supports, falling back to pyfunc.
+
+    The compiled scorer is only used if it reproduces the native model's
+    predictions on the logged input example.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown model backend: {backend}")
+    if backend == "pyfunc" or "sklearn" not in model.metadata.flavors:
+        if backend not in ("auto", "pyfunc"):
+            raise ValueError(f"Backend {backend} requires an sklearn-flavor model")
+        return PyFuncScorer(model)
+
+    native = NativeSklearnScorer(model.get_raw_model())
+    if backend == "native":
+        return native
+    try:
+        compiled = CompiledLinearScorer(native.estimator)
+    except TypeError as exc:
+        if backend == "compiled":
+            raise
+        logger.info("Using native sklearn scorer: %s", exc)
+        return native
+
+    example = getattr(model, "input_example", None)
+    if example is not None and not np.array_equal(
+        compiled.predict(example), native.predict(example)
+    ):
+        if backend == "compiled":
+            raise RuntimeError("Compiled scorer disagrees with the native model")
+        logger.warning("Compiled scorer disagrees with native model; using native")
+        return native
+    return compiled
@@ -0,0 +1,146 @@
+"""Multi-process API server sharing one preloaded model across workers.
+
+The parent process binds the listening socket and loads the model once,
+then forks ``API_WORKERS`` uvicorn workers. Model weights loaded before the
+fork stay shared copy-on-write, so each extra worker costs little memory
+instead of holding its own ``mlflow.pyfunc.load_model`` copy.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+import time
+
+import uvicorn
+
+from .model_manager import get_model_manager
+
+logger = logging.getLogger(__name__)
+
+_RESPAWN_DELAY_SECONDS = 1.0
+
+
+def _bind_socket(host: str, port: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _run_worker(sock: socket.socket, host: str, port: int, log_level: str) -> None:
+    from .app import app
+
+    config = uvicorn.Config(app, host=host, port=port, log_level=log_level)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def _fork_worker(sock: socket.socket, host: str, port: int, log_level: str) -> int:
+    pid = os.fork()
+    if pid:
+        return pid
+    # Child: let uvicorn install its own shutdown handlers.
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    status = 0
+    try:
+        _run_worker(sock, host, port, log_level)
+    except BaseException:  # pragma: no cover - reported by the parent
+        logger.exception("API worker %s crashed", os.getpid())
+        status = 1
+    finally:
+        os._exit(status)
+
+
+def serve(
+    *,
+    host: str = "0.0.0.0",
+    port: int = 8000,
+    workers: int = 1,
+    log_level: str = "info",
+) -> None:
+    """Serve the API from ``workers`` processes that share a preloaded model."""
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    if workers > 1 and not hasattr(os, "fork"):
+        raise RuntimeError("Multiple workers require a platform with os.fork")
+
+    sock = _bind_socket(host, port)
+    # Load, build and warm up the scorer before forking so every worker
+    # inherits it; the registry watcher and batcher start in each worker.
+    from .app import app  # noqa: F401 - build the app in the parent too
+
+    get_model_manager().get()
+    if workers == 1:
+        _run_worker(sock, host, port, log_level)
+        return
+
+    # Keep the garbage collector from touching (and so copying) the
+    # preloaded objects in every worker.
+    gc.freeze()
+
+    children = {_fork_worker(sock, host, port, log_level) for _ in range(workers)}
+    logger.info("Started %s API workers on %s:%s", workers, host, port)
+    stopping = False
+
+    def _stop(signum: int, _frame: object) -> None:
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGINT, _stop)
+    signal.signal(signal.SIGTERM, _stop)
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        children.discard(pid)
+        if stopping:
+            continue
+        logger.warning(
+            "API worker %s exited with status %s; restarting",
+            pid,
+            os.waitstatus_to_exitcode(status),
+        )
+        time.sleep(_RESPAWN_DELAY_SECONDS)
+        children.add(_fork_worker(sock, host, port, log_level))
+    sock.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default=os.getenv("API_HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("API_PORT", "8000")))
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("API_WORKERS", "1")),
+        help="Number of worker processes (default: API_WORKERS or 1)",
+    )
+    parser.add_argument("--log-level", default=os.getenv("API_LOG_LEVEL", "info"))
+    args = parser.parse_args()
+
+    logging.basicConfig(level=args.log_level.upper())
+    serve(
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        log_level=args.log_level,
+    )
+
+
+if __name__ == "__main__":
+    main()
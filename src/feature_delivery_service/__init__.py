@@ -1,6 +1,31 @@
-from .ingestion import run_bitcoin_ingestion
-from .reader import load_candles_from_duckdb, load_labeled_candles_from_duckdb
+from .ingestion import run_bitcoin_ingestion, run_multi_stream_ingestion
+from .backfill import run_bitcoin_backfill
+from .gaps import Gap, find_gaps, repair_gaps
+from .reader import (
+    iter_candle_arrays,
+    iter_candles_from_duckdb,
+    iter_feature_arrays,
+    iter_labeled_arrays,
+    load_candle_arrays,
+    load_candles_from_duckdb,
+    load_feature_arrays,
+    load_labeled_arrays,
+    load_labeled_candles_from_duckdb,
+)
 from .etl import materialize_labeled_candles
+from .streaming import (
+    KlineSource,
+    PollingSource,
+    ReplaySource,
+    StreamIngestor,
+)
+from .features import (
+    DEFAULT_FEATURE_SET,
+    FeatureSet,
+    FeatureSpec,
+    materialize_features,
+)
+from .tools.singletons import get_duckdb_storage_manager
 
 
 def ingest_and_label(
@@ -9,24 +34,138 @@ def ingest_and_label(
     destination_table: str = "btc_candles_labeled",
     label_limit: int | None = None,
 ):
-    """Run ingestion and immediately materialize labeled candles."""
+    """Run ingestion and immediately materialize labeled candles and features.
+
+    Labels and the default feature set are updated incrementally unless
+    ``label_limit`` asks for a bounded full rebuild of the labels. Candles
+    from the previous high-water mark onward are checked for gaps first and
+    missing windows are refetched. Repaired rows all lie after that mark,
+    which the incremental starts (one row before the labeled high-water
+    mark, ``lookback + 1`` rows before the feature one) already cover, so
+    no full rebuild is needed.
+    """
+    previous_high_water_mark = get_duckdb_storage_manager().max_value(
+        source_table, "open_time"
+    )
     new_rows, total_rows = run_bitcoin_ingestion()
+    gaps = find_gaps(table=source_table, start=previous_high_water_mark)
+    repaired_rows = repair_gaps(gaps, table=source_table) if gaps else 0
     labeled_rows = materialize_labeled_candles(
         source_table=source_table,
         destination_table=destination_table,
         limit=label_limit,
+        incremental=label_limit is None,
     )
+    feature_rows = materialize_features(source_table=source_table)
+    return {
+        "ingested_rows": new_rows,
+        "total_rows": total_rows + repaired_rows,
+        "gaps_found": len(gaps),
+        "gap_rows_repaired": repaired_rows,
+        "labeled_rows": labeled_rows,
+        "feature_rows": feature_rows,
+    }
+
+
+def backfill_and_label(
+    start_time: int,
+    end_time: int,
+    *,
+    max_workers: int = 4,
+    source_table: str = "btc_candles",
+    destination_table: str = "btc_candles_labeled",
+):
+    """Backfill a historical time range and materialize labeled candles.
+
+    Backfilled rows may predate the labeled high-water mark, so labels and
+    features are fully rebuilt rather than updated incrementally. The
+    candles were stored after newer ones, so the table is re-clustered by
+    ``open_time`` first.
+    """
+    new_rows, total_rows = run_bitcoin_backfill(
+        start_time,
+        end_time,
+        table=source_table,
+        max_workers=max_workers,
+    )
+    get_duckdb_storage_manager().cluster(source_table, "open_time")
+    labeled_rows = materialize_labeled_candles(
+        source_table=source_table,
+        destination_table=destination_table,
+    )
+    feature_rows = materialize_features(source_table=source_table, incremental=False)
     return {
         "ingested_rows": new_rows,
         "total_rows": total_rows,
         "labeled_rows": labeled_rows,
+        "feature_rows": feature_rows,
     }
 
 
+def repair_gaps_and_label(
+    *,
+    max_workers: int = 4,
+    dry_run: bool = False,
+    source_table: str = "btc_candles",
+    destination_table: str = "btc_candles_labeled",
+):
+    """Scan the whole candle table for gaps, refetch them and relabel.
+
+    With ``dry_run=True`` gaps are only reported. When any candle was
+    repaired the table is re-clustered by ``open_time`` and labels and
+    features are fully rebuilt.
+    """
+    gaps = find_gaps(table=source_table)
+    summary = {
+        "gaps_found": len(gaps),
+        "missing_rows": sum(gap.missing for gap in gaps),
+        "gap_rows_repaired": 0,
+        "labeled_rows": 0,
+        "feature_rows": 0,
+    }
+    if dry_run or not gaps:
+        return summary
+    summary["gap_rows_repaired"] = repair_gaps(
+        gaps, table=source_table, max_workers=max_workers
+    )
+    if summary["gap_rows_repaired"]:
+        get_duckdb_storage_manager().cluster(source_table, "open_time")
+        summary["labeled_rows"] = materialize_labeled_candles(
+            source_table=source_table,
+            destination_table=destination_table,
+        )
+        summary["feature_rows"] = materialize_features(
+            source_table=source_table, incremental=False
+        )
+    return summary
+
+
 __all__ = [
     "run_bitcoin_ingestion",
+    "run_multi_stream_ingestion",
+    "run_bitcoin_backfill",
+    "Gap",
+    "find_gaps",
+    "repair_gaps",
     "load_candles_from_duckdb",
     "materialize_labeled_candles",
     "load_labeled_candles_from_duckdb",
+    "load_candle_arrays",
+    "load_labeled_arrays",
+    "iter_candles_from_duckdb",
+    "iter_candle_arrays",
+    "iter_labeled_arrays",
+    "load_feature_arrays",
+    "iter_feature_arrays",
+    "FeatureSpec",
+    "FeatureSet",
+    "DEFAULT_FEATURE_SET",
+    "materialize_features",
+    "KlineSource",
+    "PollingSource",
+    "ReplaySource",
+    "StreamIngestor",
     "ingest_and_label",
+    "backfill_and_label",
+    "repair_gaps_and_label",
 ]
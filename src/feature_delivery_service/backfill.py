@@ -0,0 +1,130 @@
+"""Paginated, concurrent historical backfill of Bitcoin candles."""
+
+from __future__ import annotations
+
+import logging
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Iterator, Optional
+
+from .tools.binance_client import (
+    MAX_KLINES_PER_REQUEST,
+    BinanceClient,
+    interval_to_milliseconds,
+)
+from .tools.config import load_ingestion_config
+from .tools.duckdb_storage_manager import DuckDBStorageManager
+from .tools.schemas import BASE_COLUMN_NAMES, BASE_FIELDS_TYPES
+from .tools.singletons import get_binance_client, get_duckdb_storage_manager
+
+logger = logging.getLogger(__name__)
+
+
+def plan_backfill_windows(
+    start_time: int,
+    end_time: int,
+    interval: str,
+    page_size: int = MAX_KLINES_PER_REQUEST,
+) -> Iterator[tuple[int, int]]:
+    """Yield inclusive ``(start, end)`` ms windows of at most ``page_size`` klines."""
+    if end_time <= start_time:
+        raise ValueError("end_time must be greater than start_time")
+    step = interval_to_milliseconds(interval) * page_size
+    window_start = start_time
+    while window_start < end_time:
+        window_end = min(window_start + step, end_time)
+        yield window_start, window_end - 1
+        window_start = window_end
+
+
+def store_windows(
+    windows: Iterator[tuple[int, int]],
+    *,
+    interval: str,
+    table: str,
+    max_workers: int,
+    client: BinanceClient,
+    storage: DuckDBStorageManager,
+) -> int:
+    """Fetch each inclusive ms window and write it to ``table`` as it arrives.
+
+    Returns the number of new rows stored.
+    """
+    new_rows = 0
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending: set[Future] = set()
+
+        def _submit_next() -> bool:
+            window = next(windows, None)
+            if window is None:
+                return False
+            pending.add(
+                executor.submit(
+                    client.fetch_candle_columns,
+                    interval=interval,
+                    limit=MAX_KLINES_PER_REQUEST,
+                    start_time=window[0],
+                    end_time=window[1],
+                )
+            )
+            return True
+
+        while len(pending) < 2 * max_workers and _submit_next():
+            pass
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                # DuckDB writes stay on this thread; workers only do HTTP.
+                new_rows += storage.upsert_columnar(
+                    table=table,
+                    columns=BASE_COLUMN_NAMES,
+                    types=list(BASE_FIELDS_TYPES),
+                    batch=future.result(),
+                    sort_key="open_time",
+                )
+                _submit_next()
+    return new_rows
+
+
+def run_bitcoin_backfill(
+    start_time: int,
+    end_time: int,
+    *,
+    interval: Optional[str] = None,
+    table: Optional[str] = None,
+    max_workers: int = 4,
+    client: Optional[BinanceClient] = None,
+    storage: Optional[DuckDBStorageManager] = None,
+) -> tuple[int, int]:
+    """Fetch ``[start_time, end_time)`` page by page and stream pages into DuckDB.
+
+    Pages are requested through a bounded worker pool; each page is written as
+    soon as it arrives so memory stays proportional to ``max_workers``.
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+
+    config = load_ingestion_config()
+    interval = interval or config.interval
+    table = table or config.table
+    active_client = client or get_binance_client()
+    active_storage = storage or get_duckdb_storage_manager()
+    logger.info(
+        "Running BTC backfill interval=%s start=%s end=%s table=%s workers=%s",
+        interval,
+        start_time,
+        end_time,
+        table,
+        max_workers,
+    )
+
+    new_rows = store_windows(
+        plan_backfill_windows(start_time, end_time, interval),
+        interval=interval,
+        table=table,
+        max_workers=max_workers,
+        client=active_client,
+        storage=active_storage,
+    )
+    total_rows = active_storage.count_rows(table)
+    logger.info("Backfill stored %s new BTC candles (total=%s)", new_rows, total_rows)
+    return new_rows, total_rows
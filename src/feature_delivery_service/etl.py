@@ -3,14 +3,19 @@
 from __future__ import annotations
 
 from dataclasses import asdict
-from typing import List, Sequence
+from datetime import datetime
+from typing import Any, List, Sequence
 
-from .reader import load_candles_from_duckdb
+from .reader import iter_candles_from_duckdb, load_candles_from_duckdb
+from .tools.binance_client import interval_to_milliseconds
+from .tools.config import load_ingestion_config
 from .tools.schemas import (
+    BASE_COLUMN_NAMES,
     LABELED_COLUMN_NAMES,
     LABELED_FIELD_TYPES,
     build_LabeledBitcoinCandle,
 )
+from .tools.duckdb_storage_manager import DuckDBStorageManager, adjacent_sql
 from .tools.singletons import get_duckdb_storage_manager
 
 LabeledBitcoinCandle = build_LabeledBitcoinCandle()
@@ -25,12 +30,27 @@ def build_labeled_candles(
     candles = load_candles_from_duckdb(table=table, limit=limit, order_desc=False)
     if len(candles) < 3:
         raise RuntimeError("Need at least 3 candles to build labeled dataset")
+    return _label_candles(candles)
 
+
+def _label_candles(
+    candles: Sequence, interval_ms: int | None = None
+) -> List[LabeledBitcoinCandle]:
+    """Label every candle that has both a predecessor and a successor.
+
+    With ``interval_ms`` the neighbours must be exactly one interval away,
+    so no label compares prices across missing candles.
+    """
     labeled: list[LabeledBitcoinCandle] = []
     prev_iter: Sequence = candles[:-2]
     curr_iter: Sequence = candles[1:-1]
     next_iter: Sequence = candles[2:]
     for prev_candle, curr_candle, next_candle in zip(prev_iter, curr_iter, next_iter):
+        if interval_ms is not None and not (
+            _is_adjacent(prev_candle, curr_candle, interval_ms)
+            and _is_adjacent(curr_candle, next_candle, interval_ms)
+        ):
+            continue
         payload = asdict(curr_candle)
         payload["close_price_gt_prev"] = int(
             curr_candle.close_price > prev_candle.close_price
@@ -42,20 +62,146 @@ def build_labeled_candles(
     return labeled
 
 
+def _is_adjacent(earlier: Any, later: Any, interval_ms: int) -> bool:
+    # Naive local timestamps; .timestamp() resolves them through the local
+    # zone, so pairs straddling a DST change still compare correctly.
+    delta_ms = round((later.open_time - earlier.open_time).total_seconds() * 1000)
+    if delta_ms == interval_ms:
+        return True
+    return (
+        round((later.open_time.timestamp() - earlier.open_time.timestamp()) * 1000)
+        == interval_ms
+    )
+
+
+def build_labeled_candles_query(
+    *,
+    table: str = "btc_candles",
+    limit: int | None = None,
+    start: datetime | None = None,
+    interval_ms: int | None = None,
+) -> tuple[str, list[Any]]:
+    """Return SQL (and params) labeling candles with LAG/LEAD window functions.
+
+    Mirrors ``build_labeled_candles``, which is kept as the reference
+    implementation. With ``interval_ms`` candles whose predecessor or
+    successor is missing are left unlabeled instead of being compared with
+    a candle further away.
+    """
+    table = DuckDBStorageManager._validated_identifier(table)
+    base_columns = ", ".join(BASE_COLUMN_NAMES)
+    params: list[Any] = []
+    source = f"SELECT {base_columns} FROM {table}"
+    if start is not None:
+        source += " WHERE open_time >= ?"
+        params.append(start)
+    source += " ORDER BY open_time"
+    if limit is not None:
+        if limit <= 0:
+            raise ValueError("limit must be positive when provided")
+        source += " LIMIT ?"
+        params.append(limit)
+
+    conditions = ["prev_close_price IS NOT NULL", "next_close_price IS NOT NULL"]
+    if interval_ms is not None:
+        conditions.append(adjacent_sql("prev_open_time", "open_time", interval_ms))
+        conditions.append(adjacent_sql("open_time", "next_open_time", interval_ms))
+
+    query = f"""
+        SELECT
+            {base_columns},
+            CAST(close_price > prev_close_price AS TINYINT) AS close_price_gt_prev,
+            CAST(next_close_price > close_price AS TINYINT)
+                AS next_close_price_gt_curr
+        FROM (
+            SELECT
+                {base_columns},
+                LAG(close_price) OVER w AS prev_close_price,
+                LEAD(close_price) OVER w AS next_close_price,
+                LAG(open_time) OVER w AS prev_open_time,
+                LEAD(open_time) OVER w AS next_open_time
+            FROM ({source}) AS candles
+            WINDOW w AS (ORDER BY open_time)
+        ) AS windowed
+        WHERE {" AND ".join(conditions)}
+    """
+    return query, params
+
+
+def _incremental_start(
+    storage: DuckDBStorageManager,
+    source_table: str,
+    destination_table: str,
+) -> datetime | None:
+    """Return where incremental labeling must start, or ``None`` for a full run.
+
+    The last labeled row is re-labeled too, in case its neighbours were
+    replaced by a later ingest, so loading starts one row before it.
+    """
+    high_water_mark = storage.max_value(destination_table, "open_time")
+    if high_water_mark is None:
+        return None
+    context_start = storage.max_value(source_table, "open_time", before=high_water_mark)
+    return context_start or high_water_mark
+
+
 def materialize_labeled_candles(
     *,
     source_table: str = "btc_candles",
     destination_table: str = "btc_candles_labeled",
     limit: int | None = None,
+    incremental: bool = False,
+    engine: str = "sql",
+    interval: str | None = None,
 ) -> int:
-    """Persist labeled candles into DuckDB via the storage manager."""
-    labeled = build_labeled_candles(table=source_table, limit=limit)
+    """Persist labeled candles into DuckDB via the storage manager.
+
+    ``engine="sql"`` computes labels inside DuckDB with window functions;
+    ``engine="python"`` runs the reference implementation. With
+    ``incremental=True`` only candles after the labeled high-water mark are
+    (re-)labeled; the first run falls back to a full rebuild. Candles next
+    to a gap in the ``interval`` grid (default: the ingestion interval) are
+    not labeled.
+    """
+    if engine not in ("sql", "python"):
+        raise ValueError(f"Unknown labeling engine: {engine}")
+    if incremental and limit is not None:
+        raise ValueError("limit cannot be combined with incremental labeling")
+
+    interval_ms = interval_to_milliseconds(interval or load_ingestion_config().interval)
     storage = get_duckdb_storage_manager()
-    inserted = storage.upsert(
-        table=destination_table,
-        columns=LABELED_COLUMN_NAMES,
-        types=LABELED_FIELD_TYPES,
-        items=labeled,
-        sort_key="open_time",
+    start = (
+        _incremental_start(storage, source_table, destination_table)
+        if incremental
+        else None
     )
+    if engine == "sql":
+        query, params = build_labeled_candles_query(
+            table=source_table, limit=limit, start=start, interval_ms=interval_ms
+        )
+        return storage.upsert_query(
+            table=destination_table,
+            columns=LABELED_COLUMN_NAMES,
+            types=LABELED_FIELD_TYPES,
+            query=query,
+            params=params,
+            sort_key="open_time",
+        )
+
+    # Stream the reference path so memory stays bounded; the last two
+    # candles of each batch carry over as lag/lead context.
+    inserted = 0
+    context: list = []
+    for batch in iter_candles_from_duckdb(
+        table=source_table, limit=limit, start=start, order_desc=False
+    ):
+        candles = context + batch
+        inserted += storage.upsert(
+            table=destination_table,
+            columns=LABELED_COLUMN_NAMES,
+            types=LABELED_FIELD_TYPES,
+            items=_label_candles(candles, interval_ms),
+            sort_key="open_time",
+        )
+        context = candles[-2:]
     return inserted
@@ -0,0 +1,370 @@
+"""Declarative feature registry compiled into DuckDB window-function SQL."""
+
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Callable
+
+from .tools.binance_client import interval_to_milliseconds
+from .tools.config import load_ingestion_config
+from .tools.duckdb_storage_manager import DuckDBStorageManager, adjacent_sql
+from .tools.schemas import BASE_COLUMN_NAMES
+from .tools.singletons import get_duckdb_storage_manager
+
+logger = logging.getLogger(__name__)
+
+LABEL_COLUMN = "next_close_price_gt_curr"
+FEATURE_SET_REGISTRY_TABLE = "feature_set_registry"
+
+# (helper columns computed in a first pass, feature expression, rows of history)
+CompiledFeature = tuple[dict[str, str], str, int]
+
+
+@dataclass(frozen=True)
+class FeatureSpec:
+    """One engineered feature: a ``kind`` applied to a source ``column``.
+
+    ``window`` is the number of bars the feature looks at (including the
+    current one for rolling aggregates, or the lag for returns).
+    """
+
+    name: str
+    kind: str
+    column: str = "close_price"
+    window: int = 1
+    fill: float = 0.0
+
+
+def _frame(window: int) -> str:
+    return f"(ORDER BY open_time ROWS BETWEEN {window - 1} PRECEDING AND CURRENT ROW)"
+
+
+def _column(spec: FeatureSpec) -> CompiledFeature:
+    return {}, spec.column, 0
+
+
+def _gt_prev(spec: FeatureSpec) -> CompiledFeature:
+    return {}, f"CAST({spec.column} > LAG({spec.column}) OVER w AS DOUBLE)", 1
+
+
+def _return(spec: FeatureSpec) -> CompiledFeature:
+    lag = f"LAG({spec.column}, {spec.window}) OVER w"
+    return {}, f"{spec.column} / NULLIF({lag}, 0) - 1", spec.window
+
+
+def _rolling_mean(spec: FeatureSpec) -> CompiledFeature:
+    return {}, f"AVG({spec.column}) OVER {_frame(spec.window)}", spec.window - 1
+
+
+def _rolling_std(spec: FeatureSpec) -> CompiledFeature:
+    return {}, f"STDDEV_SAMP({spec.column}) OVER {_frame(spec.window)}", spec.window - 1
+
+
+def _volatility(spec: FeatureSpec) -> CompiledFeature:
+    helper = f"_log_return_{spec.column}"
+    helpers = {helper: f"LN({spec.column} / NULLIF(LAG({spec.column}) OVER w, 0))"}
+    return helpers, f"STDDEV_SAMP({helper}) OVER {_frame(spec.window)}", spec.window
+
+
+def _rsi(spec: FeatureSpec) -> CompiledFeature:
+    helper = f"_change_{spec.column}"
+    helpers = {helper: f"{spec.column} - LAG({spec.column}) OVER w"}
+    frame = _frame(spec.window)
+    gain = f"AVG(GREATEST({helper}, 0)) OVER {frame}"
+    loss = f"AVG(GREATEST(-{helper}, 0)) OVER {frame}"
+    return helpers, f"100 * {gain} / NULLIF({gain} + {loss}, 0)", spec.window
+
+
+def _vwap(spec: FeatureSpec) -> CompiledFeature:
+    frame = _frame(spec.window)
+    expression = (
+        f"SUM(volume_usd) OVER {frame} / NULLIF(SUM(volume_btc) OVER {frame}, 0)"
+    )
+    return {}, expression, spec.window - 1
+
+
+def _taker_buy_ratio(spec: FeatureSpec) -> CompiledFeature:
+    frame = _frame(spec.window)
+    expression = (
+        f"SUM(taker_buy_volume_btc) OVER {frame} "
+        f"/ NULLIF(SUM(volume_btc) OVER {frame}, 0)"
+    )
+    return {}, expression, spec.window - 1
+
+
+FEATURE_KINDS: dict[str, Callable[[FeatureSpec], CompiledFeature]] = {
+    "column": _column,
+    "gt_prev": _gt_prev,
+    "return": _return,
+    "rolling_mean": _rolling_mean,
+    "rolling_std": _rolling_std,
+    "volatility": _volatility,
+    "rsi": _rsi,
+    "vwap": _vwap,
+    "taker_buy_ratio": _taker_buy_ratio,
+}
+
+
+@dataclass(frozen=True)
+class FeatureSet:
+    """A named, versioned list of features materialized into one table.
+
+    Changing the features of a set requires bumping ``version``, which
+    materializes them into a new ``<name>_v<version>`` table.
+    """
+
+    name: str
+    version: int
+    features: tuple[FeatureSpec, ...]
+
+    def __post_init__(self) -> None:
+        names = [spec.name for spec in self.features]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Duplicate feature names in {self.name}")
+        for spec in self.features:
+            DuckDBStorageManager._validated_identifier(spec.name)
+            DuckDBStorageManager._validated_identifier(spec.column)
+            if spec.kind not in FEATURE_KINDS:
+                raise ValueError(f"Unknown feature kind: {spec.kind}")
+            if spec.column not in BASE_COLUMN_NAMES:
+                raise ValueError(f"Unknown source column: {spec.column}")
+            if spec.window < 1:
+                raise ValueError(f"Feature {spec.name} needs a window of at least 1")
+
+    @property
+    def table(self) -> str:
+        return f"{self.name}_v{self.version}"
+
+    @property
+    def feature_names(self) -> tuple[str, ...]:
+        return tuple(spec.name for spec in self.features)
+
+    @property
+    def columns(self) -> list[str]:
+        return ["open_time", "close_time", *self.feature_names, LABEL_COLUMN]
+
+    @property
+    def types(self) -> tuple[str, ...]:
+        return ("TIMESTAMP", "TIMESTAMP", *["DOUBLE"] * len(self.features), "TINYINT")
+
+    @property
+    def lookback(self) -> int:
+        """Rows of history the widest feature needs before its first value."""
+        return max(
+            (FEATURE_KINDS[spec.kind](spec)[2] for spec in self.features), default=0
+        )
+
+    def definition(self) -> str:
+        return json.dumps([asdict(spec) for spec in self.features], sort_keys=True)
+
+
+def _feature(
+    name: str,
+    kind: str,
+    column: str = "close_price",
+    window: int = 1,
+    fill: float = 0.0,
+) -> FeatureSpec:
+    return FeatureSpec(name=name, kind=kind, column=column, window=window, fill=fill)
+
+
+DEFAULT_FEATURE_SET = FeatureSet(
+    name="btc_features",
+    version=1,
+    features=(
+        *(
+            _feature(column, "column", column)
+            for column in BASE_COLUMN_NAMES
+            if column not in ("open_time", "close_time")
+        ),
+        _feature("close_price_gt_prev", "gt_prev"),
+        _feature("return_1", "return", window=1),
+        _feature("return_5", "return", window=5),
+        _feature("return_15", "return", window=15),
+        _feature("close_mean_15", "rolling_mean", window=15),
+        _feature("close_mean_60", "rolling_mean", window=60),
+        _feature("close_std_15", "rolling_std", window=15),
+        _feature("volatility_15", "volatility", window=15),
+        _feature("volatility_60", "volatility", window=60),
+        _feature("rsi_14", "rsi", window=14, fill=50.0),
+        _feature("vwap_15", "vwap", window=15),
+        _feature("taker_buy_ratio", "taker_buy_ratio", fill=0.5),
+        _feature("taker_buy_ratio_15", "taker_buy_ratio", window=15, fill=0.5),
+    ),
+)
+
+
+def build_feature_query(
+    feature_set: FeatureSet = DEFAULT_FEATURE_SET,
+    *,
+    source_table: str = "btc_candles",
+    start: datetime | None = None,
+    interval_ms: int | None = None,
+) -> tuple[str, list[Any]]:
+    """Compile ``feature_set`` into one SQL query (and params).
+
+    Rows without ``lookback`` predecessors in the selected range are left
+    out, so ``start`` must point that many rows before the first row to
+    compute. The label is NULL for the newest candle until its successor
+    arrives. With ``interval_ms`` rows whose lookback window spans missing
+    candles are left out too, and the label stays NULL until the next
+    candle itself (not a later one) is stored.
+    """
+    source_table = DuckDBStorageManager._validated_identifier(source_table)
+    helpers: dict[str, str] = {}
+    expressions = []
+    for spec in feature_set.features:
+        spec_helpers, expression, _ = FEATURE_KINDS[spec.kind](spec)
+        helpers.update(spec_helpers)
+        expressions.append(f"COALESCE({expression}, {spec.fill!r}) AS {spec.name}")
+
+    params: list[Any] = []
+    source = f"SELECT {', '.join(BASE_COLUMN_NAMES)} FROM {source_table}"
+    if start is not None:
+        source += " WHERE open_time >= ?"
+        params.append(start)
+    helper_columns = "".join(
+        f",\n                {expression} AS {name}"
+        for name, expression in helpers.items()
+    )
+    feature_columns = ",\n                ".join(expressions)
+    label = "CAST(LEAD(close_price) OVER w > close_price AS TINYINT)"
+    complete = f"ROW_NUMBER() OVER w > {feature_set.lookback}"
+    if interval_ms is not None:
+        next_is_adjacent = adjacent_sql(
+            "open_time", "LEAD(open_time) OVER w", interval_ms
+        )
+        label = f"CASE WHEN {next_is_adjacent} THEN {label} END"
+        if feature_set.lookback:
+            window_is_contiguous = adjacent_sql(
+                f"LAG(open_time, {feature_set.lookback}) OVER w",
+                "open_time",
+                interval_ms,
+                feature_set.lookback,
+            )
+            complete += f" AND {window_is_contiguous}"
+    query = f"""
+        WITH helpers AS (
+            SELECT
+                *,
+                ({complete}) AS _complete{helper_columns}
+            FROM ({source}) AS candles
+            WINDOW w AS (ORDER BY open_time)
+        ),
+        features AS (
+            SELECT
+                open_time,
+                close_time,
+                {feature_columns},
+                {label} AS {LABEL_COLUMN},
+                _complete
+            FROM helpers
+            WINDOW w AS (ORDER BY open_time)
+        )
+        SELECT {", ".join(feature_set.columns)}
+        FROM features
+        WHERE _complete
+    """
+    return query, params
+
+
+def _check_registered_definition(
+    storage: DuckDBStorageManager, feature_set: FeatureSet
+) -> None:
+    """Record the set's definition, refusing to change an existing version."""
+    definition = feature_set.definition()
+    if storage.table_exists(FEATURE_SET_REGISTRY_TABLE):
+        rows = storage.fetch_rows(
+            FEATURE_SET_REGISTRY_TABLE,
+            ["definition"],
+            where=[("table_name", "=", feature_set.table)],
+        )
+        if rows:
+            if rows[0][0] != definition:
+                raise ValueError(
+                    f"Feature set {feature_set.table} was materialized with a "
+                    "different definition; bump its version"
+                )
+            return
+    storage.upsert_columnar(
+        table=FEATURE_SET_REGISTRY_TABLE,
+        columns=["table_name", "definition", "registered_at"],
+        types=["VARCHAR", "VARCHAR", "TIMESTAMP"],
+        batch={
+            "table_name": [feature_set.table],
+            "definition": [definition],
+            "registered_at": [datetime.now()],
+        },
+        sort_key="table_name",
+    )
+
+
+def _incremental_start(
+    storage: DuckDBStorageManager,
+    source_table: str,
+    feature_set: FeatureSet,
+) -> datetime | None:
+    """Return where incremental materialization must start reading candles.
+
+    The two newest materialized rows are recomputed: the newest may have
+    been stored while its candle was still in progress, and the label of
+    the row before it compares against that candle's close. ``lookback``
+    rows before them are read as window context only.
+    """
+    high_water_mark = storage.max_value(feature_set.table, "open_time")
+    if high_water_mark is None:
+        return None
+    rows_before = feature_set.lookback + 1
+    context = storage.fetch_columns(
+        source_table,
+        ["open_time"],
+        where=[("open_time", "<", high_water_mark)],
+        order_by="open_time",
+        order_desc=True,
+        limit=rows_before,
+    )["open_time"]
+    if len(context) < rows_before:
+        return None
+    return context[-1].astype("datetime64[us]").item()
+
+
+def materialize_features(
+    feature_set: FeatureSet = DEFAULT_FEATURE_SET,
+    *,
+    source_table: str = "btc_candles",
+    incremental: bool = True,
+    interval: str | None = None,
+) -> int:
+    """Compute ``feature_set`` in DuckDB and upsert it into its versioned table.
+
+    With ``incremental=True`` only the newest materialized rows and the
+    candles after them are computed (plus window context); the first run
+    is a full build. Windows spanning missing candles of ``interval`` (default: the
+    ingestion interval) are skipped.
+    """
+    storage = get_duckdb_storage_manager()
+    _check_registered_definition(storage, feature_set)
+    start = (
+        _incremental_start(storage, source_table, feature_set) if incremental else None
+    )
+    query, params = build_feature_query(
+        feature_set,
+        source_table=source_table,
+        start=start,
+        interval_ms=interval_to_milliseconds(
+            interval or load_ingestion_config().interval
+        ),
+    )
+    rows = storage.upsert_query(
+        table=feature_set.table,
+        columns=feature_set.columns,
+        types=feature_set.types,
+        query=query,
+        params=params,
+        sort_key="open_time",
+    )
+    logger.info("Materialized %s new rows into %s", rows, feature_set.table)
+    return rows
@@ -0,0 +1,114 @@
+"""Detection and targeted repair of missing candles."""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterator, Optional, Sequence
+
+from .backfill import plan_backfill_windows, store_windows
+from .tools.binance_client import BinanceClient, interval_to_milliseconds
+from .tools.config import load_ingestion_config
+from .tools.duckdb_storage_manager import DuckDBStorageManager
+from .tools.singletons import get_binance_client, get_duckdb_storage_manager
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Gap:
+    """Missing candles between two stored neighbours.
+
+    ``start_ms``/``end_ms`` bound the missing open times as a half-open
+    epoch-millisecond range, ready to be refetched from Binance.
+    """
+
+    after: datetime
+    before: datetime
+    start_ms: int
+    end_ms: int
+    missing: int
+
+
+def find_gaps(
+    *,
+    table: Optional[str] = None,
+    interval: Optional[str] = None,
+    start: Optional[datetime] = None,
+    storage: Optional[DuckDBStorageManager] = None,
+) -> list[Gap]:
+    """Scan ``open_time`` (from ``start`` onward) for missing candles.
+
+    One LEAD pass over the column finds every neighbour pair further apart
+    than ``interval``, and is skipped entirely when the row count already
+    matches the scanned time span.
+    """
+    config = load_ingestion_config()
+    table = table or config.table
+    interval_ms = interval_to_milliseconds(interval or config.interval)
+    active_storage = storage or get_duckdb_storage_manager()
+    gaps = [
+        Gap(
+            after=after,
+            before=before,
+            start_ms=after_ms + interval_ms,
+            end_ms=before_ms,
+            missing=max(0, (before_ms - after_ms) // interval_ms - 1),
+        )
+        for after, before, after_ms, before_ms in active_storage.sequence_gaps(
+            table, "open_time", interval_ms, start=start
+        )
+    ]
+    if gaps:
+        logger.warning(
+            "Found %s gaps (%s missing candles) in %s",
+            len(gaps),
+            sum(gap.missing for gap in gaps),
+            table,
+        )
+    return gaps
+
+
+def _gap_windows(gaps: Sequence[Gap], interval: str) -> Iterator[tuple[int, int]]:
+    for gap in gaps:
+        if gap.end_ms > gap.start_ms:
+            yield from plan_backfill_windows(gap.start_ms, gap.end_ms, interval)
+
+
+def repair_gaps(
+    gaps: Sequence[Gap],
+    *,
+    table: Optional[str] = None,
+    interval: Optional[str] = None,
+    max_workers: int = 4,
+    client: Optional[BinanceClient] = None,
+    storage: Optional[DuckDBStorageManager] = None,
+) -> int:
+    """Refetch only the windows covered by ``gaps`` and return new rows stored.
+
+    Gaps Binance has no data for (e.g. exchange downtime) stay unfilled and
+    are reported again by the next scan.
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+    if not gaps:
+        return 0
+    config = load_ingestion_config()
+    table = table or config.table
+    interval = interval or config.interval
+    new_rows = store_windows(
+        _gap_windows(gaps, interval),
+        interval=interval,
+        table=table,
+        max_workers=max_workers,
+        client=client or get_binance_client(),
+        storage=storage or get_duckdb_storage_manager(),
+    )
+    logger.info(
+        "Repaired %s of %s missing candles in %s",
+        new_rows,
+        sum(gap.missing for gap in gaps),
+        table,
+    )
+    return new_rows
@@ -3,12 +3,33 @@
 from __future__ import annotations
 
 import logging
-from .tools.config import load_ingestion_config
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional
+
+import pandas as pd
+
+from .tools.binance_client import BinanceClient
+from .tools.config import (
+    CandleStream,
+    MultiStreamIngestionConfig,
+    load_ingestion_config,
+    load_multi_stream_config,
+)
+from .tools.duckdb_storage_manager import DuckDBStorageManager
 from .tools.singletons import get_binance_client, get_duckdb_storage_manager
-from .tools.schemas import BASE_COLUMN_NAMES, BASE_FIELDS_TYPES
+from .tools.schemas import (
+    BASE_COLUMN_NAMES,
+    BASE_FIELDS_TYPES,
+    STREAM_COLUMN_NAMES,
+    STREAM_FIELD_TYPES,
+    STREAM_PRIMARY_KEY,
+)
 
 logger = logging.getLogger(__name__)
 
+# Fetched rows buffered before they are written in one upsert.
+_STREAM_WRITE_BATCH_ROWS = 50_000
+
 
 def run_bitcoin_ingestion(
     # client: Optional[BinanceClient] = None,
@@ -24,18 +45,108 @@ def run_bitcoin_ingestion(
     )
     active_client = get_binance_client()
     active_storage = get_duckdb_storage_manager()
-    candles = active_client.fetch_candles(
+    candles = active_client.fetch_candle_columns(
         interval=config.interval,
         limit=config.limit,
         start_time=config.start_time,
         end_time=config.end_time,
     )
-    new_rows = active_storage.upsert(
+    new_rows = active_storage.upsert_columnar(
         table=config.table,
         columns=BASE_COLUMN_NAMES,
         types=list(BASE_FIELDS_TYPES),
-        items=candles,
+        batch=candles,
         sort_key="open_time",
     )
     total_rows = active_storage.count_rows(config.table)
     return new_rows, total_rows
+
+
+def _stream_frame(stream: CandleStream, candles: dict) -> pd.DataFrame:
+    frame = pd.DataFrame(candles, columns=BASE_COLUMN_NAMES)
+    frame.insert(0, "symbol", stream.symbol)
+    frame.insert(1, "kline_interval", stream.interval)
+    return frame
+
+
+def run_multi_stream_ingestion(
+    config: Optional[MultiStreamIngestionConfig] = None,
+    *,
+    client: Optional[BinanceClient] = None,
+    storage: Optional[DuckDBStorageManager] = None,
+) -> tuple[int, int]:
+    """Fetch every configured (symbol, interval) stream into one keyed table.
+
+    Streams are fetched concurrently through one client, so they share a
+    single rate-limit budget. Rows are keyed by (symbol, kline_interval,
+    open_time) and written from this thread in batches, so one DuckDB
+    connection serves every stream.
+    """
+    config = config or load_multi_stream_config()
+    if config.max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+    active_client = client or get_binance_client()
+    active_storage = storage or get_duckdb_storage_manager()
+    logger.info(
+        "Running multi-stream ingestion streams=%s limit=%s table=%s workers=%s",
+        len(config.streams),
+        config.limit,
+        config.table,
+        config.max_workers,
+    )
+
+    new_rows = 0
+    buffered: list[pd.DataFrame] = []
+    buffered_rows = 0
+
+    def _flush() -> int:
+        nonlocal buffered, buffered_rows
+        if not buffered:
+            return 0
+        batch = pd.concat(buffered, ignore_index=True)
+        buffered, buffered_rows = [], 0
+        return active_storage.upsert_columnar(
+            table=config.table,
+            columns=STREAM_COLUMN_NAMES,
+            types=STREAM_FIELD_TYPES,
+            batch=batch,
+            sort_key="open_time",
+            key_columns=STREAM_PRIMARY_KEY,
+        )
+
+    with ThreadPoolExecutor(max_workers=config.max_workers) as executor:
+        futures = {
+            executor.submit(
+                active_client.fetch_candle_columns,
+                symbol=stream.symbol,
+                interval=stream.interval,
+                limit=config.limit,
+            ): stream
+            for stream in config.streams
+        }
+        for future in as_completed(futures):
+            stream = futures[future]
+            try:
+                candles = future.result()
+            except Exception:
+                logger.exception(
+                    "Failed to fetch %s %s candles", stream.symbol, stream.interval
+                )
+                continue
+            buffered.append(_stream_frame(stream, candles))
+            buffered_rows += len(candles["open_time"])
+            if buffered_rows >= _STREAM_WRITE_BATCH_ROWS:
+                new_rows += _flush()
+    new_rows += _flush()
+
+    total_rows = (
+        active_storage.count_rows(config.table)
+        if active_storage.table_exists(config.table)
+        else 0
+    )
+    logger.info(
+        "Multi-stream ingestion stored %s new candles (total=%s)",
+        new_rows,
+        total_rows,
+    )
+    return new_rows, total_rows
@@ -2,14 +2,19 @@
 
 from __future__ import annotations
 
-from typing import Callable, List, Optional, Sequence, TypeVar
+from datetime import datetime
+from typing import Any, Callable, Iterator, List, Optional, Sequence, TypeVar
 
+import numpy as np
+
+from .features import DEFAULT_FEATURE_SET, LABEL_COLUMN, FeatureSet
 from .tools.binance_client import BitcoinCandle
 from .tools.schemas import (
     BASE_COLUMN_NAMES,
     LABELED_COLUMN_NAMES,
     build_LabeledBitcoinCandle,
 )
+from .tools.duckdb_storage_manager import DEFAULT_BATCH_SIZE, Predicate
 from .tools.singletons import get_duckdb_storage_manager
 
 T = TypeVar("T")
@@ -22,11 +27,19 @@ def load_rows_from_duckdb(
     table: str,
     columns: Sequence[str],
     limit: Optional[int] = None,
+    start: Any | None = None,
+    end: Any | None = None,
+    where: Sequence[Predicate] = (),
     order_by: str | None = None,
     order_desc: bool = False,
     row_factory: RowFactory | None = None,
 ) -> List[T] | List[tuple]:
-    """Return ordered rows from the requested table."""
+    """Return ordered rows from the requested table.
+
+    ``start``/``end`` bound ``order_by`` to ``[start, end)`` and ``where``
+    takes ``(column, operator, value)`` predicates such as
+    ``("trade_count", ">", 0)``; both are evaluated inside DuckDB.
+    """
     if not columns:
         raise ValueError("columns must include at least one field")
     if limit is not None and limit <= 0:
@@ -37,6 +50,9 @@ def load_rows_from_duckdb(
         table=table,
         columns=columns,
         limit=limit,
+        start=start,
+        end=end,
+        where=where,
         order_by=order_by,
         order_desc=order_desc,
         row_factory=row_factory,
@@ -48,6 +64,9 @@ def load_candles_from_duckdb(
     table: str = "btc_candles",
     columns: Sequence[str] | None = None,
     limit: Optional[int] = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    where: Sequence[Predicate] = (),
     order_desc: bool = False,
 ) -> List[BitcoinCandle]:
     """Return Bitcoin candles stored in DuckDB as ``BitcoinCandle`` objects."""
@@ -56,6 +75,9 @@ def load_candles_from_duckdb(
         table=table,
         columns=active_columns,
         limit=limit,
+        start=start,
+        end=end,
+        where=where,
         order_by="open_time",
         order_desc=order_desc,
         row_factory=lambda row: BitcoinCandle(*row),
@@ -68,6 +90,9 @@ def load_labeled_candles_from_duckdb(
     table: str = "btc_candles_labeled",
     columns: Sequence[str] | None = None,
     limit: Optional[int] = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    where: Sequence[Predicate] = (),
     order_desc: bool = False,
 ) -> List[LabeledBitcoinCandle]:
     """Return labeled Bitcoin candles stored in DuckDB."""
@@ -76,8 +101,228 @@ def load_labeled_candles_from_duckdb(
         table=table,
         columns=active_columns,
         limit=limit,
+        start=start,
+        end=end,
+        where=where,
         order_by="open_time",
         order_desc=order_desc,
         row_factory=lambda row: LabeledBitcoinCandle(*row),
     )
     return rows
+
+
+def load_columns_from_duckdb(
+    *,
+    table: str,
+    columns: Sequence[str],
+    limit: Optional[int] = None,
+    start: Any | None = None,
+    end: Any | None = None,
+    where: Sequence[Predicate] = (),
+    order_by: str | None = None,
+    order_desc: bool = False,
+) -> dict[str, np.ndarray]:
+    """Return ordered columns from the requested table as NumPy arrays."""
+    if not columns:
+        raise ValueError("columns must include at least one field")
+    if limit is not None and limit <= 0:
+        raise ValueError("limit must be positive when provided")
+
+    storage = get_duckdb_storage_manager()
+    return storage.fetch_columns(
+        table=table,
+        columns=columns,
+        limit=limit,
+        start=start,
+        end=end,
+        where=where,
+        order_by=order_by,
+        order_desc=order_desc,
+    )
+
+
+def load_candle_arrays(
+    *,
+    table: str = "btc_candles",
+    columns: Sequence[str] | None = None,
+    limit: Optional[int] = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    where: Sequence[Predicate] = (),
+    order_desc: bool = False,
+) -> dict[str, np.ndarray]:
+    """Return Bitcoin candle columns as contiguous typed NumPy arrays."""
+    return load_columns_from_duckdb(
+        table=table,
+        columns=list(columns or BASE_COLUMN_NAMES),
+        limit=limit,
+        start=start,
+        end=end,
+        where=where,
+        order_by="open_time",
+        order_desc=order_desc,
+    )
+
+
+def load_labeled_arrays(
+    *,
+    table: str = "btc_candles_labeled",
+    columns: Sequence[str] | None = None,
+    limit: Optional[int] = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    where: Sequence[Predicate] = (),
+    order_desc: bool = False,
+) -> dict[str, np.ndarray]:
+    """Return labeled Bitcoin candle columns as contiguous typed NumPy arrays."""
+    return load_columns_from_duckdb(
+        table=table,
+        columns=list(columns or LABELED_COLUMN_NAMES),
+        limit=limit,
+        start=start,
+        end=end,
+        where=where,
+        order_by="open_time",
+        order_desc=order_desc,
+    )
+
+
+def iter_candles_from_duckdb(
+    *,
+    table: str = "btc_candles",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    limit: Optional[int] = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    where: Sequence[Predicate] = (),
+    order_desc: bool = False,
+) -> Iterator[List[BitcoinCandle]]:
+    """Yield batches of ``BitcoinCandle`` objects in bounded memory."""
+    storage = get_duckdb_storage_manager()
+    yield from storage.iter_rows(
+        table=table,
+        columns=BASE_COLUMN_NAMES,
+        batch_size=batch_size,
+        limit=limit,
+        start=start,
+        end=end,
+        where=where,
+        order_by="open_time",
+        order_desc=order_desc,
+        row_factory=lambda row: BitcoinCandle(*row),
+    )
+
+
+def iter_candle_arrays(
+    *,
+    table: str = "btc_candles",
+    columns: Sequence[str] | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    limit: Optional[int] = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    where: Sequence[Predicate] = (),
+    order_desc: bool = False,
+) -> Iterator[dict[str, np.ndarray]]:
+    """Yield batches of Bitcoin candle columns as NumPy arrays."""
+    storage = get_duckdb_storage_manager()
+    yield from storage.iter_columns(
+        table=table,
+        columns=list(columns or BASE_COLUMN_NAMES),
+        batch_size=batch_size,
+        limit=limit,
+        start=start,
+        end=end,
+        where=where,
+        order_by="open_time",
+        order_desc=order_desc,
+    )
+
+
+def iter_labeled_arrays(
+    *,
+    table: str = "btc_candles_labeled",
+    columns: Sequence[str] | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    limit: Optional[int] = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    where: Sequence[Predicate] = (),
+    order_desc: bool = False,
+) -> Iterator[dict[str, np.ndarray]]:
+    """Yield batches of labeled Bitcoin candle columns as NumPy arrays."""
+    storage = get_duckdb_storage_manager()
+    yield from storage.iter_columns(
+        table=table,
+        columns=list(columns or LABELED_COLUMN_NAMES),
+        batch_size=batch_size,
+        limit=limit,
+        start=start,
+        end=end,
+        where=where,
+        order_by="open_time",
+        order_desc=order_desc,
+    )
+
+
+def _feature_predicates(
+    where: Sequence[Predicate], labeled_only: bool
+) -> list[Predicate]:
+    predicates = list(where)
+    if labeled_only:
+        predicates.append((LABEL_COLUMN, "!=", None))
+    return predicates
+
+
+def load_feature_arrays(
+    *,
+    feature_set: FeatureSet = DEFAULT_FEATURE_SET,
+    columns: Sequence[str] | None = None,
+    limit: Optional[int] = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    where: Sequence[Predicate] = (),
+    labeled_only: bool = False,
+    order_desc: bool = False,
+) -> dict[str, np.ndarray]:
+    """Return columns of a materialized feature set as NumPy arrays.
+
+    ``labeled_only`` drops the newest candle(s) whose label is not known yet.
+    """
+    return load_columns_from_duckdb(
+        table=feature_set.table,
+        columns=list(columns or feature_set.columns),
+        limit=limit,
+        start=start,
+        end=end,
+        where=_feature_predicates(where, labeled_only),
+        order_by="open_time",
+        order_desc=order_desc,
+    )
+
+
+def iter_feature_arrays(
+    *,
+    feature_set: FeatureSet = DEFAULT_FEATURE_SET,
+    columns: Sequence[str] | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    limit: Optional[int] = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    where: Sequence[Predicate] = (),
+    labeled_only: bool = False,
+    order_desc: bool = False,
+) -> Iterator[dict[str, np.ndarray]]:
+    """Yield batches of a materialized feature set's columns as NumPy arrays."""
+    storage = get_duckdb_storage_manager()
+    yield from storage.iter_columns(
+        table=feature_set.table,
+        columns=list(columns or feature_set.columns),
+        batch_size=batch_size,
+        limit=limit,
+        start=start,
+        end=end,
+        where=_feature_predicates(where, labeled_only),
+        order_by="open_time",
+        order_desc=order_desc,
+    )
@@ -0,0 +1,340 @@
+"""Long-running ingestion of closed klines from a streaming source."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, AsyncIterator, Optional, Protocol, Sequence
+from urllib import error, request
+
+import numpy as np
+
+from .etl import materialize_labeled_candles
+from .features import DEFAULT_FEATURE_SET, FeatureSet, materialize_features
+from .reader import load_feature_arrays
+from .tools.async_binance_client import AsyncBinanceClient
+from .tools.binance_client import MAX_KLINES_PER_REQUEST, interval_to_milliseconds
+from .tools.schemas import (
+    BASE_COLUMN_NAMES,
+    BASE_FIELDS_TYPES,
+    decode_klines_columnar,
+    epoch_ms_to_local_datetime,
+)
+from .tools.singletons import get_duckdb_storage_manager
+
+logger = logging.getLogger(__name__)
+
+# Latency samples kept for percentile reporting.
+_LATENCY_WINDOW = 10_000
+
+
+class KlineSource(Protocol):
+    """Async iterable of closed klines in Binance's raw list format.
+
+    Each item is a batch of one or more klines whose candles have closed,
+    oldest first. Implementations can wrap a websocket, REST polling or a
+    local replay.
+    """
+
+    def __aiter__(self) -> AsyncIterator[list[list[Any]]]: ...
+
+
+class ReplaySource:
+    """Replay recorded klines, optionally at the pace they originally closed.
+
+    With ``follow_clock=True`` each kline is released once the wall clock
+    passes its ``close_time``, like a live stream of freshly closed
+    candles; otherwise klines are yielded as fast as they are consumed.
+    """
+
+    def __init__(
+        self, entries: Sequence[list[Any]], *, follow_clock: bool = False
+    ) -> None:
+        self.entries = sorted(entries, key=lambda entry: int(entry[0]))
+        self.follow_clock = follow_clock
+
+    @classmethod
+    def from_file(cls, path: str | Path, **kwargs: Any) -> ReplaySource:
+        """Load a JSON array of klines, e.g. a saved Binance klines response."""
+        return cls(json.loads(Path(path).read_text()), **kwargs)
+
+    async def __aiter__(self) -> AsyncIterator[list[list[Any]]]:
+        for entry in self.entries:
+            if self.follow_clock:
+                delay = (int(entry[6]) + 1) / 1000 - time.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            yield [entry]
+
+
+class PollingSource:
+    """Closed klines polled from the Binance REST API just after each close.
+
+    Klines are requested from ``start_time`` (epoch ms) onward; only those
+    whose ``close_time`` has passed are yielded, and each kline once.
+    """
+
+    def __init__(
+        self,
+        client: AsyncBinanceClient,
+        *,
+        interval: str,
+        symbol: Optional[str] = None,
+        start_time: Optional[int] = None,
+        poll_delay: float = 1.0,
+    ) -> None:
+        self.client = client
+        self.interval = interval
+        self.symbol = symbol
+        self.start_time = start_time
+        self.poll_delay = poll_delay
+        self._interval_ms = interval_to_milliseconds(interval)
+
+    async def __aiter__(self) -> AsyncIterator[list[list[Any]]]:
+        next_start = self.start_time
+        while True:
+            now_ms = int(time.time() * 1000)
+            if next_start is None:
+                # Start with the most recently closed candle.
+                next_start = now_ms - now_ms % self._interval_ms - self._interval_ms
+            try:
+                entries = await self.client.fetch_klines(
+                    interval=self.interval,
+                    limit=MAX_KLINES_PER_REQUEST,
+                    start_time=next_start,
+                    symbol=self.symbol,
+                )
+            except (RuntimeError, ValueError):
+                # One bad poll (API error, malformed payload) must not end
+                # the daemon; the next poll retries from the same start.
+                logger.exception("Polling Binance klines failed")
+                entries = []
+            closed = [entry for entry in entries if int(entry[6]) < now_ms]
+            if closed:
+                next_start = int(closed[-1][0]) + 1
+                yield closed
+            if len(closed) == MAX_KLINES_PER_REQUEST:
+                continue  # still catching up
+            now = time.time()
+            next_close = (now * 1000 // self._interval_ms + 1) * self._interval_ms
+            await asyncio.sleep(max(0.0, next_close / 1000 - now + self.poll_delay))
+
+
+@dataclass
+class StreamStats:
+    """Counters and latency samples of a streaming ingestion run.
+
+    ``close_to_stored`` measures from a candle's close to its feature row
+    being committed; ``receive_to_stored`` from the source yielding it.
+    """
+
+    klines: int = 0
+    new_rows: int = 0
+    batches: int = 0
+    pushed_rows: int = 0
+    close_to_stored: deque = field(
+        default_factory=lambda: deque(maxlen=_LATENCY_WINDOW)
+    )
+    receive_to_stored: deque = field(
+        default_factory=lambda: deque(maxlen=_LATENCY_WINDOW)
+    )
+    close_to_pushed: deque = field(
+        default_factory=lambda: deque(maxlen=_LATENCY_WINDOW)
+    )
+
+    def summary(self) -> dict[str, float]:
+        """Counts plus p50/p95/max (seconds) of each latency measure."""
+        summary: dict[str, float] = {
+            "klines": self.klines,
+            "new_rows": self.new_rows,
+            "batches": self.batches,
+            "pushed_rows": self.pushed_rows,
+        }
+        for name in ("close_to_stored", "receive_to_stored", "close_to_pushed"):
+            samples = np.asarray(getattr(self, name), dtype=np.float64)
+            if len(samples):
+                summary[f"{name}_p50"] = float(np.percentile(samples, 50))
+                summary[f"{name}_p95"] = float(np.percentile(samples, 95))
+                summary[f"{name}_max"] = float(samples.max())
+        return summary
+
+
+class StreamIngestor:
+    """Append closed klines to DuckDB and keep labels and features current.
+
+    Klines that arrive while a batch is being written are grouped into the
+    next batch (up to ``max_batch_rows``), so each small transaction also
+    updates labels and features incrementally. With ``push_url`` the new
+    feature rows are POSTed to the API's ``/features`` endpoint. ``interval``
+    is the kline interval being streamed (default: the ingestion interval).
+    """
+
+    def __init__(
+        self,
+        *,
+        table: str = "btc_candles",
+        labeled_table: str = "btc_candles_labeled",
+        feature_set: FeatureSet = DEFAULT_FEATURE_SET,
+        interval: Optional[str] = None,
+        max_batch_rows: int = 1000,
+        max_batch_delay: float = 0.0,
+        push_url: Optional[str] = None,
+        push_timeout: float = 2.0,
+        report_every: float = 60.0,
+    ) -> None:
+        if max_batch_rows < 1:
+            raise ValueError("max_batch_rows must be at least 1")
+        self.table = table
+        self.labeled_table = labeled_table
+        self.feature_set = feature_set
+        self.interval = interval
+        self.max_batch_rows = max_batch_rows
+        self.max_batch_delay = max_batch_delay
+        self.push_url = push_url
+        self.push_timeout = push_timeout
+        self.report_every = report_every
+        self.stats = StreamStats()
+
+    async def run(
+        self, source: KlineSource, stop: Optional[asyncio.Event] = None
+    ) -> StreamStats:
+        """Consume ``source`` until it ends or ``stop`` is set."""
+        queue: asyncio.Queue = asyncio.Queue()
+        stop = stop or asyncio.Event()
+
+        async def _produce() -> None:
+            try:
+                async for entries in source:
+                    received_at = time.time()
+                    for entry in entries:
+                        queue.put_nowait((entry, received_at))
+            finally:
+                stop.set()
+
+        producer = asyncio.create_task(_produce())
+        stopped = asyncio.create_task(stop.wait())
+        last_report = time.monotonic()
+        try:
+            while True:
+                if queue.empty():
+                    getter = asyncio.create_task(queue.get())
+                    await asyncio.wait(
+                        {getter, stopped}, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    if not getter.done():
+                        getter.cancel()
+                        break
+                    batch = [getter.result()]
+                else:
+                    batch = [queue.get_nowait()]
+                if self.max_batch_delay > 0:
+                    await asyncio.sleep(self.max_batch_delay)
+                while not queue.empty() and len(batch) < self.max_batch_rows:
+                    batch.append(queue.get_nowait())
+                await asyncio.to_thread(self._write_batch, batch)
+                if time.monotonic() - last_report >= self.report_every:
+                    self._report()
+                    last_report = time.monotonic()
+        finally:
+            producer.cancel()
+            stopped.cancel()
+            await asyncio.gather(producer, stopped, return_exceptions=True)
+            self._report()
+        return self.stats
+
+    def _write_batch(self, batch: list[tuple[list[Any], float]]) -> None:
+        entries = [entry for entry, _ in batch]
+        columns = decode_klines_columnar(entries, epoch_ms=True)
+        close_ms = columns["close_time"]
+        for name in ("open_time", "close_time"):
+            columns[name] = epoch_ms_to_local_datetime(columns[name])
+
+        storage = get_duckdb_storage_manager()
+        self.stats.new_rows += storage.upsert_columnar(
+            table=self.table,
+            columns=BASE_COLUMN_NAMES,
+            types=list(BASE_FIELDS_TYPES),
+            batch=columns,
+            sort_key="open_time",
+        )
+        materialize_labeled_candles(
+            source_table=self.table,
+            destination_table=self.labeled_table,
+            incremental=True,
+            interval=self.interval,
+        )
+        materialize_features(
+            self.feature_set, source_table=self.table, interval=self.interval
+        )
+        stored_at = time.time()
+
+        self.stats.klines += len(entries)
+        self.stats.batches += 1
+        closed_at = (close_ms + 1) / 1000
+        self.stats.close_to_stored.extend((stored_at - closed_at).tolist())
+        self.stats.receive_to_stored.extend(
+            stored_at - received_at for _, received_at in batch
+        )
+        if self.push_url and self._push(columns["open_time"].min().item()):
+            self.stats.close_to_pushed.extend((time.time() - closed_at).tolist())
+
+    def _push(self, since: datetime) -> bool:
+        """POST feature rows from ``since`` onward to the API feature cache."""
+        names = list(self.feature_set.feature_names)
+        rows = load_feature_arrays(
+            feature_set=self.feature_set,
+            columns=["open_time", *names],
+            start=since,
+        )
+        if len(rows["open_time"]) == 0:
+            return False
+        payload = {
+            "rows": [
+                {
+                    "open_time": open_time.isoformat(),
+                    "features": dict(zip(names, values)),
+                }
+                for open_time, *values in zip(
+                    rows["open_time"].astype("datetime64[us]").tolist(),
+                    *(
+                        np.asarray(rows[name], dtype=np.float64).tolist()
+                        for name in names
+                    ),
+                )
+            ]
+        }
+        req = request.Request(
+            self.push_url,
+            data=json.dumps(payload).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        try:
+            with request.urlopen(req, timeout=self.push_timeout) as resp:
+                resp.read()
+        except (error.URLError, OSError) as exc:
+            logger.warning("Pushing features to %s failed: %s", self.push_url, exc)
+            return False
+        self.stats.pushed_rows += len(payload["rows"])
+        return True
+
+    def _report(self) -> None:
+        summary = self.stats.summary()
+        if not summary["klines"]:
+            return
+        logger.info(
+            "Streamed %s klines in %s batches (%s new); close->stored p50=%.3fs "
+            "p95=%.3fs max=%.3fs",
+            summary["klines"],
+            summary["batches"],
+            summary["new_rows"],
+            summary["close_to_stored_p50"],
+            summary["close_to_stored_p95"],
+            summary["close_to_stored_max"],
+        )
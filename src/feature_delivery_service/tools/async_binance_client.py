@@ -0,0 +1,387 @@
+"""asyncio Binance klines client with keep-alive connection pooling."""
+
+from __future__ import annotations
+
+import asyncio
+import codecs
+import json
+import logging
+import random
+import ssl
+from collections import deque
+from typing import TYPE_CHECKING, Any, List, Optional
+from urllib import parse
+
+import numpy as np
+
+from .binance_client import (
+    _RETRYABLE_STATUS,
+    _USED_WEIGHT_HEADER,
+    _USER_AGENT,
+    DEFAULT_BINANCE_BASE_URL,
+    DEFAULT_BITCOIN_SYMBOL,
+    KLINES_REQUEST_WEIGHT,
+    BitcoinCandle,
+    RateLimiter,
+    klines_params,
+)
+from .schemas import decode_klines_columnar
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+logger = logging.getLogger(__name__)
+
+_READ_CHUNK_BYTES = 64 * 1024
+_Connection = tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+
+class _KlineArrayDecoder:
+    """Incrementally decode a JSON array of klines as body chunks arrive.
+
+    Each kline is parsed as soon as its closing bracket has been received,
+    so decoding overlaps with the network read instead of waiting for the
+    whole payload. Malformed input raises ``RuntimeError``, as the sync
+    client does.
+    """
+
+    def __init__(self) -> None:
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._started = False
+        self._finished = False
+
+    def feed(self, data: bytes) -> list[Any]:
+        try:
+            self._buffer += self._text.decode(data)
+        except UnicodeDecodeError as exc:
+            raise RuntimeError("Kline payload is not valid UTF-8") from exc
+        entries = []
+        buffer, position = self._buffer, 0
+        while not self._finished:
+            while position < len(buffer) and buffer[position] in " \t\r\n,":
+                position += 1
+            if position == len(buffer):
+                break
+            if not self._started:
+                if buffer[position] != "[":
+                    raise RuntimeError("Expected a JSON array of klines")
+                self._started = True
+                position += 1
+                continue
+            if buffer[position] == "]":
+                self._finished = True
+                position += 1
+                break
+            try:
+                entry, position = self._decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                break  # the entry is split across chunks; wait for more data
+            entries.append(entry)
+        self._buffer = buffer[position:]
+        return entries
+
+    def close(self) -> None:
+        if not self._finished or self._buffer.strip():
+            raise RuntimeError("Truncated or malformed kline payload")
+
+
+class _HTTPStatusError(Exception):
+    def __init__(self, status: int, headers: dict[str, str], body: bytes) -> None:
+        super().__init__(f"HTTP {status}")
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+
+class _ConnectionPool:
+    """Idle keep-alive connections to one host, capped at ``max_connections``."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        ssl_context: ssl.SSLContext | None,
+        max_connections: int,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.ssl_context = ssl_context
+        self._idle: deque[_Connection] = deque()
+        self._slots = asyncio.Semaphore(max_connections)
+
+    async def acquire(self) -> _Connection:
+        await self._slots.acquire()
+        try:
+            while self._idle:
+                reader, writer = self._idle.pop()
+                if not writer.is_closing() and not reader.at_eof():
+                    return reader, writer
+                writer.close()
+            return await asyncio.open_connection(
+                self.host,
+                self.port,
+                ssl=self.ssl_context,
+                server_hostname=self.host if self.ssl_context else None,
+            )
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, connection: _Connection, *, reusable: bool) -> None:
+        if reusable:
+            self._idle.append(connection)
+        else:
+            connection[1].close()
+        self._slots.release()
+
+    async def close(self) -> None:
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+
+class AsyncBinanceClient:
+    """asyncio counterpart of ``BinanceClient`` with pooled HTTP/1.1 connections.
+
+    At most ``max_connections`` requests are in flight; each reuses an idle
+    keep-alive connection when one is available, avoiding a TCP and TLS
+    handshake per call. 418/429 responses honour ``Retry-After`` through the
+    shared ``RateLimiter``; 5xx responses and dropped connections are
+    retried with full-jitter exponential backoff. Use it as an async context
+    manager, or call :meth:`aclose` when done.
+    """
+
+    def __init__(
+        self,
+        *,
+        base_url: str = DEFAULT_BINANCE_BASE_URL,
+        symbol: str = DEFAULT_BITCOIN_SYMBOL,
+        timeout: float = 15,
+        max_retries: int = 5,
+        max_connections: int = 10,
+        backoff_base: float = 0.5,
+        backoff_cap: float = 30.0,
+        rate_limiter: RateLimiter | None = None,
+    ) -> None:
+        url = parse.urlsplit(base_url)
+        if url.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported URL scheme: {url.scheme}")
+        self.base_url = base_url
+        self.symbol = symbol
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self._host = url.hostname or "localhost"
+        self._path = url.path or "/"
+        self._host_header = url.netloc
+        self._pool = _ConnectionPool(
+            self._host,
+            url.port or (443 if url.scheme == "https" else 80),
+            ssl.create_default_context() if url.scheme == "https" else None,
+            max_connections,
+        )
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self._pool.close()
+
+    async def fetch_candles(
+        self,
+        *,
+        interval: str = "1h",
+        limit: int = 500,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+        symbol: Optional[str] = None,
+    ) -> List[BitcoinCandle]:
+        """Pull candles from Binance, by default for the client's BTC market."""
+        entries = await self.fetch_klines(
+            interval=interval,
+            limit=limit,
+            start_time=start_time,
+            end_time=end_time,
+            symbol=symbol,
+        )
+        candles = [BitcoinCandle.from_binance(entry) for entry in entries]
+        logger.debug("Fetched %s %s candles", len(candles), symbol or self.symbol)
+        return candles
+
+    async def fetch_candle_columns(
+        self,
+        *,
+        interval: str = "1h",
+        limit: int = 500,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+        symbol: Optional[str] = None,
+    ) -> dict[str, np.ndarray]:
+        """Pull candles as typed NumPy columns ready for ``upsert_columnar``."""
+        return decode_klines_columnar(
+            await self.fetch_klines(
+                interval=interval,
+                limit=limit,
+                start_time=start_time,
+                end_time=end_time,
+                symbol=symbol,
+            )
+        )
+
+    async def fetch_klines(
+        self,
+        *,
+        interval: str = "1h",
+        limit: int = 500,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+        symbol: Optional[str] = None,
+    ) -> list[list[Any]]:
+        """Return the raw decoded kline JSON entries."""
+        params = klines_params(
+            symbol or self.symbol, interval, limit, start_time, end_time
+        )
+        logger.info(
+            "Requesting %s kline data from Binance interval=%s limit=%s",
+            params["symbol"],
+            interval,
+            limit,
+        )
+        return await self._get(f"{self._path}?{parse.urlencode(params)}")
+
+    async def _get(self, target: str, weight: int = KLINES_REQUEST_WEIGHT) -> list:
+        """GET ``target`` with rate limiting, retries and jittered backoff."""
+        for attempt in range(self.max_retries + 1):
+            while (delay := self.rate_limiter.reserve(weight)) > 0:
+                await asyncio.sleep(delay)
+            try:
+                return await asyncio.wait_for(self._request(target), self.timeout)
+            except _HTTPStatusError as exc:
+                retryable = exc.status in _RETRYABLE_STATUS or exc.status >= 500
+                if not retryable or attempt == self.max_retries:
+                    message = exc.body.decode("utf-8", errors="ignore")
+                    raise RuntimeError(
+                        f"Binance API error (status {exc.status}): {message}"
+                    ) from exc
+                if exc.status in _RETRYABLE_STATUS:
+                    retry_after = float(
+                        exc.headers.get("retry-after") or self._backoff(attempt)
+                    )
+                    logger.warning(
+                        "Binance rate limited request (status %s); retrying in %.1fs",
+                        exc.status,
+                        retry_after,
+                    )
+                    self.rate_limiter.block_for(retry_after)
+                    continue
+                delay = self._backoff(attempt)
+                logger.warning(
+                    "Binance server error (status %s); retrying in %.2fs",
+                    exc.status,
+                    delay,
+                )
+            except ValueError as exc:
+                # Unparsable status line, chunk size or Content-Length.
+                raise RuntimeError("Malformed response from Binance API") from exc
+            except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError) as exc:
+                if attempt == self.max_retries:
+                    raise RuntimeError("Unable to reach Binance API") from exc
+                delay = self._backoff(attempt)
+                logger.warning(
+                    "Binance request failed (%r); retrying in %.2fs", exc, delay
+                )
+            await asyncio.sleep(delay)
+        raise RuntimeError("Binance API retries exhausted")
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2**attempt))
+
+    async def _request(self, target: str) -> list:
+        connection = await self._pool.acquire()
+        reusable = False
+        try:
+            reader, writer = connection
+            writer.write(
+                (
+                    f"GET {target} HTTP/1.1\r\n"
+                    f"Host: {self._host_header}\r\n"
+                    f"User-Agent: {_USER_AGENT}\r\n"
+                    "Accept: application/json\r\n"
+                    "Connection: keep-alive\r\n\r\n"
+                ).encode("ascii")
+            )
+            await writer.drain()
+            status, headers = await self._read_head(reader)
+            decoder = _KlineArrayDecoder() if status == 200 else None
+            entries: list = []
+            body = bytearray()
+            async for chunk in self._iter_body(reader, headers):
+                if decoder is None:
+                    body += chunk
+                else:
+                    entries.extend(decoder.feed(chunk))
+            reusable = headers.get("connection", "").lower() != "close" and (
+                "content-length" in headers or "transfer-encoding" in headers
+            )
+            if decoder is None:
+                raise _HTTPStatusError(status, headers, bytes(body))
+            decoder.close()
+            used_weight = headers.get(_USED_WEIGHT_HEADER.lower())
+            if used_weight is not None:
+                self.rate_limiter.record_used_weight(int(used_weight))
+            return entries
+        finally:
+            self._pool.release(connection, reusable=reusable)
+
+    @staticmethod
+    async def _read_head(reader: asyncio.StreamReader) -> tuple[int, dict[str, str]]:
+        status_line = await reader.readuntil(b"\r\n")
+        parts = status_line.decode("latin-1").split(" ", 2)
+        if len(parts) < 2 or not parts[0].startswith("HTTP/"):
+            raise OSError(f"Malformed HTTP status line: {status_line!r}")
+        headers: dict[str, str] = {}
+        while (line := await reader.readuntil(b"\r\n")) != b"\r\n":
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        return int(parts[1]), headers
+
+    @staticmethod
+    async def _iter_body(reader: asyncio.StreamReader, headers: dict[str, str]):
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            while True:
+                size_line = await reader.readuntil(b"\r\n")
+                size = int(size_line.split(b";", 1)[0], 16)
+                if size == 0:
+                    while await reader.readuntil(b"\r\n") != b"\r\n":
+                        pass  # trailers
+                    return
+                remaining = size
+                while remaining:
+                    chunk = await reader.read(min(remaining, _READ_CHUNK_BYTES))
+                    if not chunk:
+                        raise asyncio.IncompleteReadError(b"", remaining)
+                    remaining -= len(chunk)
+                    yield chunk
+                await reader.readexactly(2)
+        elif "content-length" in headers:
+            remaining = int(headers["content-length"])
+            while remaining:
+                chunk = await reader.read(min(remaining, _READ_CHUNK_BYTES))
+                if not chunk:
+                    raise asyncio.IncompleteReadError(b"", remaining)
+                remaining -= len(chunk)
+                yield chunk
+        else:
+            while chunk := await reader.read(_READ_CHUNK_BYTES):
+                yield chunk
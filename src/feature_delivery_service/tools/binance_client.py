@@ -5,9 +5,14 @@ from __future__ import annotations
 import json
 import logging
 import os
-from typing import List, Optional
+import threading
+import time
+from typing import Any, List, Optional
 from urllib import error, parse, request
-from .schemas import build_BitcoinCandle
+
+import numpy as np
+
+from .schemas import build_BitcoinCandle, decode_klines_columnar
 
 BitcoinCandle = build_BitcoinCandle()
 
@@ -18,12 +23,128 @@ DEFAULT_BINANCE_BASE_URL = os.getenv(
     "https://api.binance.com/api/v3/klines",
 )
 DEFAULT_BITCOIN_SYMBOL = os.getenv("BINANCE_SYMBOL", "BTCUSDT")
+DEFAULT_WEIGHT_LIMIT = int(os.getenv("BINANCE_WEIGHT_LIMIT", "6000"))
+
+MAX_KLINES_PER_REQUEST = 1000
+# Request weight Binance charges for one klines call.
+KLINES_REQUEST_WEIGHT = 2
 
 _USER_AGENT = "MLFlowProject/bitcoin-ingest"
+_USED_WEIGHT_HEADER = "X-MBX-USED-WEIGHT-1m"
+_RETRYABLE_STATUS = (418, 429)
+
+_INTERVAL_UNITS_MS = {
+    "s": 1_000,
+    "m": 60_000,
+    "h": 3_600_000,
+    "d": 86_400_000,
+    "w": 604_800_000,
+}
+
+
+def interval_to_milliseconds(interval: str) -> int:
+    """Return the duration of a Binance kline interval (e.g. ``1m``) in ms."""
+    amount, unit = interval[:-1], interval[-1]
+    if not amount.isdigit() or unit not in _INTERVAL_UNITS_MS:
+        raise ValueError(f"Unsupported kline interval: {interval}")
+    return int(amount) * _INTERVAL_UNITS_MS[unit]
+
+
+def klines_params(
+    symbol: str,
+    interval: str,
+    limit: int,
+    start_time: Optional[int],
+    end_time: Optional[int],
+) -> dict[str, str | int]:
+    """Return validated query parameters for one klines request."""
+    if not 1 <= limit <= MAX_KLINES_PER_REQUEST:
+        raise ValueError("limit must be between 1 and 1000 (inclusive)")
+    params: dict[str, str | int] = {
+        "symbol": symbol,
+        "interval": interval,
+        "limit": limit,
+    }
+    if start_time is not None:
+        params["startTime"] = start_time
+    if end_time is not None:
+        params["endTime"] = end_time
+    return params
+
+
+class RateLimiter:
+    """Thread-safe gate shared by concurrent requests against the Binance API.
+
+    Besides reacting to 429s and the used-weight header, the limiter keeps
+    its own count of weight spent in the current minute, so many concurrent
+    streams sharing one limiter stay inside a single budget before the
+    server has reported anything.
+    """
+
+    def __init__(self, weight_limit: int = DEFAULT_WEIGHT_LIMIT) -> None:
+        self.weight_limit = weight_limit
+        self._blocked_until = 0.0
+        self._minute = 0
+        self._spent = 0
+        self._lock = threading.Lock()
+
+    def wait(self, weight: int = 0) -> None:
+        """Block until the API accepts requests and ``weight`` fits the budget."""
+        while True:
+            delay = self.reserve(weight)
+            if delay <= 0:
+                return
+            time.sleep(delay)
+
+    def reserve(self, weight: int) -> float:
+        """Spend ``weight`` and return 0, or return how long to wait first.
+
+        Non-blocking, so asyncio callers can sleep on the returned delay.
+        """
+        with self._lock:
+            delay = self._blocked_until - time.monotonic()
+            if delay > 0:
+                return delay
+            self._roll_minute()
+            if self._spent and self._spent + weight > 0.9 * self.weight_limit:
+                return 60 - time.time() % 60
+            self._spent += weight
+            return 0.0
+
+    def _roll_minute(self) -> None:
+        minute = int(time.time() // 60)
+        if minute != self._minute:
+            self._minute, self._spent = minute, 0
+
+    def block_for(self, seconds: float) -> None:
+        """Pause every caller for ``seconds`` (e.g. after a 429 Retry-After)."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    def record_used_weight(self, used_weight: int) -> None:
+        """Back off until the next minute once the weight budget is nearly spent."""
+        with self._lock:
+            self._roll_minute()
+            # The server's count also includes other clients on the same IP.
+            self._spent = max(self._spent, used_weight)
+        if used_weight < 0.9 * self.weight_limit:
+            return
+        seconds_left = 60 - time.time() % 60
+        logger.warning(
+            "Binance used weight %s/%s; pausing %.1fs",
+            used_weight,
+            self.weight_limit,
+            seconds_left,
+        )
+        self.block_for(seconds_left)
 
 
 class BinanceClient:
-    """Thin Binance REST client dedicated to BTC candles."""
+    """Thin Binance REST client dedicated to BTC candles.
+
+    ``symbol`` is the default market; ``fetch_candles(symbol=...)`` lets one
+    client (and so one rate limiter) serve many markets concurrently.
+    """
 
     def __init__(
         self,
@@ -31,10 +152,14 @@ class BinanceClient:
         base_url: str = DEFAULT_BINANCE_BASE_URL,
         symbol: str = DEFAULT_BITCOIN_SYMBOL,
         timeout: int = 15,
+        max_retries: int = 5,
+        rate_limiter: RateLimiter | None = None,
     ) -> None:
         self.base_url = base_url
         self.symbol = symbol
         self.timeout = timeout
+        self.max_retries = max_retries
+        self.rate_limiter = rate_limiter or RateLimiter()
 
     def fetch_candles(
         self,
@@ -43,41 +168,93 @@ class BinanceClient:
         limit: int = 500,
         start_time: Optional[int] = None,
         end_time: Optional[int] = None,
+        symbol: Optional[str] = None,
     ) -> List[BitcoinCandle]:
-        """Pull BTC-only candles from Binance using the BTC/USDT market."""
-        if not 1 <= limit <= 1000:
-            raise ValueError("limit must be between 1 and 1000 (inclusive)")
-
-        params: dict[str, str | int] = {
-            "symbol": self.symbol,
-            "interval": interval,
-            "limit": limit,
-        }
-        if start_time is not None:
-            params["startTime"] = start_time
-        if end_time is not None:
-            params["endTime"] = end_time
+        """Pull candles from Binance, by default for the client's BTC market."""
+        data = self.fetch_klines(
+            interval=interval,
+            limit=limit,
+            start_time=start_time,
+            end_time=end_time,
+            symbol=symbol,
+        )
+        candles = [BitcoinCandle.from_binance(entry) for entry in data]
+        logger.debug("Fetched %s %s candles", len(candles), symbol or self.symbol)
+        return candles
 
+    def fetch_candle_columns(
+        self,
+        *,
+        interval: str = "1h",
+        limit: int = 500,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+        symbol: Optional[str] = None,
+    ) -> dict[str, np.ndarray]:
+        """Pull candles as typed NumPy columns ready for ``upsert_columnar``."""
+        return decode_klines_columnar(
+            self.fetch_klines(
+                interval=interval,
+                limit=limit,
+                start_time=start_time,
+                end_time=end_time,
+                symbol=symbol,
+            )
+        )
+
+    def fetch_klines(
+        self,
+        *,
+        interval: str = "1h",
+        limit: int = 500,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+        symbol: Optional[str] = None,
+    ) -> list[list[Any]]:
+        """Return the raw decoded kline JSON entries."""
+        params = klines_params(
+            symbol or self.symbol, interval, limit, start_time, end_time
+        )
         url = f"{self.base_url}?{parse.urlencode(params)}"
         logger.info(
-            "Requesting BTC kline data from Binance interval=%s limit=%s",
+            "Requesting %s kline data from Binance interval=%s limit=%s",
+            params["symbol"],
             interval,
             limit,
         )
+        payload = self._get(url)
+        try:
+            return json.loads(payload)
+        except ValueError as exc:
+            raise RuntimeError("Malformed kline payload from Binance API") from exc
 
+    def _get(self, url: str, weight: int = KLINES_REQUEST_WEIGHT) -> bytes:
+        """GET ``url`` honouring the shared rate limiter and 418/429 Retry-After."""
         req = request.Request(url, headers={"User-Agent": _USER_AGENT})
-        try:
-            with request.urlopen(req, timeout=self.timeout) as resp:
-                payload = resp.read()
-        except error.HTTPError as exc:
-            message = exc.read().decode("utf-8", errors="ignore")
-            raise RuntimeError(
-                f"Binance API error (status {exc.code}): {message}"
-            ) from exc
-        except error.URLError as exc:
-            raise RuntimeError("Unable to reach Binance API") from exc
-
-        data = json.loads(payload)
-        candles = [BitcoinCandle.from_binance(entry) for entry in data]
-        logger.debug("Fetched %s BTC candles", len(candles))
-        return candles
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.wait(weight)
+            try:
+                with request.urlopen(req, timeout=self.timeout) as resp:
+                    payload = resp.read()
+                    used_weight = resp.headers.get(_USED_WEIGHT_HEADER)
+            except error.HTTPError as exc:
+                message = exc.read().decode("utf-8", errors="ignore")
+                if exc.code in _RETRYABLE_STATUS and attempt < self.max_retries:
+                    retry_after = float(exc.headers.get("Retry-After") or 2**attempt)
+                    logger.warning(
+                        "Binance rate limited request (status %s); retrying in %.1fs",
+                        exc.code,
+                        retry_after,
+                    )
+                    self.rate_limiter.block_for(retry_after)
+                    continue
+                raise RuntimeError(
+                    f"Binance API error (status {exc.code}): {message}"
+                ) from exc
+            except error.URLError as exc:
+                raise RuntimeError("Unable to reach Binance API") from exc
+
+            if used_weight is not None:
+                self.rate_limiter.record_used_weight(int(used_weight))
+            return payload
+        raise RuntimeError("Binance API rate limit retries exhausted")
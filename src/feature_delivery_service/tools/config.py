@@ -4,6 +4,9 @@ from typing import Any, Optional
 from pathlib import Path
 
 config_path = os.getenv("INGEST_CONFIG", "config/bitcoin_ingest.json")
+multi_stream_config_path = os.getenv(
+    "MULTI_STREAM_INGEST_CONFIG", "config/multi_stream_ingest.json"
+)
 
 DEFAULT_BINANCE_BASE_URL = os.getenv(
     "BINANCE_BASE_URL",
@@ -43,3 +46,56 @@ def load_ingestion_config(path: Path | None = None) -> IngestionConfig:
         end_time=_maybe_int(payload.get("end_time")),
         table=str(payload.get("table", "btc_candles")),
     )
+
+
+@dataclass(frozen=True)
+class CandleStream:
+    """One (symbol, interval) kline stream."""
+
+    symbol: str
+    interval: str
+
+
+@dataclass(frozen=True)
+class MultiStreamIngestionConfig:
+    """Configuration for ingesting many kline streams into one table."""
+
+    streams: tuple[CandleStream, ...]
+    limit: int = 500
+    table: str = "candles"
+    max_workers: int = 8
+
+
+def load_multi_stream_config(path: Path | None = None) -> MultiStreamIngestionConfig:
+    """Return multi-stream config from JSON.
+
+    Streams are the cross product of ``symbols`` and ``intervals`` plus any
+    explicit ``streams`` entries (``{"symbol": ..., "interval": ...}``).
+    """
+    import json
+
+    config_file = Path(path or multi_stream_config_path)
+    if not config_file.exists():
+        raise FileNotFoundError(f"Ingestion config {config_file} not found")
+
+    payload = json.loads(config_file.read_text())
+    streams = [
+        CandleStream(symbol=str(symbol).upper(), interval=str(interval))
+        for symbol in payload.get("symbols", [])
+        for interval in payload.get("intervals", [])
+    ]
+    streams.extend(
+        CandleStream(
+            symbol=str(entry["symbol"]).upper(), interval=str(entry["interval"])
+        )
+        for entry in payload.get("streams", [])
+    )
+    if not streams:
+        raise ValueError(f"No streams configured in {config_file}")
+
+    return MultiStreamIngestionConfig(
+        streams=tuple(dict.fromkeys(streams)),
+        limit=int(payload.get("limit", 500)),
+        table=str(payload.get("table", "candles")),
+        max_workers=int(payload.get("max_workers", 8)),
+    )
@@ -5,9 +5,12 @@ from __future__ import annotations
 import logging
 import os
 from pathlib import Path
-from typing import Any, Callable, Iterable, Sequence
+from typing import Any, Callable, Iterable, Iterator, Mapping, Sequence
 
 import duckdb
+import numpy as np
+import pandas as pd
+import pyarrow as pa
 
 # from .schemas import CANDLE_COLUMN_ORDER, candle_row, duckdb_schema_sql
 
@@ -16,16 +19,58 @@ logger = logging.getLogger(__name__)
 DEFAULT_FEATURE_DB_PATH = Path(
     os.getenv("FEATURE_DB_PATH", "feature_store/bitcoin.duckdb")
 )
+DEFAULT_BATCH_SIZE = 100_000
+_DUCKDB_VECTOR_SIZE = 2048
+_PREDICATE_OPERATORS = frozenset({"=", "!=", "<", "<=", ">", ">="})
+
+Predicate = tuple[str, str, Any]
+# Position of each row in a staged batch, so the last duplicate key wins.
+_ORDINAL_COLUMN = "_input_ordinal"
+
+
+def adjacent_sql(earlier: str, later: str, step_ms: int, steps: int = 1) -> str:
+    """Return SQL that is true when ``later`` is ``steps`` intervals after ``earlier``.
+
+    Timestamps are naive local time, so a plain difference is off by the DST
+    shift around a transition; only pairs failing the cheap check are
+    re-compared as TIMESTAMPTZ in the session (local) time zone. ``CASE``
+    (unlike ``OR``) skips that slower cast for every other row.
+    """
+    span = step_ms * steps
+    return (
+        f"(CASE WHEN epoch_ms({later}) - epoch_ms({earlier}) = {span} THEN TRUE "
+        f"ELSE epoch_ms(({later})::TIMESTAMPTZ) - epoch_ms(({earlier})::TIMESTAMPTZ) "
+        f"= {span} END)"
+    )
 
 
 class DuckDBStorageManager:
     """DuckDB-backed storage for BTC candle features."""
 
-    def __init__(self, db_path: str | Path = DEFAULT_FEATURE_DB_PATH) -> None:
+    def __init__(
+        self,
+        db_path: str | Path = DEFAULT_FEATURE_DB_PATH,
+        *,
+        read_only: bool | None = None,
+    ) -> None:
+        """Open ``db_path``; ``read_only`` defaults to ``FEATURE_DB_READ_ONLY``.
+
+        Read-only connections let several processes (e.g. API workers) open
+        the same database file at once. ``FEATURE_DB_MEMORY_LIMIT`` (e.g.
+        ``1GB``) caps DuckDB's buffers; larger sorts then spill to disk.
+        """
+        if read_only is None:
+            read_only = os.getenv("FEATURE_DB_READ_ONLY", "0") == "1"
         self.db_path = Path(db_path)
+        self.read_only = read_only
         if self.db_path.parent and not self.db_path.parent.exists():
             self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self.conn = duckdb.connect(str(self.db_path))
+        config = {}
+        if os.getenv("FEATURE_DB_MEMORY_LIMIT"):
+            config["memory_limit"] = os.environ["FEATURE_DB_MEMORY_LIMIT"]
+        self.conn = duckdb.connect(
+            str(self.db_path), read_only=read_only, config=config
+        )
 
     def upsert(
         self,
@@ -34,47 +79,332 @@ class DuckDBStorageManager:
         types: Sequence[str],
         items: Iterable,
         sort_key: str,
+        key_columns: Sequence[str] | None = None,
     ) -> int:
-        """Insert or replace candle rows into DuckDB."""
+        """Insert or replace candle rows into DuckDB.
+
+        Rows are staged as a columnar relation so that new-vs-existing keys
+        are counted with a set-based join instead of a per-key lookup.
+        """
+        rows = pd.DataFrame.from_records(
+            [self.row(item, columns) for item in items],
+            columns=list(columns),
+        )
+        return self.upsert_columnar(
+            table, columns, types, rows, sort_key, key_columns=key_columns
+        )
 
+    def upsert_columnar(
+        self,
+        table: str,
+        columns: Sequence[str],
+        types: Sequence[str],
+        batch: Mapping[str, Any] | pd.DataFrame | pa.Table,
+        sort_key: str,
+        key_columns: Sequence[str] | None = None,
+    ) -> int:
+        """Insert or replace a columnar batch with one set-based statement.
+
+        ``batch`` may be a mapping of column name to NumPy array, a pandas
+        DataFrame or a pyarrow Table; it is registered as a DuckDB relation
+        instead of being converted to Python tuples. ``key_columns`` names a
+        composite primary key; by default the first column is the key. When
+        a key occurs more than once in ``batch`` the last row wins, e.g. the
+        final version of a candle over an in-progress one.
+        """
         table = self._validated_identifier(table)
-        ordered = sorted(items, key=lambda c: getattr(c, sort_key))
-        if not ordered:
+        sort_key = self._validated_identifier(sort_key)
+        if isinstance(batch, Mapping):
+            batch = pd.DataFrame(batch)
+        elif not isinstance(batch, (pd.DataFrame, pa.Table)):
+            raise TypeError(
+                "batch must be a mapping of columns, a pandas DataFrame or a "
+                f"pyarrow Table, not {type(batch).__name__}"
+            )
+        if len(batch) == 0:
             logger.info("No candles supplied for DuckDB storage")
             return 0
+        ordinal = np.arange(len(batch), dtype=np.int64)
+        if isinstance(batch, pd.DataFrame):
+            batch = batch.assign(**{_ORDINAL_COLUMN: ordinal})
+        else:
+            batch = batch.append_column(_ORDINAL_COLUMN, [ordinal])
 
-        self._ensure_schema(self.duckdb_create_table_statement(columns, types, table))
-        existing = self._fetch_existing_keys(
-            table, [getattr(c, sort_key) for c in ordered], sort_key
+        self._ensure_schema(
+            self.duckdb_create_table_statement(columns, types, table, key_columns)
         )
-        rows = [self.row(item, columns) for item in ordered]
-        placeholders = ", ".join(["?"] * len(columns))
-        columns_str = ", ".join(columns)
-        self.conn.executemany(
-            f"""
-            INSERT OR REPLACE INTO {table} ({columns_str})
-            VALUES ({placeholders})
-            """,
-            rows,
+        staged = f"_staged_{table}"
+        self.conn.register(staged, batch)
+        try:
+            inserted_count, replaced_count = self._insert_or_replace_from(
+                table, staged, columns, sort_key, key_columns, _ORDINAL_COLUMN
+            )
+        finally:
+            self.conn.unregister(staged)
+
+        logger.info(
+            "Stored %s rows into %s (%s replaced)",
+            inserted_count,
+            self.db_path,
+            replaced_count,
         )
-        inserted_count = sum(
-            1 for candle in ordered if getattr(candle, sort_key) not in existing
+        return inserted_count
+
+    def upsert_query(
+        self,
+        table: str,
+        columns: Sequence[str],
+        types: Sequence[str],
+        query: str,
+        sort_key: str,
+        params: Sequence[Any] = (),
+        key_columns: Sequence[str] | None = None,
+    ) -> int:
+        """Insert or replace the result of a SELECT without leaving DuckDB.
+
+        The query must return each key at most once.
+        """
+        table = self._validated_identifier(table)
+        sort_key = self._validated_identifier(sort_key)
+        self._ensure_schema(
+            self.duckdb_create_table_statement(columns, types, table, key_columns)
         )
+        staged = f"_staged_{table}"
+        self.conn.execute(f"CREATE OR REPLACE TEMP TABLE {staged} AS {query}", params)
+        try:
+            inserted_count, replaced_count = self._insert_or_replace_from(
+                table, staged, columns, sort_key, key_columns
+            )
+        finally:
+            self.conn.execute(f"DROP TABLE IF EXISTS {staged}")
 
-        logger.info("Stored %s rows into %s", inserted_count, self.db_path)
+        logger.info(
+            "Stored %s rows into %s (%s replaced)",
+            inserted_count,
+            self.db_path,
+            replaced_count,
+        )
         return inserted_count
 
+    def _insert_or_replace_from(
+        self,
+        table: str,
+        source: str,
+        columns: Sequence[str],
+        sort_key: str,
+        key_columns: Sequence[str] | None = None,
+        ordinal: str | None = None,
+    ) -> tuple[int, int]:
+        """Copy ``source`` into ``table`` and return (inserted, replaced) counts.
+
+        Rows are written in key order (``sort_key`` for single-column keys),
+        so each stream of a composite key lands in contiguous runs. Keys
+        repeated in ``source`` keep the row with the highest ``ordinal``;
+        without one, repeated keys are an error.
+        """
+        columns_str = ", ".join(self._validated_identifier(c) for c in columns)
+        keys = [self._validated_identifier(c) for c in key_columns or [sort_key]]
+        keys_str = ", ".join(keys)
+        join_condition = " AND ".join(f"t.{key} = s.{key}" for key in keys)
+        self.conn.begin()
+        try:
+            inserted, replaced, duplicated = self.conn.execute(
+                f"""
+                SELECT
+                    COUNT(*) FILTER (WHERE t.{keys[0]} IS NULL),
+                    COUNT(t.{keys[0]}),
+                    COUNT(*) FILTER (WHERE s._rows > 1)
+                FROM (
+                    SELECT {keys_str}, COUNT(*) AS _rows
+                    FROM {source}
+                    GROUP BY ALL
+                ) AS s
+                LEFT JOIN {table} AS t ON {join_condition}
+                """
+            ).fetchone()
+            deduplicate = ""
+            if duplicated:
+                if ordinal is None:
+                    raise ValueError(f"{source} holds {duplicated} repeated keys")
+                # Only pay for the window when the batch repeats a key.
+                deduplicate = (
+                    f"QUALIFY ROW_NUMBER() OVER "
+                    f"(PARTITION BY {keys_str} ORDER BY {ordinal} DESC) = 1"
+                )
+            self.conn.execute(
+                f"""
+                INSERT OR REPLACE INTO {table} ({columns_str})
+                SELECT {columns_str} FROM {source}
+                {deduplicate}
+                ORDER BY {keys_str if key_columns else sort_key}
+                """
+            )
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        return int(inserted), int(replaced)
+
     def fetch_rows(
         self,
         table: str,
         columns: Sequence[str],
         *,
         limit: int | None = None,
+        start: Any | None = None,
+        end: Any | None = None,
+        where: Sequence[Predicate] = (),
         order_by: str | None = None,
         order_desc: bool = False,
         row_factory: Callable[[tuple], Any] | None = None,
     ) -> list[Any]:
-        """Return ordered rows from a table, optionally applying a row factory."""
+        """Return ordered rows from a table, optionally applying a row factory.
+
+        ``start``/``end`` bound the order column to ``[start, end)`` and
+        ``where`` holds ``(column, operator, value)`` predicates; all of them
+        are pushed into the SQL as parameters. Tables kept in ``open_time``
+        order (see ``cluster``) let DuckDB's per-row-group min/max zonemaps
+        skip everything outside the bounds.
+        """
+        query, params = self._select_query(
+            table,
+            columns,
+            limit=limit,
+            start=start,
+            end=end,
+            where=where,
+            order_by=order_by,
+            order_desc=order_desc,
+        )
+        rows = self.conn.execute(query, params).fetchall()
+        if row_factory is None:
+            return rows
+        return [row_factory(row) for row in rows]
+
+    def fetch_columns(
+        self,
+        table: str,
+        columns: Sequence[str],
+        *,
+        limit: int | None = None,
+        start: Any | None = None,
+        end: Any | None = None,
+        where: Sequence[Predicate] = (),
+        order_by: str | None = None,
+        order_desc: bool = False,
+    ) -> dict[str, np.ndarray]:
+        """Return ordered columns as NumPy arrays without per-row Python objects.
+
+        Columns containing NULLs come back as ``numpy.ma.MaskedArray``.
+        """
+        query, params = self._select_query(
+            table,
+            columns,
+            limit=limit,
+            start=start,
+            end=end,
+            where=where,
+            order_by=order_by,
+            order_desc=order_desc,
+        )
+        return self.conn.execute(query, params).fetchnumpy()
+
+    def iter_rows(
+        self,
+        table: str,
+        columns: Sequence[str],
+        *,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        limit: int | None = None,
+        start: Any | None = None,
+        end: Any | None = None,
+        where: Sequence[Predicate] = (),
+        order_by: str | None = None,
+        order_desc: bool = False,
+        row_factory: Callable[[tuple], Any] | None = None,
+    ) -> Iterator[list[Any]]:
+        """Yield ordered rows in batches of at most ``batch_size`` rows.
+
+        The query runs on a dedicated cursor so callers may keep writing
+        through this manager while consuming the batches.
+        """
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+        query, params = self._select_query(
+            table,
+            columns,
+            limit=limit,
+            start=start,
+            end=end,
+            where=where,
+            order_by=order_by,
+            order_desc=order_desc,
+        )
+        cursor = self.conn.cursor()
+        try:
+            result = cursor.execute(query, params)
+            while rows := result.fetchmany(batch_size):
+                if row_factory is None:
+                    yield rows
+                else:
+                    yield [row_factory(row) for row in rows]
+        finally:
+            cursor.close()
+
+    def iter_columns(
+        self,
+        table: str,
+        columns: Sequence[str],
+        *,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        limit: int | None = None,
+        start: Any | None = None,
+        end: Any | None = None,
+        where: Sequence[Predicate] = (),
+        order_by: str | None = None,
+        order_desc: bool = False,
+    ) -> Iterator[dict[str, np.ndarray]]:
+        """Yield ordered column batches as NumPy arrays.
+
+        ``batch_size`` is rounded up to a multiple of DuckDB's vector size
+        (2048 rows) so each batch is fetched without per-row Python objects.
+        """
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+        query, params = self._select_query(
+            table,
+            columns,
+            limit=limit,
+            start=start,
+            end=end,
+            where=where,
+            order_by=order_by,
+            order_desc=order_desc,
+        )
+        vectors_per_chunk = -(-batch_size // _DUCKDB_VECTOR_SIZE)
+        cursor = self.conn.cursor()
+        try:
+            result = cursor.execute(query, params)
+            while True:
+                chunk = result.fetch_df_chunk(vectors_per_chunk)
+                if chunk.empty:
+                    break
+                yield {column: chunk[column].to_numpy() for column in chunk.columns}
+        finally:
+            cursor.close()
+
+    def _select_query(
+        self,
+        table: str,
+        columns: Sequence[str],
+        *,
+        limit: int | None,
+        start: Any | None,
+        end: Any | None,
+        where: Sequence[Predicate],
+        order_by: str | None,
+        order_desc: bool,
+    ) -> tuple[str, list[Any]]:
         if not columns:
             raise ValueError("columns must include at least one field")
 
@@ -84,42 +414,162 @@ class DuckDBStorageManager:
             if order_by
             else self._validated_identifier(columns[0])
         )
-        column_clause = ", ".join(columns)
+        column_clause = ", ".join(self._validated_identifier(c) for c in columns)
         order_clause = "DESC" if order_desc else "ASC"
+        params: list[Any] = []
+        conditions: list[str] = []
+        if start is not None:
+            conditions.append(f"{order_column} >= ?")
+            params.append(start)
+        if end is not None:
+            conditions.append(f"{order_column} < ?")
+            params.append(end)
+        for column, operator, value in where:
+            column = self._validated_identifier(column)
+            if operator not in _PREDICATE_OPERATORS:
+                raise ValueError(f"Unsupported predicate operator: {operator}")
+            if value is None:
+                if operator not in ("=", "!="):
+                    raise ValueError("NULL predicates only support '=' and '!='")
+                null_check = "IS NULL" if operator == "=" else "IS NOT NULL"
+                conditions.append(f"{column} {null_check}")
+                continue
+            conditions.append(f"{column} {operator} ?")
+            params.append(value)
+        where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
         query = f"""
             SELECT {column_clause}
             FROM {table}
+            {where_clause}
             ORDER BY {order_column} {order_clause}
         """
-        params: list[int] = []
         if limit is not None:
             if limit <= 0:
                 raise ValueError("limit must be positive when provided")
             query += " LIMIT ?"
             params.append(limit)
-
-        rows = self.conn.execute(query, params).fetchall()
-        if row_factory is None:
-            return rows
-        return [row_factory(row) for row in rows]
+        return query, params
 
     def _ensure_schema(self, schema: str) -> None:
         self.conn.execute(schema)
 
-    def _fetch_existing_keys(
+    def table_exists(self, table: str) -> bool:
+        """Return whether the given table exists in the database."""
+        table = self._validated_identifier(table)
+        result = self.conn.execute(
+            "SELECT COUNT(*) FROM information_schema.tables WHERE table_name = ?",
+            [table],
+        ).fetchone()
+        return bool(result and result[0])
+
+    def max_value(
         self,
         table: str,
-        keys: Sequence,
-        sort_key: str,
-    ) -> set:
-        if not keys:
-            return set()
-        placeholders = ",".join(["?"] * len(keys))
+        column: str,
+        *,
+        before: Any | None = None,
+    ) -> Any | None:
+        """Return MAX(column), optionally restricted to values below ``before``.
+
+        Returns ``None`` when the table is missing or no row qualifies.
+        """
+        if not self.table_exists(table):
+            return None
+        column = self._validated_identifier(column)
+        query = f"SELECT MAX({column}) FROM {table}"
+        params: list[Any] = []
+        if before is not None:
+            query += f" WHERE {column} < ?"
+            params.append(before)
+        result = self.conn.execute(query, params).fetchone()
+        return result[0] if result else None
+
+    def sequence_gaps(
+        self,
+        table: str,
+        column: str,
+        step_ms: int,
+        *,
+        start: Any | None = None,
+    ) -> list[tuple[Any, Any, int, int]]:
+        """Return ``(before, after, before_ms, after_ms)`` for each gap in ``column``.
+
+        A gap is any pair of consecutive values not exactly ``step_ms``
+        apart; the ``*_ms`` values are epoch milliseconds. When the row
+        count already matches the time span no window pass is needed.
+        """
+        table = self._validated_identifier(table)
+        column = self._validated_identifier(column)
+        if not self.table_exists(table):
+            return []
+        condition, params = (
+            (f"WHERE {column} >= ?", [start]) if start is not None else ("", [])
+        )
+        count, first_ms, last_ms = self.conn.execute(
+            f"""
+            SELECT
+                COUNT(*),
+                epoch_ms(MIN({column})::TIMESTAMPTZ),
+                epoch_ms(MAX({column})::TIMESTAMPTZ)
+            FROM {table} {condition}
+            """,
+            params,
+        ).fetchone()
+        if count < 2 or (last_ms - first_ms) == (count - 1) * step_ms:
+            return []
         rows = self.conn.execute(
-            f"SELECT {sort_key} FROM {table} WHERE {sort_key} IN ({placeholders})",
-            keys,
+            f"""
+            SELECT
+                {column},
+                next_value,
+                epoch_ms({column}::TIMESTAMPTZ),
+                epoch_ms(next_value::TIMESTAMPTZ)
+            FROM (
+                SELECT {column}, LEAD({column}) OVER (ORDER BY {column}) AS next_value
+                FROM {table} {condition}
+            ) AS pairs
+            WHERE next_value IS NOT NULL
+                AND NOT {adjacent_sql(column, "next_value", step_ms)}
+            ORDER BY {column}
+            """,
+            params,
         ).fetchall()
-        return {row[0] for row in rows}
+        return [
+            (before, after, int(before_ms), int(after_ms))
+            for before, after, before_ms, after_ms in rows
+        ]
+
+    def cluster(self, table: str, column: str) -> None:
+        """Rewrite ``table`` physically ordered by ``column``.
+
+        Batches are written in key order, but replaced rows are appended and
+        backfills or gap repairs write older ranges after newer ones, so
+        row-group min/max zonemaps drift apart. The table is recreated from
+        its own DDL (keeping its key) and refilled in order in one
+        transaction.
+        """
+        table = self._validated_identifier(table)
+        column = self._validated_identifier(column)
+        result = self.conn.execute(
+            "SELECT sql FROM duckdb_tables() WHERE table_name = ? AND NOT temporary",
+            [table],
+        ).fetchone()
+        if result is None:
+            return
+        unclustered = f"_unclustered_{table}"
+        self.conn.begin()
+        try:
+            self.conn.execute(f"ALTER TABLE {table} RENAME TO {unclustered}")
+            self.conn.execute(result[0])
+            self.conn.execute(
+                f"INSERT INTO {table} SELECT * FROM {unclustered} ORDER BY {column}"
+            )
+            self.conn.execute(f"DROP TABLE {unclustered}")
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        logger.info("Clustered %s by %s", table, column)
 
     def count_rows(self, table: str) -> int:
         """Return the number of rows stored in the given table."""
@@ -132,14 +582,24 @@ class DuckDBStorageManager:
         columns: Sequence[str],
         types: Sequence[str],
         table: str,
+        primary_key: Sequence[str] | None = None,
     ) -> str:
-        """Return CREATE TABLE statement using provided schema."""
+        """Return CREATE TABLE statement using provided schema.
+
+        The first column is the primary key unless ``primary_key`` lists the
+        columns of a composite key.
+        """
         column_defs = []
         for name, dtype in zip(columns, types, strict=True):
-            if name == columns[0]:
+            if primary_key is None and name == columns[0]:
                 column_defs.append(f"{name} {dtype} PRIMARY KEY")
             else:
                 column_defs.append(f"{name} {dtype}")
+        if primary_key is not None:
+            unknown = set(primary_key) - set(columns)
+            if unknown:
+                raise ValueError(f"Primary key columns not in schema: {unknown}")
+            column_defs.append(f"PRIMARY KEY ({', '.join(primary_key)})")
         joined_columns = ",\n                ".join(column_defs)
         return f"""
                 CREATE TABLE IF NOT EXISTS {table} (
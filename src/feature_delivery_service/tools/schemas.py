@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 from dataclasses import make_dataclass
-from typing import Sequence
+from typing import Any, Sequence
 from datetime import datetime
 from typing import Tuple
 
+import numpy as np
+import pandas as pd
+from dateutil import tz
+
 
 def build_dataclass(
     fields: Sequence[tuple[str, type]] = None,
@@ -53,6 +57,16 @@ BASE_FIELDS_TYPES: Tuple[str, ...] = (
 )
 
 
+# multi-stream candles are keyed by the market and interval they belong to
+STREAM_KEY_FIELDS = [
+    ("symbol", str),
+    ("kline_interval", str),
+]
+STREAM_COLUMN_NAMES = [name for name, _ in STREAM_KEY_FIELDS] + BASE_COLUMN_NAMES
+STREAM_FIELD_TYPES: Tuple[str, ...] = ("VARCHAR", "VARCHAR") + BASE_FIELDS_TYPES
+STREAM_PRIMARY_KEY: Tuple[str, ...] = ("symbol", "kline_interval", "open_time")
+
+
 def build_BitcoinCandle():
     BitcoinCandle = build_dataclass(fields=BASE_FIELDS)
 
@@ -90,6 +104,66 @@ def build_BitcoinCandle():
     return BitcoinCandle
 
 
+# position of each base column in a Binance kline payload entry
+BINANCE_KLINE_INDEX = {
+    "open_time": 0,
+    "open_price": 1,
+    "high_price": 2,
+    "low_price": 3,
+    "close_price": 4,
+    "volume_btc": 5,
+    "close_time": 6,
+    "volume_usd": 7,
+    "trade_count": 8,
+    "taker_buy_volume_btc": 9,
+    "taker_buy_volume_usd": 10,
+}
+
+_LOCAL_TIMEZONE = tz.gettz()
+
+
+def epoch_ms_to_local_datetime(epoch_ms: np.ndarray) -> np.ndarray:
+    """Convert epoch milliseconds to naive local ``datetime64[us]`` values.
+
+    Matches ``datetime.fromtimestamp(ms / 1000)``, which is how candle
+    timestamps have always been stored, without a Python call per value.
+    """
+    local = (
+        pd.to_datetime(np.asarray(epoch_ms, dtype=np.int64), unit="ms", utc=True)
+        .tz_convert(_LOCAL_TIMEZONE)
+        .tz_localize(None)
+    )
+    return local.to_numpy().astype("datetime64[us]")
+
+
+def decode_klines_columnar(
+    entries: Sequence[Sequence[Any]],
+    *,
+    epoch_ms: bool = False,
+) -> dict[str, np.ndarray]:
+    """Decode Binance kline entries straight into typed NumPy columns.
+
+    Prices and volumes become float64 and trade counts int64, with no
+    per-candle ``BitcoinCandle``. Timestamps are parsed as int64 epoch
+    milliseconds and returned as local ``datetime64[us]`` like
+    ``BitcoinCandle.from_binance``, or kept as epoch ms with ``epoch_ms=True``.
+    """
+    columns: dict[str, np.ndarray] = {}
+    for name, python_type in BASE_FIELDS:
+        index = BINANCE_KLINE_INDEX[name]
+        values = [entry[index] for entry in entries]
+        if python_type is float:
+            columns[name] = np.array(values, dtype=np.float64)
+        elif python_type is datetime:
+            timestamps = np.array(values, dtype=np.int64)
+            columns[name] = (
+                timestamps if epoch_ms else epoch_ms_to_local_datetime(timestamps)
+            )
+        else:
+            columns[name] = np.array(values, dtype=np.int64)
+    return columns
+
+
 LABELED_EXTRA_FIELDS = [
     ("close_price_gt_prev", int),
     ("next_close_price_gt_curr", int),
@@ -0,0 +1,268 @@
+"""Walk-forward cross-validation over time-ordered labeled candles."""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, Mapping, Optional, Sequence
+
+import numpy as np
+from numpy.typing import NDArray
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from .shared_arrays import attach_arrays, attached_array, shared_arrays
+from .training import evaluate_classifier, load_training_arrays
+from .tuning import build_estimator
+
+logger = logging.getLogger(__name__)
+
+# Rows summed at a time when accumulating scaler statistics.
+_MOMENT_CHUNK_ROWS = 1_000_000
+
+# Rows a label looks ahead: each candle is labeled with the next close.
+LABEL_HORIZON = 1
+
+
+@dataclass(frozen=True)
+class Fold:
+    """Half-open train and test row ranges of one walk-forward fold."""
+
+    number: int
+    train_start: int
+    train_end: int
+    test_start: int
+    test_end: int
+
+    @property
+    def train_rows(self) -> int:
+        return self.train_end - self.train_start
+
+    @property
+    def test_rows(self) -> int:
+        return self.test_end - self.test_start
+
+
+@dataclass
+class FoldResult:
+    """Held-out metrics for one fold."""
+
+    fold: Fold
+    metrics: Dict[str, float]
+    fit_seconds: float
+
+
+@dataclass
+class CrossValidationResult:
+    """Per-fold results in fold order plus their aggregate."""
+
+    folds: list[FoldResult] = field(default_factory=list)
+
+    def aggregate(self) -> Dict[str, float]:
+        """Mean and standard deviation of every metric reported by all folds."""
+        if not self.folds:
+            raise RuntimeError("No cross-validation folds completed")
+        names = set.intersection(*(set(result.metrics) for result in self.folds))
+        summary: Dict[str, float] = {}
+        for name in sorted(names):
+            values = np.array([result.metrics[name] for result in self.folds])
+            summary[f"cv_{name}_mean"] = float(values.mean())
+            summary[f"cv_{name}_std"] = float(values.std())
+        return summary
+
+
+def walk_forward_folds(
+    n_samples: int,
+    n_folds: int = 5,
+    *,
+    test_size: Optional[int] = None,
+    gap: int = LABEL_HORIZON,
+    max_train_size: Optional[int] = None,
+) -> list[Fold]:
+    """Split ``n_samples`` time-ordered rows into walk-forward folds.
+
+    Test windows are consecutive blocks at the end of the series. Each fold
+    trains on everything before its test window (an expanding window), or on
+    the last ``max_train_size`` rows of it (a sliding window). ``gap`` rows
+    are left out between train and test so labels that look ahead cannot
+    leak into the training set; it must cover at least ``LABEL_HORIZON``.
+    """
+    if n_folds < 1:
+        raise ValueError("n_folds must be at least 1")
+    if gap < LABEL_HORIZON:
+        raise ValueError(
+            f"gap must be at least {LABEL_HORIZON}: the last training label "
+            "would otherwise be computed from the first test candle"
+        )
+    test_size = test_size or n_samples // (n_folds + 1)
+    first_test = n_samples - n_folds * test_size
+    if test_size < 1 or first_test - gap < 1:
+        raise ValueError(
+            f"Not enough rows ({n_samples}) for {n_folds} folds with gap {gap}"
+        )
+    folds = []
+    for number in range(n_folds):
+        test_start = first_test + number * test_size
+        train_end = test_start - gap
+        train_start = max(0, train_end - max_train_size) if max_train_size else 0
+        folds.append(
+            Fold(number, train_start, train_end, test_start, test_start + test_size)
+        )
+    return folds
+
+
+def fold_scalers(
+    features: NDArray[np.float64], folds: Sequence[Fold]
+) -> dict[int, StandardScaler]:
+    """Return a fitted ``StandardScaler`` for each fold's training window.
+
+    Column sums are accumulated once between consecutive fold boundaries and
+    combined into each window's mean and variance, so every row is read once
+    in total instead of once per fold that trains on it.
+    """
+    boundaries = sorted(
+        {0} | {fold.train_start for fold in folds} | {fold.train_end for fold in folds}
+    )
+    # Summing values relative to the leading rows' mean keeps the
+    # E[x^2] - E[x]^2 variance numerically stable for large price levels.
+    shift = np.asarray(features[: min(len(features), 1024)], dtype=np.float64).mean(
+        axis=0
+    )
+    width = features.shape[1]
+    prefix = {0: (np.zeros(width), np.zeros(width))}
+    sums, squares = np.zeros(width), np.zeros(width)
+    for start, end in itertools.pairwise(boundaries):
+        for chunk_start in range(start, end, _MOMENT_CHUNK_ROWS):
+            chunk = features[chunk_start : min(end, chunk_start + _MOMENT_CHUNK_ROWS)]
+            centered = np.asarray(chunk, dtype=np.float64) - shift
+            sums = sums + centered.sum(axis=0)
+            squares = squares + np.square(centered).sum(axis=0)
+        prefix[end] = (sums, squares)
+
+    scalers = {}
+    for fold in folds:
+        count = fold.train_rows
+        window_sums = prefix[fold.train_end][0] - prefix[fold.train_start][0]
+        window_squares = prefix[fold.train_end][1] - prefix[fold.train_start][1]
+        centered_mean = window_sums / count
+        variance = np.maximum(window_squares / count - centered_mean**2, 0.0)
+        scaler = StandardScaler()
+        scaler.mean_ = shift + centered_mean
+        scaler.var_ = variance
+        scale = np.sqrt(variance)
+        scaler.scale_ = np.where(scale < 10 * np.finfo(np.float64).eps, 1.0, scale)
+        scaler.n_samples_seen_ = count
+        scaler.n_features_in_ = width
+        scalers[fold.number] = scaler
+    return scalers
+
+
+def _evaluate_fold(
+    fold: Fold,
+    family: str,
+    params: Mapping[str, Any],
+    scaler: Optional[StandardScaler],
+    random_state: int,
+) -> FoldResult:
+    features, labels = attached_array("features"), attached_array("labels")
+    X_train = features[fold.train_start : fold.train_end]
+    y_train = labels[fold.train_start : fold.train_end]
+    model = build_estimator(family, params, random_state)
+
+    started = time.perf_counter()
+    if scaler is not None and model.steps[0][0] == "scaler":
+        # Reuse the precomputed statistics and only fit the remaining steps.
+        model.steps[0] = ("scaler", scaler)
+        Pipeline(model.steps[1:]).fit(scaler.transform(X_train), y_train)
+    else:
+        model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - started
+
+    metrics = evaluate_classifier(
+        model,
+        features[fold.test_start : fold.test_end],
+        labels[fold.test_start : fold.test_end],
+    )
+    return FoldResult(fold=fold, metrics=metrics, fit_seconds=fit_seconds)
+
+
+def iter_fold_results(
+    features: NDArray[np.float64],
+    labels: NDArray[np.int8],
+    folds: Sequence[Fold],
+    *,
+    family: str = "logistic_regression",
+    params: Optional[Mapping[str, Any]] = None,
+    max_workers: Optional[int] = None,
+    random_state: int = 137,
+) -> Iterator[FoldResult]:
+    """Fit and score ``folds`` across a process pool, yielding as they finish.
+
+    Feature arrays are memory-mapped by every worker rather than pickled per
+    fold; folds only carry their row bounds and scaler statistics.
+    """
+    scalers = fold_scalers(features, folds)
+    max_workers = max_workers or os.cpu_count() or 1
+    with (
+        shared_arrays({"features": features, "labels": labels}) as directory,
+        ProcessPoolExecutor(
+            max_workers=min(max_workers, len(folds)) or 1,
+            initializer=attach_arrays,
+            initargs=(directory,),
+        ) as pool,
+    ):
+        futures = {
+            pool.submit(
+                _evaluate_fold,
+                fold,
+                family,
+                dict(params or {}),
+                scalers[fold.number],
+                random_state,
+            ): fold
+            for fold in folds
+        }
+        for future in as_completed(futures):
+            fold = futures[future]
+            try:
+                yield future.result()
+            except Exception:
+                logger.exception("Cross-validation fold %s failed", fold.number)
+
+
+def cross_validate_next_move_classifier(
+    *,
+    n_folds: int = 5,
+    limit: Optional[int] = None,
+    family: str = "logistic_regression",
+    params: Optional[Mapping[str, Any]] = None,
+    test_size: Optional[int] = None,
+    gap: int = LABEL_HORIZON,
+    max_train_size: Optional[int] = None,
+    max_workers: Optional[int] = None,
+) -> CrossValidationResult:
+    """Run walk-forward cross-validation on the labeled candle table."""
+    features, labels = load_training_arrays(limit)
+    folds = walk_forward_folds(
+        len(labels),
+        n_folds,
+        test_size=test_size,
+        gap=gap,
+        max_train_size=max_train_size,
+    )
+    result = CrossValidationResult()
+    for fold_result in iter_fold_results(
+        features,
+        labels,
+        folds,
+        family=family,
+        params=params,
+        max_workers=max_workers,
+    ):
+        result.folds.append(fold_result)
+    result.folds.sort(key=lambda fold_result: fold_result.fold.number)
+    return result
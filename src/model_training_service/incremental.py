@@ -0,0 +1,135 @@
+"""Out-of-core training with ``partial_fit`` on streamed labeled feature rows."""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterator, Optional
+
+import numpy as np
+from numpy.typing import NDArray
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import log_loss
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from feature_delivery_service import iter_feature_arrays
+from feature_delivery_service.tools.duckdb_storage_manager import DEFAULT_BATCH_SIZE
+
+from .training import FEATURE_COLUMNS, TARGET_COLUMN, _columns_to_arrays
+
+logger = logging.getLogger(__name__)
+
+_CLASSES = np.array([0, 1], dtype=np.int8)
+
+
+@dataclass
+class IncrementalTrainingResult:
+    """A ``partial_fit``-trained pipeline and its prequential metrics."""
+
+    model: Pipeline
+    metrics: Dict[str, float]
+    rows_trained: int
+    trained_until: Optional[datetime]
+    input_example: Optional[NDArray[np.float64]]
+
+
+def _iter_batches(
+    batch_size: int,
+    after: Optional[datetime],
+) -> Iterator[tuple[NDArray[np.float64], NDArray[np.int8], NDArray]]:
+    where = [("open_time", ">", after)] if after is not None else []
+    for columns in iter_feature_arrays(
+        columns=["open_time", *FEATURE_COLUMNS, TARGET_COLUMN],
+        batch_size=batch_size,
+        where=where,
+        labeled_only=True,
+    ):
+        features, labels = _columns_to_arrays(columns)
+        yield features, labels, columns["open_time"]
+
+
+def train_incremental_sgd_classifier(
+    *,
+    base_model: Optional[Pipeline] = None,
+    trained_until: Optional[datetime] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    epochs: int = 1,
+    alpha: float = 1e-4,
+    random_state: int = 137,
+) -> IncrementalTrainingResult:
+    """Train a scaler + ``SGDClassifier`` pipeline in bounded memory.
+
+    Labeled feature rows are streamed from DuckDB ``batch_size`` rows at a time.
+    A fresh model takes one pass to fit the ``StandardScaler`` statistics and
+    ``epochs`` passes of ``SGDClassifier.partial_fit``. When ``base_model``
+    is given, only candles after ``trained_until`` are read and its scaler
+    is kept as-is, since re-scaling would invalidate the learned weights.
+    A ``base_model`` fitted on a different number of features is rejected.
+
+    Metrics are prequential: every batch is scored before the model learns
+    from it, which gives an out-of-sample estimate without a held-out copy.
+    """
+    if epochs < 1:
+        raise ValueError("epochs must be at least 1")
+    if base_model is None:
+        scaler = StandardScaler()
+        classifier = SGDClassifier(
+            loss="log_loss", alpha=alpha, random_state=random_state
+        )
+        for features, _, _ in _iter_batches(batch_size, trained_until):
+            scaler.partial_fit(features)
+        model = Pipeline(steps=[("scaler", scaler), ("clf", classifier)])
+    else:
+        model = base_model
+        scaler, classifier = model.named_steps["scaler"], model.named_steps["clf"]
+        trained_width = getattr(scaler, "n_features_in_", None)
+        if trained_width != len(FEATURE_COLUMNS):
+            raise ValueError(
+                f"The base model was trained on {trained_width} features but "
+                f"the feature set now has {len(FEATURE_COLUMNS)}; train a new "
+                "model instead of resuming"
+            )
+
+    rows = 0
+    scored = correct = 0
+    loss_sum = 0.0
+    last_open_time = None
+    example = None
+    for epoch in range(epochs):
+        for features, labels, open_times in _iter_batches(batch_size, trained_until):
+            scaled = scaler.transform(features)
+            if epoch == 0 and hasattr(classifier, "coef_"):
+                probabilities = classifier.predict_proba(scaled)[:, 1]
+                correct += int(((probabilities > 0.5) == labels).sum())
+                loss_sum += log_loss(labels, probabilities, labels=_CLASSES) * len(
+                    labels
+                )
+                scored += len(labels)
+            classifier.partial_fit(scaled, labels, classes=_CLASSES)
+            if epoch == 0:
+                rows += len(labels)
+                last_open_time = open_times[-1]
+                example = features[:5]
+        if rows == 0:
+            break
+        logger.info("Finished partial_fit epoch %s over %s rows", epoch + 1, rows)
+
+    metrics: Dict[str, float] = {}
+    if scored:
+        metrics = {
+            "prequential_accuracy": correct / scored,
+            "prequential_log_loss": loss_sum / scored,
+        }
+    return IncrementalTrainingResult(
+        model=model,
+        metrics=metrics,
+        rows_trained=rows,
+        trained_until=(
+            last_open_time.astype("datetime64[us]").item()
+            if last_open_time is not None
+            else trained_until
+        ),
+        input_example=example,
+    )
@@ -0,0 +1,43 @@
+"""Share read-only NumPy arrays with worker processes via memory maps."""
+
+from __future__ import annotations
+
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Iterator, Mapping
+
+import numpy as np
+
+# Arrays attached by the pool initializer of the current worker process.
+_attached: dict[str, np.ndarray] = {}
+
+
+@contextmanager
+def shared_arrays(arrays: Mapping[str, np.ndarray]) -> Iterator[str]:
+    """Write ``arrays`` to ``.npy`` files once and yield their directory.
+
+    Pass the directory to :func:`attach_arrays` as a pool initializer so
+    each worker memory-maps the files instead of receiving pickled copies.
+    """
+    with tempfile.TemporaryDirectory(prefix="shared-arrays-") as directory:
+        for name, array in arrays.items():
+            np.save(os.path.join(directory, f"{name}.npy"), np.ascontiguousarray(array))
+        yield directory
+
+
+def attach_arrays(directory: str) -> None:
+    """Pool initializer: memory-map every array in ``directory`` read-only."""
+    _attached.clear()
+    for filename in os.listdir(directory):
+        name, extension = os.path.splitext(filename)
+        if extension == ".npy":
+            _attached[name] = np.load(os.path.join(directory, filename), mmap_mode="r")
+
+
+def attached_array(name: str) -> np.ndarray:
+    """Return an array attached to this worker by :func:`attach_arrays`."""
+    try:
+        return _attached[name]
+    except KeyError:
+        raise RuntimeError(f"Array {name!r} was not attached to this worker") from None
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import logging
 from dataclasses import dataclass
-from typing import Dict, Sequence
+from typing import Any, Dict, Mapping, Sequence
 
 import numpy as np
 from numpy.typing import NDArray
@@ -14,23 +14,19 @@ from sklearn.model_selection import train_test_split
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import StandardScaler
 
-from feature_delivery_service import load_labeled_candles_from_duckdb
+from feature_delivery_service import DEFAULT_FEATURE_SET, load_feature_arrays
+from feature_delivery_service.features import LABEL_COLUMN
 
 logger = logging.getLogger(__name__)
 
-FEATURE_COLUMNS: Sequence[str] = (
-    "open_price",
-    "high_price",
-    "low_price",
-    "close_price",
-    "volume_btc",
-    "volume_usd",
-    "trade_count",
-    "taker_buy_volume_btc",
-    "taker_buy_volume_usd",
-    "close_price_gt_prev",
-)
-TARGET_COLUMN = "next_close_price_gt_curr"
+# Model inputs come from the feature registry, in registry order.
+FEATURE_COLUMNS: Sequence[str] = DEFAULT_FEATURE_SET.feature_names
+TARGET_COLUMN = LABEL_COLUMN
+
+# (X_train, X_test, y_train, y_test)
+TrainTestSplit = tuple[
+    NDArray[np.float64], NDArray[np.float64], NDArray[np.int8], NDArray[np.int8]
+]
 
 
 @dataclass
@@ -43,54 +39,74 @@ class TrainingResult:
     input_example: NDArray[np.float64]
 
 
-def _candles_to_arrays(
-    candles,
+def _columns_to_arrays(
+    columns: Mapping[str, NDArray],
 ) -> tuple[NDArray[np.float64], NDArray[np.int8]]:
-    features = np.array(
-        [
-            [
-                candle.open_price,
-                candle.high_price,
-                candle.low_price,
-                candle.close_price,
-                candle.volume_btc,
-                candle.volume_usd,
-                candle.trade_count,
-                candle.taker_buy_volume_btc,
-                candle.taker_buy_volume_usd,
-                candle.close_price_gt_prev,
-            ]
-            for candle in candles
-        ],
-        dtype=np.float64,
-    )
-    labels = np.array(
-        [candle.next_close_price_gt_curr for candle in candles],
-        dtype=np.int8,
+    features = np.column_stack(
+        [np.asarray(columns[name], dtype=np.float64) for name in FEATURE_COLUMNS]
     )
+    labels = np.asarray(columns[TARGET_COLUMN], dtype=np.int8)
     return features, labels
 
 
-def train_next_move_logistic_classifier(
+def load_training_arrays(
+    limit: int | None = None,
+) -> tuple[NDArray[np.float64], NDArray[np.int8]]:
+    """Load labeled feature rows in ``open_time`` order as feature/label arrays."""
+    columns = load_feature_arrays(
+        columns=[*FEATURE_COLUMNS, TARGET_COLUMN],
+        limit=limit,
+        labeled_only=True,
+        order_desc=False,
+    )
+    return _columns_to_arrays(columns)
+
+
+def load_training_split(
     *,
     limit: int | None = 5000,
     test_size: float = 0.2,
-    random_state: int = 137,
-) -> TrainingResult:
-    """Fit a basic classifier to predict if the next close price increases."""
-    candles = load_labeled_candles_from_duckdb(limit=limit, order_desc=False)
-    if len(candles) < 100:
+) -> TrainTestSplit:
+    """Load labeled candles and return ``(X_train, X_test, y_train, y_test)``.
+
+    The split is chronological: the most recent ``test_size`` fraction is
+    held out, so no future candle is used to train the model it evaluates.
+    """
+    features, labels = load_training_arrays(limit)
+    if len(labels) < 100:
         raise RuntimeError(
             "Not enough labeled candles to train a classifier (need >= 100 rows)"
         )
 
-    features, labels = _candles_to_arrays(candles)
-    X_train, X_test, y_train, y_test = train_test_split(
-        features,
-        labels,
-        test_size=test_size,
-        random_state=random_state,
-        stratify=labels if len(np.unique(labels)) > 1 else None,
+    return train_test_split(features, labels, test_size=test_size, shuffle=False)
+
+
+def evaluate_classifier(
+    model: Any,
+    X_test: NDArray[np.float64],
+    y_test: NDArray[np.int8],
+) -> Dict[str, float]:
+    """Return accuracy, F1 and (when both classes are present) ROC AUC."""
+    y_pred = model.predict(X_test)
+    metrics: Dict[str, float] = {
+        "accuracy": float(accuracy_score(y_test, y_pred)),
+        "f1": float(f1_score(y_test, y_pred, zero_division=0)),
+    }
+    if len(np.unique(y_test)) > 1:
+        y_proba = model.predict_proba(X_test)[:, 1]
+        metrics["roc_auc"] = float(roc_auc_score(y_test, y_proba))
+    return metrics
+
+
+def train_next_move_logistic_classifier(
+    *,
+    limit: int | None = 5000,
+    test_size: float = 0.2,
+    random_state: int = 137,
+) -> TrainingResult:
+    """Fit a basic classifier to predict if the next close price increases."""
+    X_train, X_test, y_train, y_test = load_training_split(
+        limit=limit, test_size=test_size
     )
 
     model = Pipeline(
@@ -110,18 +126,9 @@ def train_next_move_logistic_classifier(
     )
     model.fit(X_train, y_train)
 
-    y_pred = model.predict(X_test)
-    metrics: Dict[str, float] = {
-        "accuracy": float(accuracy_score(y_test, y_pred)),
-        "f1": float(f1_score(y_test, y_pred, zero_division=0)),
-    }
-    if len(np.unique(y_test)) > 1:
-        y_proba = model.predict_proba(X_test)[:, 1]
-        metrics["roc_auc"] = float(roc_auc_score(y_test, y_proba))
-
     return TrainingResult(
         model=model,
-        metrics=metrics,
+        metrics=evaluate_classifier(model, X_test, y_test),
         feature_names=FEATURE_COLUMNS,
         input_example=X_test[:5],
     )
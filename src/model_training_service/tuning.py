@@ -0,0 +1,203 @@
+"""Parallel hyperparameter search for the next-move classifier."""
+
+from __future__ import annotations
+
+import itertools
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, Mapping, Sequence
+
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from .shared_arrays import attach_arrays, attached_array, shared_arrays
+from .training import TrainTestSplit, evaluate_classifier
+
+logger = logging.getLogger(__name__)
+
+SearchSpace = Mapping[str, Mapping[str, Sequence[Any]]]
+
+DEFAULT_SEARCH_SPACE: SearchSpace = {
+    "logistic_regression": {
+        "C": [0.01, 0.1, 1.0, 10.0],
+        "penalty": ["l1", "l2"],
+        "solver": ["liblinear", "saga", "lbfgs"],
+    },
+    "xgboost": {
+        "n_estimators": [100, 300],
+        "max_depth": [3, 6],
+        "learning_rate": [0.05, 0.1],
+    },
+}
+
+# LogisticRegression solvers that support each penalty.
+_PENALTY_SOLVERS = {
+    "l1": {"liblinear", "saga"},
+    "l2": {"lbfgs", "liblinear", "newton-cg", "newton-cholesky", "sag", "saga"},
+    "elasticnet": {"saga"},
+    None: {"lbfgs", "newton-cg", "newton-cholesky", "sag", "saga"},
+}
+
+# scikit-learn >= 1.8 deprecates ``penalty`` in favour of ``l1_ratio``.
+_PENALTY_AS_L1_RATIO = LogisticRegression().l1_ratio is not None
+_PENALTY_L1_RATIO = {"l1": 1.0, "l2": 0.0}
+
+_SPLIT_NAMES = ("X_train", "X_test", "y_train", "y_test")
+
+
+@dataclass(frozen=True)
+class Trial:
+    """One point of the search space."""
+
+    number: int
+    family: str
+    params: Dict[str, Any]
+
+
+@dataclass
+class TrialResult:
+    """A fitted trial with its held-out metrics."""
+
+    trial: Trial
+    model: Pipeline
+    metrics: Dict[str, float]
+    fit_seconds: float
+
+
+@dataclass
+class TuningResult:
+    """All completed trials plus the best one according to ``metric``."""
+
+    metric: str
+    trials: list[TrialResult] = field(default_factory=list)
+    failed: list[Trial] = field(default_factory=list)
+
+    @property
+    def best(self) -> TrialResult:
+        if not self.trials:
+            raise RuntimeError("No tuning trials completed")
+        return max(self.trials, key=lambda result: trial_score(result, self.metric))
+
+    @property
+    def failed_families(self) -> list[str]:
+        """Families none of whose trials completed."""
+        completed = {result.trial.family for result in self.trials}
+        return sorted({trial.family for trial in self.failed} - completed)
+
+
+def trial_score(result: TrialResult, metric: str) -> float:
+    """Score used to rank trials; ``roc_auc`` falls back to accuracy."""
+    value = result.metrics.get(metric)
+    if value is None:
+        value = result.metrics["accuracy"]
+    return value
+
+
+def load_search_space(path: str | Path) -> SearchSpace:
+    """Load a ``{family: {param: [values, ...]}}`` search space from JSON."""
+    with open(path, encoding="utf-8") as handle:
+        space = json.load(handle)
+    unknown = set(space) - set(DEFAULT_SEARCH_SPACE)
+    if unknown:
+        raise ValueError(f"Unknown model families in search space: {sorted(unknown)}")
+    return space
+
+
+def expand_search_space(space: SearchSpace) -> list[Trial]:
+    """Expand every family's grid, skipping invalid penalty/solver pairs."""
+    trials: list[Trial] = []
+    for family, grid in space.items():
+        names = list(grid)
+        for values in itertools.product(*(grid[name] for name in names)):
+            params = dict(zip(names, values))
+            if family == "logistic_regression" and params.get(
+                "solver", "lbfgs"
+            ) not in _PENALTY_SOLVERS.get(params.get("penalty", "l2"), ()):
+                continue
+            trials.append(Trial(len(trials), family, params))
+    return trials
+
+
+def build_estimator(
+    family: str, params: Mapping[str, Any], random_state: int = 137
+) -> Pipeline:
+    """Return an unfitted pipeline for ``family`` with ``params`` applied."""
+    if family == "logistic_regression":
+        options = {"max_iter": 500, "random_state": random_state, **params}
+        if _PENALTY_AS_L1_RATIO and options.get("penalty") in _PENALTY_L1_RATIO:
+            options["l1_ratio"] = _PENALTY_L1_RATIO[options.pop("penalty")]
+        return Pipeline(
+            steps=[
+                ("scaler", StandardScaler()),
+                ("clf", LogisticRegression(**options)),
+            ]
+        )
+    if family == "xgboost":
+        from xgboost import XGBClassifier
+
+        # One thread per trial: parallelism comes from running trials at once.
+        options = {"n_jobs": 1, "random_state": random_state, **params}
+        return Pipeline(steps=[("clf", XGBClassifier(**options))])
+    raise ValueError(f"Unknown model family: {family}")
+
+
+def _run_trial(trial: Trial, random_state: int) -> TrialResult:
+    X_train, X_test, y_train, y_test = (attached_array(name) for name in _SPLIT_NAMES)
+    model = build_estimator(trial.family, trial.params, random_state)
+    started = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - started
+    return TrialResult(
+        trial=trial,
+        model=model,
+        metrics=evaluate_classifier(model, X_test, y_test),
+        fit_seconds=fit_seconds,
+    )
+
+
+def iter_trial_results(
+    split: TrainTestSplit,
+    trials: Sequence[Trial],
+    *,
+    max_workers: int | None = None,
+    random_state: int = 137,
+    failed: list[Trial] | None = None,
+) -> Iterator[TrialResult]:
+    """Fit ``trials`` across a process pool and yield results as they finish.
+
+    The split is written to ``.npy`` files once and memory-mapped by each
+    worker, so trials only carry their hyperparameters; the arrays are
+    neither pickled per trial nor copied per process. Trials that raise are
+    logged and appended to ``failed`` when it is given.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    with (
+        shared_arrays(dict(zip(_SPLIT_NAMES, split))) as directory,
+        ProcessPoolExecutor(
+            max_workers=min(max_workers, len(trials)) or 1,
+            initializer=attach_arrays,
+            initargs=(directory,),
+        ) as pool,
+    ):
+        futures = {
+            pool.submit(_run_trial, trial, random_state): trial for trial in trials
+        }
+        for future in as_completed(futures):
+            trial = futures[future]
+            try:
+                yield future.result()
+            except Exception:
+                logger.exception(
+                    "Trial %s (%s %s) failed",
+                    trial.number,
+                    trial.family,
+                    trial.params,
+                )
+                if failed is not None:
+                    failed.append(trial)
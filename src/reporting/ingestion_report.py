@@ -9,7 +9,7 @@ import matplotlib.pyplot as plt
 import pandas as pd
 from reportlab.lib.units import inch
 
-from feature_delivery_service import load_candles_from_duckdb
+from feature_delivery_service import load_candle_arrays
 from feature_delivery_service.tools.config import load_ingestion_config
 from feature_delivery_service.tools.schemas import BASE_COLUMN_NAMES
 from .report_maker import ReportMaker
@@ -34,12 +34,8 @@ def _report_base_dir() -> Path:
     return Path("reports/ingestion")
 
 
-def _build_dataframe(candles) -> pd.DataFrame:
-    rows = [
-        {column: getattr(candle, column, None) for column in BASE_COLUMN_NAMES}
-        for candle in candles
-    ]
-    return pd.DataFrame(rows)
+def _build_dataframe(columns) -> pd.DataFrame:
+    return pd.DataFrame({column: columns[column] for column in BASE_COLUMN_NAMES})
 
 
 def _summary_table(df: pd.DataFrame) -> pd.DataFrame:
@@ -74,11 +70,11 @@ def generate_ingestion_report(limit: int | None = None) -> Path:
         config = load_ingestion_config()
     limit = limit or config.limit
 
-    candles = load_candles_from_duckdb(limit=limit, order_desc=True)
-    if not candles:
+    columns = load_candle_arrays(limit=limit, order_desc=True)
+    df = _build_dataframe(columns)
+    if df.empty:
         raise RuntimeError("No candles available; run ingestion before reporting")
 
-    df = _build_dataframe(candles)
     summary = _summary_table(df)
 
     timestamp = pd.Timestamp.utcnow()
@@ -0,0 +1,132 @@
+"""Load test of JSON vs ``.npy`` batch prediction over HTTP (user-009).
+
+Serves the API with uvicorn on a local port, with a compiled linear scorer
+standing in for the registry model, and posts ``--requests`` batches from
+``--concurrency`` threads to ``/predict/batch`` and ``/predict/batch/npy``.
+Malformed ``.npy`` bodies are part of the mix and must all come back 422.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import io
+import json
+import logging
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import numpy as np
+import uvicorn
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+from timing import best_of, report
+
+from api.scorers import CompiledLinearScorer
+
+N_FEATURES = 12
+
+
+def _npy(array: np.ndarray) -> bytes:
+    buffer = io.BytesIO()
+    np.save(buffer, array)
+    return buffer.getvalue()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[64, 1024])
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    rng = np.random.default_rng(0)
+    features = rng.normal(size=(max(args.batch_sizes), N_FEATURES))
+    pipeline = Pipeline(
+        [("scaler", StandardScaler()), ("classifier", LogisticRegression())]
+    ).fit(features, features[:, 0] > 0)
+    scorer = CompiledLinearScorer(pipeline)
+    app_module = importlib.import_module("api.app")
+    app_module.load_model = lambda: scorer
+
+    server = uvicorn.Server(
+        uvicorn.Config(
+            app_module.create_app(), port=0, log_level="error", lifespan="off"
+        )
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    base_url = f"http://127.0.0.1:{port}"
+
+    malformed = [
+        b"",
+        _npy(np.zeros(4, dtype=[("a", "f8"), ("b", "f8")])),
+        _npy(np.ones((4, N_FEATURES + 1))),
+    ]
+    try:
+        with httpx.Client(
+            base_url=base_url,
+            limits=httpx.Limits(max_connections=args.concurrency),
+        ) as client:
+
+            def _load(path: str, bodies: list[bytes], content_type: str) -> Counter:
+                def _post(index: int) -> int:
+                    return client.post(
+                        path,
+                        content=bodies[index % len(bodies)],
+                        headers={"Content-Type": content_type},
+                    ).status_code
+
+                with ThreadPoolExecutor(args.concurrency) as executor:
+                    return Counter(executor.map(_post, range(args.requests)))
+
+            for batch_size in args.batch_sizes:
+                batch = features[:batch_size]
+                json_body = json.dumps({"features": batch.tolist()}).encode()
+                cases = {
+                    "json": ("/predict/batch", [json_body], "application/json"),
+                    "npy": (
+                        "/predict/batch/npy",
+                        [_npy(batch)],
+                        "application/octet-stream",
+                    ),
+                    "npy, 3/4 malformed": (
+                        "/predict/batch/npy",
+                        [_npy(batch), *malformed],
+                        "application/octet-stream",
+                    ),
+                }
+                rows = []
+                for label, case in cases.items():
+                    seconds, statuses = best_of(lambda case=case: _load(*case))
+                    assert set(statuses) <= {200, 422}, statuses
+                    rows.append(
+                        (
+                            label,
+                            seconds,
+                            (
+                                f"{args.requests / seconds:7.0f} req/s  "
+                                f"{dict(sorted(statuses.items()))}"
+                            ),
+                        )
+                    )
+                report(
+                    f"{args.requests} requests of {batch_size} rows, "
+                    f"{args.concurrency} clients",
+                    rows,
+                )
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Row-wise vs columnar decoding of Binance kline payloads (user-023).
+
+Decodes ``--rows`` klines, in pages of 1000 like the API returns them,
+through ``BitcoinCandle.from_binance`` and through
+``decode_klines_columnar``, checking both give the same values.
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from stand_in import make_klines
+from timing import best_of, report
+
+from feature_delivery_service.tools.binance_client import BitcoinCandle
+from feature_delivery_service.tools.schemas import (
+    BASE_COLUMN_NAMES,
+    decode_klines_columnar,
+)
+
+PAGE = 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    entries = make_klines(args.rows)
+    pages = [entries[i : i + PAGE] for i in range(0, len(entries), PAGE)]
+
+    def _rows() -> list:
+        return [BitcoinCandle.from_binance(e) for page in pages for e in page]
+
+    def _columnar() -> list[dict]:
+        return [decode_klines_columnar(page) for page in pages]
+
+    row_seconds, candles = best_of(_rows)
+    columnar_seconds, columns = best_of(_columnar)
+    for name in BASE_COLUMN_NAMES:
+        decoded = [value for page in columns for value in page[name].tolist()]
+        assert decoded == [getattr(candle, name) for candle in candles], name
+
+    report(
+        f"Decode {args.rows} klines in pages of {PAGE}",
+        [
+            ("from_binance rows", row_seconds, ""),
+            (
+                "decode_klines_columnar",
+                columnar_seconds,
+                f"{row_seconds / columnar_seconds:.1f}x faster",
+            ),
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
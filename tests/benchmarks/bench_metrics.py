@@ -0,0 +1,132 @@
+"""Per-request overhead of the metrics middleware and stage timers (user-015).
+
+Drives the ASGI app in-process, without a network hop, so the difference
+between the instrumented app and the same app with ``MetricsMiddleware``
+removed is the instrumentation cost. A stub scorer stands in for the
+registry model. Also times rendering ``/metrics`` after the load.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib
+import json
+import logging
+
+import numpy as np
+from timing import best_of, report
+
+from api.metrics import APIMetrics, MetricsMiddleware, stage
+
+
+class _SumScorer:
+    backend = "stub"
+    n_features = 4
+
+    def predict(self, features):
+        return (np.asarray(features).sum(axis=1) > 0).astype(int)
+
+
+async def _noop_app(scope: dict, receive, send) -> None:
+    """A handler doing nothing but the stages the inference routes time."""
+    for name in ("lookup", "predict"):
+        with stage(name):
+            pass
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+def _app(instrumented: bool):
+    app = importlib.import_module("api.app").create_app()
+    if not instrumented:
+        app.user_middleware = [
+            middleware
+            for middleware in app.user_middleware
+            if middleware.cls is not MetricsMiddleware
+        ]
+    return app
+
+
+async def _load(app, requests: int, method: str, path: str, body: bytes) -> int:
+    """Call the ASGI app directly ``requests`` times; return the 200 count."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"content-type", b"application/json")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("api", 80),
+    }
+    ok = 0
+
+    async def _receive() -> dict:
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def _send(message: dict) -> None:
+        nonlocal ok
+        if message["type"] == "http.response.start":
+            ok += message["status"] == 200
+
+    for _ in range(requests):
+        await app(dict(scope), _receive, _send)
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=1_000)
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+    importlib.import_module("api.app").load_model = _SumScorer
+
+    predict_body = json.dumps({"features": [[1, 2, 3, 4]] * 8}).encode()
+    full = {"uninstrumented": _app(False), "instrumented": _app(True)}
+    # The full app's thread-pool hops add jitter of the order of the
+    # overhead itself; the no-op app isolates the instrumentation cost.
+    noop = {
+        "no-op app": _noop_app,
+        "no-op app + metrics": MetricsMiddleware(_noop_app, APIMetrics()),
+    }
+    suites = [
+        ("GET / on a no-op ASGI app", ("GET", "/", b""), noop),
+        ("GET /health", ("GET", "/health", b""), full),
+        ("POST /predict/batch", ("POST", "/predict/batch", predict_body), full),
+    ]
+    for title, case, apps in suites:
+        # Alternate the apps round by round so drift hits both alike.
+        best = dict.fromkeys(apps, float("inf"))
+        for _ in range(args.rounds):
+            for label, app in apps.items():
+                seconds, ok = best_of(
+                    lambda app=app, case=case: asyncio.run(
+                        _load(app, args.requests, *case)
+                    ),
+                    1,
+                )
+                assert ok == args.requests, (label, ok)
+                best[label] = min(best[label], seconds)
+        rows = [
+            (label, seconds, f"{seconds / args.requests * 1e6:6.1f} us/request")
+            for label, seconds in best.items()
+        ]
+        overhead = (rows[1][1] - rows[0][1]) / args.requests * 1e6
+        rows.append(
+            ("overhead", rows[1][1] - rows[0][1], f"{overhead:6.1f} us/request")
+        )
+        report(f"{args.requests} x {title}, in-process", rows)
+
+    app = full["instrumented"]
+    seconds, ok = best_of(lambda: asyncio.run(_load(app, 100, "GET", "/metrics", b"")))
+    report("100 x GET /metrics", [("render", seconds, f"{seconds * 10:.2f} ms/scrape")])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""End-to-end multi-stream ingestion throughput (user-021).
+
+Runs ``run_multi_stream_ingestion`` against the stand-in klines server
+with injected latency, for a growing number of (symbol, interval) streams
+and for one vs ``--workers`` fetch threads, into a fresh DuckDB file each
+time. Reports candles stored per second.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import tempfile
+from pathlib import Path
+
+from stand_in import StandInBinance
+from timing import best_of, report
+
+from feature_delivery_service.ingestion import run_multi_stream_ingestion
+from feature_delivery_service.tools.binance_client import BinanceClient
+from feature_delivery_service.tools.config import (
+    CandleStream,
+    MultiStreamIngestionConfig,
+)
+from feature_delivery_service.tools.duckdb_storage_manager import (
+    DuckDBStorageManager,
+)
+
+INTERVALS = ("1m", "5m", "1h")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--streams", type=int, nargs="+", default=[1, 10, 50, 150])
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--limit", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    with StandInBinance(latency=args.latency) as server:
+        for count in args.streams:
+            streams = tuple(
+                CandleStream(
+                    f"SYM{i // len(INTERVALS)}USDT", INTERVALS[i % len(INTERVALS)]
+                )
+                for i in range(count)
+            )
+            rows = []
+            for workers in sorted({1, args.workers}):
+                config = MultiStreamIngestionConfig(
+                    streams=streams, limit=args.limit, max_workers=workers
+                )
+
+                def _ingest(config=config) -> int:
+                    with tempfile.TemporaryDirectory() as directory:
+                        storage = DuckDBStorageManager(
+                            Path(directory) / "streams.duckdb"
+                        )
+                        try:
+                            # A fresh client per run, so the rate limiter's
+                            # per-minute budget starts empty each time.
+                            client = BinanceClient(base_url=server.url)
+                            return run_multi_stream_ingestion(
+                                config, client=client, storage=storage
+                            )[0]
+                        finally:
+                            storage.close()
+
+                seconds, stored = best_of(_ingest)
+                assert stored == count * args.limit, stored
+                rows.append(
+                    (
+                        f"workers={workers}",
+                        seconds,
+                        f"{stored / seconds:8.0f} candles/s",
+                    )
+                )
+            report(
+                f"{count} streams x {args.limit} candles, "
+                f"{args.latency * 1000:.0f} ms latency",
+                rows,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Per-call latency of the inference backends (user-013).
+
+Fits a ``StandardScaler`` + ``LogisticRegression`` pipeline, logs it as an
+MLflow model and times ``predict`` through the pyfunc, native sklearn and
+compiled NumPy scorers for a single row and for batches.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import tempfile
+from pathlib import Path
+
+import mlflow.pyfunc
+import mlflow.sklearn
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+from timing import best_of, report
+
+from api.scorers import CompiledLinearScorer, NativeSklearnScorer, PyFuncScorer
+
+N_FEATURES = 12
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=2_000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 64, 4096])
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    rng = np.random.default_rng(0)
+    features = rng.normal(size=(10_000, N_FEATURES)) + 50
+    labels = (features[:, 0] + rng.normal(size=len(features)) > 50).astype(int)
+    pipeline = Pipeline(
+        [("scaler", StandardScaler()), ("classifier", LogisticRegression())]
+    ).fit(features, labels)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "model"
+        mlflow.sklearn.save_model(pipeline, path)
+        scorers = {
+            "pyfunc": PyFuncScorer(mlflow.pyfunc.load_model(str(path))),
+            "native": NativeSklearnScorer(pipeline),
+            "compiled": CompiledLinearScorer(pipeline),
+        }
+
+        for batch_size in args.batch_sizes:
+            batch = features[:batch_size]
+            expected = pipeline.predict(batch)
+            calls = max(1, args.calls * 64 // max(batch_size, 64))
+            rows = []
+            for label, scorer in scorers.items():
+                assert np.array_equal(np.asarray(scorer.predict(batch)), expected)
+
+                def _score(scorer=scorer, batch=batch, calls=calls) -> None:
+                    for _ in range(calls):
+                        scorer.predict(batch)
+
+                seconds, _ = best_of(_score)
+                rows.append(
+                    (label, seconds, f"{seconds / calls * 1e6:9.1f} us per call")
+                )
+            report(f"{calls} predict calls on {batch_size} rows", rows)
+
+
+if __name__ == "__main__":
+    main()
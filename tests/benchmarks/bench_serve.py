@@ -0,0 +1,174 @@
+"""Throughput and memory of the pre-fork server vs plain uvicorn (user-016).
+
+Saves a random-forest pipeline as a local MLflow model, starts the API with
+``python -m api.serve --workers N`` and with ``uvicorn --workers N``, and
+for each reports ``/predict/batch`` throughput from ``--concurrency`` client
+threads plus the workers' summed RSS and PSS. PSS splits shared pages
+between the processes sharing them, so the pre-forked workers' model pages
+count once in total. Throughput only scales with workers up to the number
+of cores left over by the client threads.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import httpx
+import mlflow.sklearn
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from timing import report
+
+N_FEATURES = 12
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _memory_kb(pid: int) -> tuple[int, int]:
+    """Return the ``(Rss, Pss)`` of ``pid`` in KiB."""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as handle:
+        for line in handle:
+            name, _, rest = line.partition(":")
+            if name in ("Rss", "Pss"):
+                values[name] = int(rest.split()[0])
+    return values["Rss"], values["Pss"]
+
+
+def _descendants(pid: int) -> list[int]:
+    children = []
+    for task in Path(f"/proc/{pid}/task").iterdir():
+        children += map(int, (task / "children").read_text().split())
+    return children + [grandchild for c in children for grandchild in _descendants(c)]
+
+
+def _load(url: str, body: bytes, seconds: float, concurrency: int) -> int:
+    done = 0
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def _client() -> None:
+        nonlocal done
+        with httpx.Client(timeout=30) as client:
+            while time.perf_counter() < deadline:
+                response = client.post(
+                    url, content=body, headers={"Content-Type": "application/json"}
+                )
+                response.raise_for_status()
+                with lock:
+                    done += 1
+
+    threads = [threading.Thread(target=_client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return done
+
+
+def _measure(command: list[str], port: int, env: dict, args) -> tuple[float, str]:
+    process = subprocess.Popen(
+        command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    base = f"http://127.0.0.1:{port}"
+    try:
+        started = time.perf_counter()
+        while True:
+            try:
+                if httpx.get(f"{base}/health").json()["status"] == "ok":
+                    break
+            except httpx.HTTPError:
+                pass
+            if process.poll() is not None or time.perf_counter() - started > 120:
+                raise RuntimeError(f"Server did not start: {' '.join(command)}")
+            time.sleep(0.2)
+        rows = np.random.default_rng(0).normal(size=(args.rows, N_FEATURES))
+        body = json.dumps({"features": rows.tolist()}).encode()
+        # Touch every worker so each has imported and loaded what it needs.
+        _load(f"{base}/predict/batch", body, 1.0, args.concurrency)
+        requests = _load(f"{base}/predict/batch", body, args.seconds, args.concurrency)
+        # Count the supervisor too: api.serve's holds the preloaded model.
+        processes = [process.pid, *_descendants(process.pid)]
+        rss, pss = map(sum, zip(*(_memory_kb(pid) for pid in processes)))
+        note = (
+            f"{requests / args.seconds:6.0f} req/s  "
+            f"RSS {rss / 1024:6.0f} MiB  PSS {pss / 1024:6.0f} MiB  "
+            f"({len(processes)} processes)"
+        )
+        return args.seconds, note
+    finally:
+        process.terminate()
+        process.wait(30)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--rows", type=int, default=16)
+    parser.add_argument("--trees", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    features = rng.normal(size=(20_000, N_FEATURES))
+    labels = (features[:, 0] + rng.normal(size=len(features)) > 0).astype(int)
+    model = RandomForestClassifier(n_estimators=args.trees, random_state=0)
+    model.fit(features, labels)
+
+    with tempfile.TemporaryDirectory() as directory:
+        model_path = Path(directory) / "model"
+        mlflow.sklearn.save_model(
+            model,
+            model_path,
+            input_example=features[:5],
+            skops_trusted_types=["sklearn.tree._tree.Tree"],
+        )
+        src = Path(__file__).resolve().parents[2] / "src"
+        env = {
+            **os.environ,
+            "PYTHONPATH": str(src),
+            "MODEL_URI": str(model_path),
+            "MLFLOW_DISABLE_AGENT_HINT": "1",
+        }
+        print(f"{os.cpu_count()} CPUs, {args.trees}-tree random forest")
+        for workers in args.workers:
+            port = _free_port()
+            commands = {
+                "api.serve (pre-fork)": [
+                    sys.executable, "-m", "api.serve", "--host", "127.0.0.1",
+                    "--port", str(port), "--workers", str(workers),
+                    "--log-level", "error",
+                ],
+                "uvicorn --workers": [
+                    sys.executable, "-m", "uvicorn", "api.app:app",
+                    "--host", "127.0.0.1", "--port", str(port),
+                    "--workers", str(workers), "--log-level", "error",
+                ],
+            }  # fmt: skip
+            rows = [
+                (label, *_measure(command, port, env, args))
+                for label, command in commands.items()
+            ]
+            report(
+                f"{workers} worker(s), {args.concurrency} clients, "
+                f"{args.rows}-row batches",
+                rows,
+            )
+
+
+if __name__ == "__main__":
+    main()
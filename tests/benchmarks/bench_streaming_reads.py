@@ -0,0 +1,140 @@
+"""Peak memory of full vs streamed table reads as the table grows (user-007).
+
+Fills ``btc_candles`` with synthetic minute candles in DuckDB, then reads it
+back in a fresh child process per (size, method), so each reports its own
+peak RSS above the post-import baseline:
+
+* ``fetch_rows``: every row as a tuple, all at once;
+* ``iter_rows``: tuples in batches of ``--batch-size``;
+* ``iter_columns``: NumPy column batches.
+
+Streamed reads should stay flat as the table grows; ``fetch_rows`` does not.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from timing import report
+
+from feature_delivery_service.tools.duckdb_storage_manager import (
+    DuckDBStorageManager,
+)
+from feature_delivery_service.tools.schemas import (
+    BASE_COLUMN_NAMES,
+    BASE_FIELDS_TYPES,
+)
+
+METHODS = ("fetch_rows", "iter_rows", "iter_columns")
+
+
+def _fill(path: Path, rows: int) -> None:
+    storage = DuckDBStorageManager(path)
+    try:
+        storage._ensure_schema(
+            storage.duckdb_create_table_statement(
+                BASE_COLUMN_NAMES, list(BASE_FIELDS_TYPES), "btc_candles"
+            )
+        )
+        storage.conn.execute(
+            """
+            INSERT INTO btc_candles BY NAME
+            SELECT
+                TIMESTAMP '2020-01-01' + i * INTERVAL 1 MINUTE AS open_time,
+                open_time + INTERVAL 59999 MILLISECOND AS close_time,
+                100.0 + i % 97 AS open_price,
+                101.0 + i % 97 AS high_price,
+                99.0 + i % 97 AS low_price,
+                100.0 + i % 89 AS close_price,
+                1.5 AS volume_btc,
+                150.0 + i % 89 AS volume_usd,
+                i % 50 AS trade_count,
+                0.7 AS taker_buy_volume_btc,
+                70.0 + i % 89 AS taker_buy_volume_usd
+            FROM range(?) AS t(i)
+            """,
+            [rows],
+        )
+    finally:
+        storage.close()
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _child(path: str, method: str, batch_size: int) -> None:
+    storage = DuckDBStorageManager(Path(path), read_only=True)
+    storage.count_rows("btc_candles")
+    baseline = _peak_rss_mb()
+    started = time.perf_counter()
+    kwargs = {"order_by": "open_time"}
+    if method == "fetch_rows":
+        rows = len(storage.fetch_rows("btc_candles", BASE_COLUMN_NAMES, **kwargs))
+    elif method == "iter_rows":
+        rows = sum(
+            len(batch)
+            for batch in storage.iter_rows(
+                "btc_candles", BASE_COLUMN_NAMES, batch_size=batch_size, **kwargs
+            )
+        )
+    else:
+        rows = sum(
+            len(batch["open_time"])
+            for batch in storage.iter_columns(
+                "btc_candles", BASE_COLUMN_NAMES, batch_size=batch_size, **kwargs
+            )
+        )
+    seconds = time.perf_counter() - started
+    print(rows, seconds, _peak_rss_mb() - baseline)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[100_000, 400_000, 1_600_000]
+    )
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--child", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        _child(*args.child, args.batch_size)
+        return
+    logging.basicConfig(level=logging.ERROR)
+
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            path = Path(directory) / f"candles_{size}.duckdb"
+            _fill(path, size)
+            rows = []
+            for method in METHODS:
+                output = subprocess.run(
+                    [
+                        sys.executable,
+                        __file__,
+                        "--child",
+                        str(path),
+                        method,
+                        "--batch-size",
+                        str(args.batch_size),
+                    ],
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                ).stdout.split()
+                stored, seconds, peak_mb = int(output[0]), *map(float, output[1:])
+                assert stored == size, (method, stored)
+                rows.append((method, seconds, f"peak RSS +{peak_mb:7.1f} MB"))
+            report(f"Read {size} candles (batches of {args.batch_size})", rows)
+
+
+if __name__ == "__main__":
+    main()
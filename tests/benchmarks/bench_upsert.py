@@ -0,0 +1,99 @@
+"""Row-by-row vs set-based candle upserts into DuckDB (user-002, user-003).
+
+Stores ``--rows`` decoded klines into a fresh table, then upserts a second
+batch overlapping half of it, through:
+
+* the original path: ``BitcoinCandle`` rows and ``executemany``;
+* ``upsert``: the same rows staged as one relation;
+* ``upsert_columnar``: NumPy columns, with and without repeated keys (the
+  repeated-key batch pays for the last-row-wins window).
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from stand_in import MINUTE_MS, START_MS, make_klines
+from timing import best_of, report
+
+from feature_delivery_service.tools.binance_client import BitcoinCandle
+from feature_delivery_service.tools.duckdb_storage_manager import (
+    DuckDBStorageManager,
+)
+from feature_delivery_service.tools.schemas import (
+    BASE_COLUMN_NAMES,
+    BASE_FIELDS_TYPES,
+    decode_klines_columnar,
+)
+
+TYPES = list(BASE_FIELDS_TYPES)
+
+
+def _executemany_upsert(storage: DuckDBStorageManager, table: str, rows) -> None:
+    """The upsert as it was before the set-based statement."""
+    ordered = sorted(rows, key=lambda c: c.open_time)
+    storage._ensure_schema(
+        storage.duckdb_create_table_statement(BASE_COLUMN_NAMES, TYPES, table)
+    )
+    storage.conn.executemany(
+        f"INSERT OR REPLACE INTO {table} ({', '.join(BASE_COLUMN_NAMES)}) "
+        f"VALUES ({', '.join(['?'] * len(BASE_COLUMN_NAMES))})",
+        [storage.row(candle, BASE_COLUMN_NAMES) for candle in ordered],
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=2_000)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    first = make_klines(args.rows)
+    second = make_klines(args.rows, START_MS + args.rows // 2 * MINUTE_MS)
+    candles = [[BitcoinCandle.from_binance(e) for e in b] for b in (first, second)]
+    columns = [decode_klines_columnar(batch) for batch in (first, second)]
+    # Every key of the overlapping batch twice, the second copy winning.
+    repeated = [
+        {name: np.concatenate([values, values]) for name, values in batch.items()}
+        for batch in columns
+    ]
+
+    def _run(store) -> int:
+        with tempfile.TemporaryDirectory() as directory:
+            storage = DuckDBStorageManager(Path(directory) / "bench.duckdb")
+            try:
+                for index in range(2):
+                    store(storage, index)
+                return storage.count_rows("btc_candles")
+            finally:
+                storage.close()
+
+    variants = {
+        "executemany (original)": lambda s, i: _executemany_upsert(
+            s, "btc_candles", candles[i]
+        ),
+        "upsert (rows)": lambda s, i: s.upsert(
+            "btc_candles", BASE_COLUMN_NAMES, TYPES, candles[i], "open_time"
+        ),
+        "upsert_columnar": lambda s, i: s.upsert_columnar(
+            "btc_candles", BASE_COLUMN_NAMES, TYPES, columns[i], "open_time"
+        ),
+        "upsert_columnar (2x keys)": lambda s, i: s.upsert_columnar(
+            "btc_candles", BASE_COLUMN_NAMES, TYPES, repeated[i], "open_time"
+        ),
+    }
+    rows = []
+    for label, store in variants.items():
+        # The original path takes milliseconds per row; time it once.
+        repeat = 1 if label.startswith("executemany") else 3
+        seconds, stored = best_of(lambda store=store: _run(store), repeat)
+        rows.append((label, seconds, f"{stored} rows stored"))
+    report(f"Upsert {args.rows} + {args.rows} overlapping candles", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""Timing helpers shared by the benchmark scripts in this directory.
+
+Benchmarks are plain scripts, not collected by pytest. Run them all with
+``task bench`` or one with
+``PYTHONPATH=src:tests python tests/benchmarks/<script>.py``.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Callable
+
+
+def best_of(fn: Callable[[], Any], repeat: int = 3) -> tuple[float, Any]:
+    """Return the fastest wall time of ``repeat`` calls and the last result."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def report(title: str, rows: list[tuple[str, float, str]]) -> None:
+    """Print ``(label, seconds, note)`` rows as an aligned table."""
+    print(f"\n{title}")
+    width = max(len(label) for label, _, _ in rows)
+    for label, seconds, note in rows:
+        print(f"  {label:<{width}}  {seconds:8.3f}s  {note}")
@@ -0,0 +1,86 @@
+"""Shared fixtures: throwaway DuckDB and MLFlow stores, synthetic Binance klines."""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+import mlflow
+import pytest
+from dateutil import tz
+from stand_in import START_MS, StandInBinance, make_kline, make_klines  # noqa: F401
+
+from feature_delivery_service.features import materialize_features
+from feature_delivery_service.tools import schemas, singletons
+from feature_delivery_service.tools.duckdb_storage_manager import (
+    DuckDBStorageManager,
+)
+from feature_delivery_service.tools.schemas import (
+    BASE_COLUMN_NAMES,
+    BASE_FIELDS_TYPES,
+    decode_klines_columnar,
+)
+
+
+def store_klines(
+    storage: DuckDBStorageManager, entries: list[list[Any]], table: str = "btc_candles"
+) -> int:
+    """Upsert raw klines into ``table`` the way ingestion does."""
+    return storage.upsert_columnar(
+        table=table,
+        columns=BASE_COLUMN_NAMES,
+        types=list(BASE_FIELDS_TYPES),
+        batch=decode_klines_columnar(entries),
+        sort_key="open_time",
+    )
+
+
+def store_feature_klines(
+    storage: DuckDBStorageManager, count: int, start_ms: int = START_MS
+) -> None:
+    """Store ``count`` one-minute klines and update the default feature set."""
+    store_klines(storage, make_klines(count, start_ms))
+    materialize_features(interval="1m")
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch) -> DuckDBStorageManager:
+    """A fresh DuckDB file installed as the storage singleton."""
+    manager = DuckDBStorageManager(tmp_path / "features.duckdb", read_only=False)
+    monkeypatch.setattr(singletons, "_duckdb_storage_manager", manager)
+    yield manager
+    singletons.reset_singletons()
+
+
+@pytest.fixture
+def binance() -> StandInBinance:
+    """A running stand-in klines endpoint."""
+    with StandInBinance() as server:
+        yield server
+
+
+@pytest.fixture
+def mlflow_tracking(tmp_path, monkeypatch) -> None:
+    """A throwaway MLFlow store; artifacts land under ``tmp_path`` too."""
+    monkeypatch.chdir(tmp_path)
+    # Inferring pip requirements imports the model in a subprocess, which
+    # takes seconds per logged model; the flavor defaults are enough here.
+    monkeypatch.setattr(
+        mlflow.models,
+        "infer_pip_requirements",
+        lambda model_uri, flavor, fallback=None, **kwargs: fallback,
+    )
+    mlflow.set_tracking_uri(f"sqlite:///{tmp_path / 'mlflow.db'}")
+    yield
+    mlflow.set_tracking_uri("")
+
+
+@pytest.fixture
+def berlin_tz(monkeypatch) -> None:
+    """Use Europe/Berlin, which has DST changes, as the local zone."""
+    monkeypatch.setenv("TZ", "Europe/Berlin")
+    time.tzset()
+    monkeypatch.setattr(schemas, "_LOCAL_TIMEZONE", tz.tzlocal())
+    yield
+    monkeypatch.undo()
+    time.tzset()
@@ -0,0 +1,187 @@
+"""A local stand-in for the Binance klines endpoint, for tests and benchmarks.
+
+Klines are generated on the fly for the requested ``startTime``/``endTime``
+/``limit``. Latency, random 5xx errors, scripted responses and the body
+framing (content-length, chunked, ``Connection: close``) can be injected.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import random
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Any
+from urllib.parse import parse_qs, urlparse
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+MINUTE_MS = 60_000
+# 2024-01-01T00:00:00Z, minute aligned.
+START_MS = 1_704_067_200_000
+
+_INTERVAL_UNITS_MS = {"s": 1_000, "m": 60_000, "h": 3_600_000, "d": 86_400_000}
+
+
+def make_kline(open_ms: int, close: float, interval_ms: int = MINUTE_MS) -> list:
+    """Return one kline in Binance's raw list format."""
+    return [
+        open_ms,
+        f"{close - 0.5:.2f}",
+        f"{close + 1:.2f}",
+        f"{close - 1:.2f}",
+        f"{close:.2f}",
+        "1.5",
+        open_ms + interval_ms - 1,
+        f"{1.5 * close:.2f}",
+        10,
+        "0.7",
+        f"{0.7 * close:.2f}",
+        "0",
+    ]
+
+
+def wavy_close(open_ms: int, interval_ms: int = MINUTE_MS) -> float:
+    """Deterministic close price for the candle opening at ``open_ms``."""
+    i = open_ms // interval_ms
+    return 100 + 10 * math.sin(i / 3) + (i % 7)
+
+
+def make_klines(
+    count: int, start_ms: int = START_MS, interval_ms: int = MINUTE_MS
+) -> list[list[Any]]:
+    """Return ``count`` consecutive klines with a deterministic wavy close."""
+    return [
+        make_kline(open_ms, wavy_close(open_ms, interval_ms), interval_ms)
+        for open_ms in range(start_ms, start_ms + count * interval_ms, interval_ms)
+    ]
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops bursts of concurrent connects, which
+    # then only succeed after a one-second SYN retransmit.
+    request_queue_size = 128
+
+
+class StandInBinance:
+    """Threaded HTTP/1.1 server answering ``GET /api/v3/klines``.
+
+    ``script`` holds canned responses, ``(status, headers, body)``, served
+    (and consumed) before any generated one. ``body`` may be ``bytes`` or
+    ``"truncate"`` to announce a longer body than is sent and drop the
+    connection.
+    """
+
+    def __init__(
+        self,
+        *,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        chunked: bool = False,
+        close_connections: bool = False,
+        used_weight: int | None = None,
+        seed: int = 0,
+    ) -> None:
+        self.latency = latency
+        self.error_rate = error_rate
+        self.chunked = chunked
+        self.close_connections = close_connections
+        self.used_weight = used_weight
+        self.script: deque[tuple[int, dict[str, str], Any]] = deque()
+        self.requests = 0
+        self.connections = 0
+        self.statuses: list[int] = []
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = _Server(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, args=(0.01,), daemon=True
+        )
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api/v3/klines"
+
+    def __enter__(self) -> Self:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _next_response(self, query: dict[str, str]) -> tuple[int, dict, Any]:
+        with self._lock:
+            self.requests += 1
+            if self.script:
+                return self.script.popleft()
+            failed = self.error_rate and self._random.random() < self.error_rate
+        if failed:
+            return 503, {}, b'{"code":-1001,"msg":"Internal error"}'
+        unit = query["interval"]
+        interval_ms = int(unit[:-1]) * _INTERVAL_UNITS_MS[unit[-1]]
+        limit = int(query.get("limit", 500))
+        end = int(query.get("endTime", time.time() * 1000))
+        start = int(query.get("startTime", end - limit * interval_ms))
+        first = -(-start // interval_ms) * interval_ms
+        count = max(0, min(limit, (end - first) // interval_ms + 1))
+        entries = make_klines(count, first, interval_ms)
+        return 200, {}, json.dumps(entries).encode("utf-8")
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def setup(self) -> None:
+                with stand_in._lock:
+                    stand_in.connections += 1
+                super().setup()
+
+            def do_GET(self) -> None:
+                query = {
+                    k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()
+                }
+                if stand_in.latency:
+                    time.sleep(stand_in.latency)
+                status, headers, body = stand_in._next_response(query)
+                with stand_in._lock:
+                    stand_in.statuses.append(status)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                if stand_in.used_weight is not None:
+                    self.send_header("X-MBX-USED-WEIGHT-1m", str(stand_in.used_weight))
+                if stand_in.close_connections:
+                    self.send_header("Connection", "close")
+                    self.close_connection = True
+                if body == "truncate":
+                    self.send_header("Content-Length", "1000")
+                    self.end_headers()
+                    self.wfile.write(b'[[1,"2"')
+                    self.close_connection = True
+                    return
+                if stand_in.chunked:
+                    self.send_header("Transfer-Encoding", "chunked")
+                    self.end_headers()
+                    for offset in range(0, len(body), 1000):
+                        chunk = body[offset : offset + 1000]
+                        self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                    self.wfile.write(b"0\r\n\r\n")
+                    return
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
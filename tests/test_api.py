@@ -0,0 +1,77 @@
+"""Malformed ``.npy`` bodies and wrong-width matrices are rejected with 422."""
+
+from __future__ import annotations
+
+import importlib
+import io
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+# ``api.app`` the attribute is the FastAPI instance; fetch the module itself.
+app_module = importlib.import_module("api.app")
+
+
+class _SumScorer:
+    backend = "stub"
+    n_features = 3
+
+    def predict(self, features):
+        return (np.asarray(features).sum(axis=1) > 0).astype(int)
+
+
+@pytest.fixture
+def client(monkeypatch) -> TestClient:
+    monkeypatch.setattr(app_module, "load_model", _SumScorer)
+    return TestClient(app_module.create_app())
+
+
+def _npy(array: np.ndarray) -> bytes:
+    buffer = io.BytesIO()
+    np.save(buffer, array, allow_pickle=True)
+    return buffer.getvalue()
+
+
+def _post_npy(client: TestClient, body: bytes):
+    return client.post(
+        "/predict/batch/npy",
+        content=body,
+        headers={"Content-Type": "application/octet-stream"},
+    )
+
+
+def test_npy_batch_scores_rows(client):
+    response = _post_npy(client, _npy(np.array([[1, 2, 3], [-1, -2, -3]])))
+
+    assert response.status_code == 200
+    assert response.json() == {"predictions": [1, 0]}
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        pytest.param(b"", id="empty"),
+        pytest.param(b"not an npy file", id="garbage"),
+        pytest.param(_npy(np.array([[1.0, None, 2.0]], dtype=object)), id="object"),
+        pytest.param(
+            _npy(np.zeros(2, dtype=[("a", "f8"), ("b", "f8"), ("c", "f8")])),
+            id="structured",
+        ),
+        pytest.param(_npy(np.array([["a", "b", "c"]])), id="strings"),
+        pytest.param(_npy(np.ones((2, 3), dtype=np.complex128)), id="complex"),
+        pytest.param(_npy(np.ones(3)), id="1-d"),
+        pytest.param(_npy(np.ones((1, 2, 3))), id="3-d"),
+        pytest.param(_npy(np.ones((0, 3))), id="no rows"),
+        pytest.param(_npy(np.ones((2, 4))), id="wrong width"),
+    ],
+)
+def test_npy_batch_rejects_malformed_bodies(client, body):
+    assert _post_npy(client, body).status_code == 422
+
+
+def test_json_batch_rejects_wrong_width(client):
+    response = client.post("/predict/batch", json={"features": [[1.0, 2.0]]})
+
+    assert response.status_code == 422
+    assert response.json()["detail"] == "Expected 3 features per row, got 2"
@@ -0,0 +1,154 @@
+"""AsyncBinanceClient against the stand-in klines server."""
+
+from __future__ import annotations
+
+import asyncio
+
+import numpy as np
+import pytest
+from stand_in import START_MS, make_klines
+
+from feature_delivery_service.tools.async_binance_client import (
+    AsyncBinanceClient,
+    _KlineArrayDecoder,
+)
+from feature_delivery_service.tools.binance_client import BinanceClient
+
+END_MS = START_MS + 999 * 60_000
+
+
+def _fetch(binance, requests: int = 1, **client_kwargs) -> list[list]:
+    async def _run() -> list[list]:
+        client_kwargs.setdefault("backoff_base", 0.001)
+        async with AsyncBinanceClient(base_url=binance.url, **client_kwargs) as client:
+            results = []
+            for _ in range(requests):
+                results.append(
+                    await client.fetch_klines(
+                        interval="1m", limit=1000, start_time=START_MS, end_time=END_MS
+                    )
+                )
+            return results
+
+    return asyncio.run(_run())
+
+
+@pytest.mark.parametrize("chunked", [False, True])
+def test_decodes_content_length_and_chunked_bodies(binance, chunked):
+    binance.chunked = chunked
+
+    (entries,) = _fetch(binance)
+
+    assert entries == make_klines(1000)
+
+
+def test_reuses_keep_alive_connections(binance):
+    results = _fetch(binance, requests=5)
+
+    assert len(results) == 5
+    assert binance.connections == 1
+
+
+def test_does_not_reuse_connection_after_connection_close(binance):
+    binance.close_connections = True
+
+    results = _fetch(binance, requests=3)
+
+    assert all(len(entries) == 1000 for entries in results)
+    assert binance.connections == 3
+
+
+def test_retries_server_errors_with_backoff(binance):
+    binance.script.extend([(503, {}, b"busy"), (502, {}, b"busy")])
+
+    (entries,) = _fetch(binance)
+
+    assert len(entries) == 1000
+    assert binance.statuses == [503, 502, 200]
+
+
+def test_honours_retry_after_on_429(binance):
+    binance.script.append((429, {"Retry-After": "0"}, b'{"code":-1003}'))
+
+    (entries,) = _fetch(binance)
+
+    assert len(entries) == 1000
+    assert binance.statuses == [429, 200]
+
+
+def test_gives_up_after_max_retries(binance):
+    binance.error_rate = 1.0
+
+    with pytest.raises(RuntimeError, match="status 503"):
+        _fetch(binance, max_retries=2)
+    assert binance.requests == 3
+
+
+def test_client_errors_are_not_retried(binance):
+    binance.script.append((400, {}, b'{"code":-1100}'))
+
+    with pytest.raises(RuntimeError, match="status 400"):
+        _fetch(binance)
+    assert binance.requests == 1
+
+
+def test_retries_a_truncated_body_on_a_new_connection(binance):
+    binance.script.append((200, {}, "truncate"))
+
+    (entries,) = _fetch(binance)
+
+    assert len(entries) == 1000
+    assert binance.connections == 2
+
+
+def test_malformed_payload_raises_runtime_error(binance):
+    binance.script.append((200, {}, b'[[1,"2"],'))
+
+    with pytest.raises(RuntimeError, match="malformed"):
+        _fetch(binance)
+    assert binance.requests == 1
+
+
+def test_sync_client_also_raises_runtime_error_on_malformed_payload(binance):
+    binance.script.append((200, {}, b'[[1,"2"],'))
+
+    with pytest.raises(RuntimeError, match="Malformed"):
+        BinanceClient(base_url=binance.url).fetch_klines(interval="1m")
+
+
+def test_matches_sync_client_columns(binance):
+    async def _columns() -> dict[str, np.ndarray]:
+        async with AsyncBinanceClient(base_url=binance.url) as client:
+            return await client.fetch_candle_columns(
+                interval="1m", limit=500, start_time=START_MS
+            )
+
+    expected = BinanceClient(base_url=binance.url).fetch_candle_columns(
+        interval="1m", limit=500, start_time=START_MS
+    )
+    actual = asyncio.run(_columns())
+
+    assert actual.keys() == expected.keys()
+    for name in expected:
+        np.testing.assert_array_equal(actual[name], expected[name])
+
+
+def test_decoder_handles_byte_sized_chunks():
+    payload = b' [[1,"2.5",3], [4,"5",[6]]\n]'
+    decoder = _KlineArrayDecoder()
+
+    entries = []
+    for offset in range(len(payload)):
+        entries.extend(decoder.feed(payload[offset : offset + 1]))
+    decoder.close()
+
+    assert entries == [[1, "2.5", 3], [4, "5", [6]]]
+
+
+@pytest.mark.parametrize("payload", [b"[[1,2],[3", b'{"code":-1}', b"[\xff]"])
+def test_decoder_rejects_malformed_payloads(payload):
+    decoder = _KlineArrayDecoder()
+
+    with pytest.raises(RuntimeError):
+        decoder.feed(payload)
+        decoder.close()
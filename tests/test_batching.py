@@ -0,0 +1,64 @@
+"""MicroBatcher hands predict failures to every caller in the batch."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+
+import numpy as np
+
+from api.batching import MicroBatcher
+
+
+class _Rejected(Exception):
+    pass
+
+
+def _predict(matrix: np.ndarray) -> list:
+    if (matrix < 0).any():
+        raise _Rejected("negative feature")
+    if (matrix == 0).any():
+        raise ZeroDivisionError("zero feature")
+    return matrix.sum(axis=1).tolist()
+
+
+async def _submit_all(batcher: MicroBatcher, rows: list[list[float]]) -> list:
+    return await asyncio.gather(
+        *(batcher.submit(row) for row in rows), return_exceptions=True
+    )
+
+
+def test_failure_reaches_every_caller_and_is_logged_once(caplog):
+    batcher = MicroBatcher(_predict, max_wait_ms=50, expected_errors=(_Rejected,))
+
+    async def _run() -> tuple[list, list]:
+        failed = await _submit_all(batcher, [[1.0, 2.0], [0.0, 1.0], [3.0, 4.0]])
+        # The worker keeps serving after a failed batch.
+        return failed, await _submit_all(batcher, [[1.0, 2.0], [3.0, 4.0]])
+
+    with caplog.at_level(logging.ERROR, logger="api.batching"):
+        failed, served = asyncio.run(_run())
+
+    assert all(isinstance(result, ZeroDivisionError) for result in failed)
+    assert served == [3.0, 7.0]
+    assert len(caplog.records) == 1
+    assert caplog.records[0].exc_info[0] is ZeroDivisionError
+
+
+def test_expected_errors_are_not_logged(caplog):
+    batcher = MicroBatcher(_predict, max_wait_ms=50, expected_errors=(_Rejected,))
+
+    with caplog.at_level(logging.ERROR, logger="api.batching"):
+        results = asyncio.run(_submit_all(batcher, [[-1.0], [1.0]]))
+
+    assert all(isinstance(result, _Rejected) for result in results)
+    assert caplog.records == []
+
+
+def test_wrong_prediction_count_fails_the_batch():
+    batcher = MicroBatcher(lambda matrix: [0], max_wait_ms=50)
+
+    results = asyncio.run(_submit_all(batcher, [[1.0], [2.0]]))
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert "1 predictions for 2 rows" in str(results[0])
@@ -0,0 +1,113 @@
+"""BinanceClient rate limiting and backfill against the stand-in server."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+from stand_in import MINUTE_MS, START_MS, StandInBinance
+
+from feature_delivery_service.backfill import run_bitcoin_backfill
+from feature_delivery_service.tools import binance_client
+from feature_delivery_service.tools.binance_client import BinanceClient, RateLimiter
+
+RATE_LIMITED = b'{"code":-1003,"msg":"Too many requests"}'
+
+
+def _fetch(client: BinanceClient) -> list:
+    return client.fetch_klines(
+        interval="1m", limit=10, start_time=START_MS, end_time=START_MS + 9 * MINUTE_MS
+    )
+
+
+@pytest.mark.parametrize("status", [418, 429])
+def test_retries_after_the_retry_after_delay(binance, status):
+    binance.script.append((status, {"Retry-After": "0.2"}, RATE_LIMITED))
+    client = BinanceClient(base_url=binance.url)
+
+    started = time.monotonic()
+    entries = _fetch(client)
+
+    assert time.monotonic() - started >= 0.2
+    assert len(entries) == 10
+    assert binance.statuses == [status, 200]
+
+
+def test_retry_after_pauses_every_caller_sharing_the_limiter(binance):
+    binance.script.append((429, {"Retry-After": "0.3"}, RATE_LIMITED))
+    limiter = RateLimiter()
+    first = BinanceClient(base_url=binance.url, rate_limiter=limiter)
+    second = BinanceClient(base_url=binance.url, rate_limiter=limiter)
+    thread = threading.Thread(target=_fetch, args=(first,))
+    thread.start()
+    while limiter.reserve(0) <= 0:  # until the 429 has been handled
+        time.sleep(0.005)
+
+    started = time.monotonic()
+    _fetch(second)
+    thread.join()
+
+    assert time.monotonic() - started >= 0.2
+    assert binance.statuses == [429, 200, 200]
+
+
+def test_gives_up_after_max_retries(binance):
+    for _ in range(3):
+        binance.script.append((429, {"Retry-After": "0"}, RATE_LIMITED))
+    client = BinanceClient(base_url=binance.url, max_retries=2)
+
+    with pytest.raises(RuntimeError, match="status 429"):
+        _fetch(client)
+    assert binance.requests == 3
+
+
+def test_other_client_errors_are_not_retried(binance):
+    binance.script.append((400, {}, b'{"code":-1121,"msg":"Invalid symbol."}'))
+    client = BinanceClient(base_url=binance.url)
+
+    with pytest.raises(RuntimeError, match="status 400"):
+        _fetch(client)
+    assert binance.requests == 1
+
+
+def test_used_weight_header_pauses_until_next_minute():
+    limiter = RateLimiter(weight_limit=1200)
+    with StandInBinance(used_weight=1100) as server:
+        _fetch(BinanceClient(base_url=server.url, rate_limiter=limiter))
+
+    assert limiter.reserve(2) > 0
+
+
+def test_local_weight_budget_is_shared(monkeypatch):
+    # Pin the clock mid-minute so the budget cannot roll over.
+    monkeypatch.setattr(binance_client.time, "time", lambda: 1_800_000_030.0)
+    limiter = RateLimiter(weight_limit=10)
+
+    assert [limiter.reserve(2) for _ in range(4)] == [0.0] * 4
+    assert limiter.reserve(2) == pytest.approx(30.0)
+
+
+def test_backfill_survives_rate_limiting(binance, storage):
+    binance.script.extend(
+        [
+            (429, {"Retry-After": "0.05"}, RATE_LIMITED),
+            (418, {"Retry-After": "0"}, RATE_LIMITED),
+        ]
+    )
+    client = BinanceClient(base_url=binance.url, max_retries=3)
+    end_ms = START_MS + 2_500 * MINUTE_MS
+
+    new_rows, total_rows = run_bitcoin_backfill(
+        START_MS,
+        end_ms,
+        interval="1m",
+        table="btc_candles",
+        max_workers=2,
+        client=client,
+        storage=storage,
+    )
+
+    assert new_rows == total_rows == 2_500
+    assert binance.statuses.count(200) == 3
+    assert sorted(binance.statuses)[-2:] == [418, 429]
@@ -0,0 +1,78 @@
+"""Walk-forward fold layout and the per-fold scaler statistics."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from sklearn.preprocessing import StandardScaler
+
+from model_training_service.cross_validation import (
+    LABEL_HORIZON,
+    Fold,
+    fold_scalers,
+    walk_forward_folds,
+)
+
+
+def test_expanding_folds_leave_the_label_horizon_out():
+    folds = walk_forward_folds(120, 5)
+
+    assert LABEL_HORIZON == 1
+    assert folds == [
+        Fold(0, 0, 19, 20, 40),
+        Fold(1, 0, 39, 40, 60),
+        Fold(2, 0, 59, 60, 80),
+        Fold(3, 0, 79, 80, 100),
+        Fold(4, 0, 99, 100, 120),
+    ]
+
+
+def test_sliding_folds_with_gap_and_test_size():
+    folds = walk_forward_folds(100, 3, test_size=10, gap=5, max_train_size=30)
+
+    assert [
+        (fold.train_start, fold.train_end, fold.test_start, fold.test_end)
+        for fold in folds
+    ] == [(35, 65, 70, 80), (45, 75, 80, 90), (55, 85, 90, 100)]
+    assert all(fold.train_rows == 30 and fold.test_rows == 10 for fold in folds)
+
+
+@pytest.mark.parametrize(
+    ("n_samples", "kwargs"),
+    [
+        (100, {"gap": 0}),
+        (100, {"n_folds": 0}),
+        (5, {"n_folds": 5}),
+        (100, {"n_folds": 4, "test_size": 25}),
+    ],
+)
+def test_walk_forward_folds_rejects_invalid_layouts(n_samples, kwargs):
+    with pytest.raises(ValueError):
+        walk_forward_folds(n_samples, **kwargs)
+
+
+@pytest.mark.parametrize("max_train_size", [None, 250])
+def test_fold_scalers_match_fitting_each_training_window(max_train_size):
+    rng = np.random.default_rng(7)
+    # A large price level and a constant column exercise the shifted sums
+    # and the zero-variance scale.
+    features = np.column_stack(
+        [
+            40_000 + rng.normal(0, 5, 1_000),
+            rng.normal(0, 1, 1_000),
+            np.full(1_000, 3.0),
+        ]
+    )
+    folds = walk_forward_folds(1_000, 4, max_train_size=max_train_size)
+
+    scalers = fold_scalers(features, folds)
+
+    assert sorted(scalers) == [fold.number for fold in folds]
+    for fold in folds:
+        expected = StandardScaler().fit(features[fold.train_start : fold.train_end])
+        actual = scalers[fold.number]
+        np.testing.assert_allclose(actual.mean_, expected.mean_, rtol=1e-12)
+        np.testing.assert_allclose(actual.var_, expected.var_, rtol=1e-7, atol=1e-9)
+        np.testing.assert_allclose(actual.scale_, expected.scale_, rtol=1e-7)
+        assert actual.n_samples_seen_ == expected.n_samples_seen_
+        assert actual.n_features_in_ == expected.n_features_in_
@@ -0,0 +1,199 @@
+"""Upserts, pushed-down reads and re-clustering of the DuckDB storage manager."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+COLUMNS = ["open_time", "close"]
+TYPES = ["BIGINT", "DOUBLE"]
+
+
+def _stored(storage) -> list[tuple]:
+    return storage.conn.execute(
+        "SELECT open_time, close FROM candles ORDER BY open_time"
+    ).fetchall()
+
+
+def _batch(kind: str, open_time: list[int], close: list[float]):
+    columns = {"open_time": np.array(open_time), "close": np.array(close)}
+    if kind == "dataframe":
+        return pd.DataFrame(columns)
+    if kind == "arrow":
+        return pa.table(columns)
+    return columns
+
+
+@pytest.mark.parametrize("kind", ["mapping", "dataframe", "arrow"])
+def test_upsert_columnar_keeps_last_duplicate(storage, kind):
+    storage.upsert_columnar(
+        "candles", COLUMNS, TYPES, _batch(kind, [1, 2], [1.0, 2.0]), "open_time"
+    )
+
+    inserted = storage.upsert_columnar(
+        "candles",
+        COLUMNS,
+        TYPES,
+        _batch(kind, [3, 2, 3, 2, 4], [3.0, 2.1, 3.1, 2.2, 4.0]),
+        "open_time",
+    )
+
+    assert inserted == 2
+    assert _stored(storage) == [(1, 1.0), (2, 2.2), (3, 3.1), (4, 4.0)]
+
+
+@pytest.mark.parametrize(
+    "batch", [[(1, 1.0)], np.array([[1, 1.0]]), pa.record_batch({"open_time": [1]})]
+)
+def test_upsert_columnar_rejects_unsupported_batches(storage, batch):
+    with pytest.raises(TypeError, match="batch must be"):
+        storage.upsert_columnar("candles", COLUMNS, TYPES, batch, "open_time")
+    assert not storage.table_exists("candles")
+
+
+def test_upsert_rows_keeps_last_duplicate(storage):
+    rows = [
+        SimpleNamespace(open_time=open_time, close=close)
+        for open_time, close in [(5, 5.0), (1, 1.0), (5, 5.5)]
+    ]
+
+    assert storage.upsert("candles", COLUMNS, TYPES, rows, "open_time") == 2
+    assert _stored(storage) == [(1, 1.0), (5, 5.5)]
+
+
+def test_upsert_columnar_composite_key_keeps_last_duplicate(storage):
+    batch = {
+        "symbol": ["BTC", "ETH", "BTC", "ETH"],
+        "open_time": [1, 1, 1, 2],
+        "close": [1.0, 10.0, 1.5, 20.0],
+    }
+
+    inserted = storage.upsert_columnar(
+        "candles",
+        ["symbol", *COLUMNS],
+        ["VARCHAR", *TYPES],
+        batch,
+        "open_time",
+        key_columns=["symbol", "open_time"],
+    )
+
+    assert inserted == 3
+    assert storage.conn.execute(
+        "SELECT symbol, open_time, close FROM candles ORDER BY ALL"
+    ).fetchall() == [("BTC", 1, 1.5), ("ETH", 1, 10.0), ("ETH", 2, 20.0)]
+
+
+def test_upsert_query_rejects_duplicate_keys(storage):
+    with pytest.raises(ValueError, match="repeated keys"):
+        storage.upsert_query(
+            "candles",
+            COLUMNS,
+            TYPES,
+            "SELECT * FROM (VALUES (1, 1.0), (1, 2.0)) AS v(open_time, close)",
+            "open_time",
+        )
+    assert _stored(storage) == []
+
+
+def _store_range(storage, open_times: list[int]) -> None:
+    storage.upsert_columnar(
+        "candles",
+        COLUMNS,
+        TYPES,
+        {"open_time": open_times, "close": [float(t) for t in open_times]},
+        "open_time",
+    )
+
+
+def test_fetch_rows_pushes_bounds_and_predicates_down(storage):
+    _store_range(storage, list(range(10)))
+
+    rows = storage.fetch_rows(
+        "candles",
+        COLUMNS,
+        start=2,
+        end=8,
+        where=[("close", ">", 3.0), ("close", "!=", 5.0)],
+        order_by="open_time",
+        order_desc=True,
+        limit=3,
+    )
+
+    assert rows == [(7, 7.0), (6, 6.0), (4, 4.0)]
+    query, params = storage._select_query(
+        "candles",
+        COLUMNS,
+        limit=3,
+        start=2,
+        end=8,
+        where=[("close", ">", 3.0)],
+        order_by=None,
+        order_desc=False,
+    )
+    # Values only ever travel as parameters.
+    assert params == [2, 8, 3.0, 3]
+    assert "WHERE open_time >= ? AND open_time < ? AND close > ?" in query
+    assert (
+        storage.fetch_columns("candles", ["open_time"], where=[("close", "=", None)])[
+            "open_time"
+        ].size
+        == 0
+    )
+
+
+@pytest.mark.parametrize(
+    "predicate",
+    [("close", "LIKE", 1.0), ("close", "; DROP", 1.0), ("close", "<", None)],
+)
+def test_fetch_rows_rejects_unsupported_predicates(storage, predicate):
+    _store_range(storage, [1])
+
+    with pytest.raises(ValueError):
+        storage.fetch_rows("candles", COLUMNS, where=[predicate])
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"table": "candles; DROP TABLE candles"},
+        {"columns": ["open_time", "close) FROM candles --"]},
+        {"where": [("close OR 1=1", "=", 1.0)]},
+        {"order_by": "open_time DESC, close"},
+        {"columns": []},
+    ],
+)
+def test_fetch_rows_rejects_bad_identifiers(storage, kwargs):
+    _store_range(storage, [1])
+    arguments = {"table": "candles", "columns": COLUMNS, **kwargs}
+    table, columns = arguments.pop("table"), arguments.pop("columns")
+
+    with pytest.raises(ValueError):
+        storage.fetch_rows(table, columns, **arguments)
+    assert _stored(storage) == [(1, 1.0)]
+
+
+def test_cluster_rewrites_rows_in_order_and_keeps_the_key(storage):
+    _store_range(storage, [10, 11, 12])
+    # Older rows (like a backfill) and a replaced row land after newer ones.
+    _store_range(storage, [1, 2, 11])
+    physical_order = "SELECT open_time FROM candles"
+    assert storage.conn.execute(physical_order).fetchall() != sorted(
+        storage.conn.execute(physical_order).fetchall()
+    )
+
+    storage.cluster("candles", "open_time")
+
+    physical = storage.conn.execute(physical_order).fetchall()
+    assert [row[0] for row in physical] == [1, 2, 10, 11, 12]
+    assert (
+        storage.upsert_columnar(
+            "candles", COLUMNS, TYPES, {"open_time": [2], "close": [2.5]}, "open_time"
+        )
+        == 0
+    )
+    assert (2, 2.5) in _stored(storage)
+    assert not storage.table_exists("_unclustered_candles")
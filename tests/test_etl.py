@@ -0,0 +1,83 @@
+"""Set-based SQL labels agree with the Python reference implementation."""
+
+from __future__ import annotations
+
+from dataclasses import astuple
+
+import pytest
+from conftest import store_klines
+from stand_in import MINUTE_MS, make_klines
+
+from feature_delivery_service.etl import _label_candles, build_labeled_candles_query
+from feature_delivery_service.reader import load_candles_from_duckdb
+
+# 2024-03-31T00:00Z and 2024-10-27T00:00Z: the Europe/Berlin DST changes
+# happen one hour later (spring forward, fall back).
+SPRING_FORWARD_MS = 1_711_843_200_000
+FALL_BACK_MS = 1_729_987_200_000
+
+
+@pytest.fixture
+def berlin_time(berlin_tz, storage):
+    """Run with Europe/Berlin as the local zone, where candles are stored."""
+    storage.conn.execute("SET TimeZone = 'Europe/Berlin'")
+
+
+def _sql_labels(storage, interval_ms: int | None) -> list[tuple]:
+    query, params = build_labeled_candles_query(interval_ms=interval_ms)
+    return storage.conn.execute(f"{query} ORDER BY open_time", params).fetchall()
+
+
+def _python_labels(interval_ms: int | None) -> list[tuple]:
+    candles = load_candles_from_duckdb(order_desc=False)
+    return [astuple(candle) for candle in _label_candles(candles, interval_ms)]
+
+
+def _delete_rows(storage, offsets: list[int]) -> None:
+    storage.conn.execute(
+        """
+        DELETE FROM btc_candles WHERE open_time IN (
+            SELECT open_time FROM (
+                SELECT open_time, ROW_NUMBER() OVER (ORDER BY open_time) - 1 AS n
+                FROM btc_candles
+            ) WHERE list_contains(?, n)
+        )
+        """,
+        [offsets],
+    )
+
+
+@pytest.mark.parametrize("interval_ms", [None, MINUTE_MS])
+def test_sql_labels_match_reference(storage, interval_ms):
+    store_klines(storage, make_klines(300))
+
+    labels = _sql_labels(storage, interval_ms)
+
+    assert labels == _python_labels(interval_ms)
+    assert len(labels) == 298
+
+
+def test_sql_labels_match_reference_across_gaps(storage):
+    store_klines(storage, make_klines(300))
+    _delete_rows(storage, [50, 51, 52, 200])
+
+    guarded = _sql_labels(storage, MINUTE_MS)
+
+    assert guarded == _python_labels(MINUTE_MS)
+    assert _sql_labels(storage, None) == _python_labels(None)
+    # Both candles next to each gap lose their label.
+    assert len(guarded) == 296 - 2 - 4
+
+
+@pytest.mark.parametrize("start_ms", [SPRING_FORWARD_MS, FALL_BACK_MS])
+def test_sql_labels_match_reference_across_dst_changes(storage, berlin_time, start_ms):
+    # Naive local keys repeat in the fall-back hour, so fewer rows are
+    # stored there (a known limitation); parity is checked on what is stored.
+    store_klines(storage, make_klines(180, start_ms))
+    stored = storage.count_rows("btc_candles")
+
+    labels = _sql_labels(storage, MINUTE_MS)
+
+    assert labels == _python_labels(MINUTE_MS)
+    # A DST change is not a gap: only the first and last candle are unlabeled.
+    assert len(labels) == stored - 2
@@ -0,0 +1,62 @@
+"""Incremental feature materialization matches a full rebuild."""
+
+from __future__ import annotations
+
+import numpy as np
+from conftest import make_kline, make_klines, store_klines
+
+from feature_delivery_service.features import (
+    DEFAULT_FEATURE_SET,
+    LABEL_COLUMN,
+    materialize_features,
+)
+
+
+def _feature_rows(storage) -> dict[str, list]:
+    rows = storage.conn.execute(
+        f"SELECT {', '.join(DEFAULT_FEATURE_SET.columns)} "
+        f"FROM {DEFAULT_FEATURE_SET.table} ORDER BY open_time"
+    ).fetchall()
+    return dict(zip(DEFAULT_FEATURE_SET.columns, map(list, zip(*rows))))
+
+
+def _assert_same_rows(actual: dict[str, list], expected: dict[str, list]) -> None:
+    assert actual.keys() == expected.keys()
+    for name in ("open_time", "close_time", LABEL_COLUMN):
+        assert actual[name] == expected[name], name
+    for name in DEFAULT_FEATURE_SET.feature_names:
+        # Rolling sums over different frames differ in the last bits only.
+        np.testing.assert_allclose(
+            actual[name], expected[name], rtol=1e-9, atol=1e-12, err_msg=name
+        )
+
+
+def test_incremental_matches_full_rebuild_after_in_progress_candle(storage):
+    entries = make_klines(100)
+    store_klines(storage, entries)
+    materialize_features(interval="1m")
+
+    # The newest candle was stored while in progress; its final close flips
+    # the previous row's label.
+    last = entries[-1]
+    previous_close = float(entries[-2][4])
+    in_progress_close = float(last[4])
+    final_close = previous_close + (-1.0 if in_progress_close > previous_close else 1.0)
+    more = make_klines(5, start_ms=last[0] + 60_000)
+    store_klines(storage, [make_kline(last[0], final_close), *more])
+
+    materialize_features(interval="1m")
+    incremental = _feature_rows(storage)
+    materialize_features(incremental=False, interval="1m")
+
+    _assert_same_rows(incremental, _feature_rows(storage))
+    assert len(incremental["open_time"]) == 105 - DEFAULT_FEATURE_SET.lookback
+
+
+def test_incremental_run_without_new_candles_changes_nothing(storage):
+    store_klines(storage, make_klines(80))
+    materialize_features(interval="1m")
+    before = _feature_rows(storage)
+
+    assert materialize_features(interval="1m") == 0
+    _assert_same_rows(_feature_rows(storage), before)
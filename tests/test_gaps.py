@@ -0,0 +1,150 @@
+"""Gap detection, targeted repair and the repair step of ``ingest_and_label``."""
+
+from __future__ import annotations
+
+import time
+from datetime import datetime
+
+import numpy as np
+from conftest import make_klines, store_klines
+from stand_in import MINUTE_MS, START_MS
+
+import feature_delivery_service as fds
+from feature_delivery_service.etl import materialize_labeled_candles
+from feature_delivery_service.features import DEFAULT_FEATURE_SET, materialize_features
+from feature_delivery_service.gaps import find_gaps, repair_gaps
+from feature_delivery_service.tools import singletons
+from feature_delivery_service.tools.binance_client import BinanceClient
+
+
+def _local(epoch_ms: int) -> datetime:
+    return datetime.fromtimestamp(epoch_ms / 1000)
+
+
+def _store_with_holes(storage, count: int, holes: set[int], start_ms: int = START_MS):
+    entries = [
+        entry
+        for offset, entry in enumerate(make_klines(count, start_ms))
+        if offset not in holes
+    ]
+    store_klines(storage, entries)
+
+
+def _rows(storage, table: str, columns) -> list[tuple]:
+    return storage.conn.execute(
+        f"SELECT {', '.join(columns)} FROM {table} ORDER BY open_time"
+    ).fetchall()
+
+
+def _rows_from_entries(entries) -> list[tuple]:
+    return [(_local(entry[0]), float(entry[4])) for entry in entries]
+
+
+def test_find_gaps_reports_missing_ranges(storage):
+    _store_with_holes(storage, 100, {10, 11, 12, 50})
+
+    gaps = find_gaps(table="btc_candles", interval="1m", storage=storage)
+
+    assert [(gap.start_ms, gap.end_ms, gap.missing) for gap in gaps] == [
+        (START_MS + 10 * MINUTE_MS, START_MS + 13 * MINUTE_MS, 3),
+        (START_MS + 50 * MINUTE_MS, START_MS + 51 * MINUTE_MS, 1),
+    ]
+    assert gaps[0].after == _local(START_MS + 9 * MINUTE_MS)
+    assert gaps[0].before == _local(START_MS + 13 * MINUTE_MS)
+
+    later = find_gaps(
+        table="btc_candles",
+        interval="1m",
+        start=_local(START_MS + 20 * MINUTE_MS),
+        storage=storage,
+    )
+    assert [gap.missing for gap in later] == [1]
+
+
+def test_find_gaps_is_empty_for_contiguous_candles(storage):
+    store_klines(storage, make_klines(100))
+
+    assert find_gaps(table="btc_candles", interval="1m", storage=storage) == []
+
+
+def test_repair_gaps_refetches_only_missing_windows(storage, binance):
+    _store_with_holes(storage, 100, {10, 11, 12, 50})
+    expected = _rows(storage, "btc_candles", ["open_time", "close_price"])
+    gaps = find_gaps(table="btc_candles", interval="1m", storage=storage)
+
+    repaired = repair_gaps(
+        gaps,
+        table="btc_candles",
+        interval="1m",
+        client=BinanceClient(base_url=binance.url),
+        storage=storage,
+    )
+
+    assert repaired == 4
+    assert binance.requests == 2
+    assert find_gaps(table="btc_candles", interval="1m", storage=storage) == []
+    stored = _rows(storage, "btc_candles", ["open_time", "close_price"])
+    assert len(stored) == 100
+    # The stand-in serves the same deterministic candles that were removed.
+    assert set(expected) < set(stored)
+    assert stored == _rows_from_entries(make_klines(100))
+
+
+def test_ingest_and_label_repairs_downtime_incrementally(storage, binance, monkeypatch):
+    monkeypatch.setattr(
+        singletons, "_binance_client", BinanceClient(base_url=binance.url)
+    )
+    now_ms = int(time.time() * 1000) // MINUTE_MS * MINUTE_MS
+    # Downtime longer than one 500-candle ingestion window, plus an older
+    # hole the repair step must leave alone.
+    _store_with_holes(storage, 600, {100, 101}, start_ms=now_ms - 2000 * MINUTE_MS)
+    materialize_labeled_candles(incremental=False)
+    materialize_features()
+
+    summary = fds.ingest_and_label()
+
+    assert summary["gaps_found"] == 1
+    assert summary["gap_rows_repaired"] > 0
+    gaps = find_gaps(table="btc_candles", interval="1m", storage=storage)
+    assert [gap.missing for gap in gaps] == [2]
+
+    label_columns = ["open_time", "next_close_price_gt_curr"]
+    incremental_labels = _rows(storage, "btc_candles_labeled", label_columns)
+    incremental_features = _rows(
+        storage, DEFAULT_FEATURE_SET.table, DEFAULT_FEATURE_SET.columns
+    )
+    storage.conn.execute("DROP TABLE btc_candles_labeled")
+    storage.conn.execute(f"DROP TABLE {DEFAULT_FEATURE_SET.table}")
+    materialize_labeled_candles(incremental=False)
+    materialize_features()
+
+    assert incremental_labels == _rows(storage, "btc_candles_labeled", label_columns)
+    rebuilt_features = _rows(
+        storage, DEFAULT_FEATURE_SET.table, DEFAULT_FEATURE_SET.columns
+    )
+    assert len(incremental_features) == len(rebuilt_features)
+    np.testing.assert_allclose(
+        np.array([row[2:] for row in incremental_features], dtype=float),
+        np.array([row[2:] for row in rebuilt_features], dtype=float),
+        rtol=1e-9,
+        atol=1e-12,
+    )
+    assert [row[:2] for row in incremental_features] == [
+        row[:2] for row in rebuilt_features
+    ]
+
+
+def test_repair_gaps_and_label_reclusters_candles(storage, binance, monkeypatch):
+    monkeypatch.setattr(
+        singletons, "_binance_client", BinanceClient(base_url=binance.url)
+    )
+    _store_with_holes(storage, 100, {10, 11, 12, 50})
+
+    summary = fds.repair_gaps_and_label()
+
+    assert summary["gap_rows_repaired"] == 4
+    physical = storage.conn.execute("SELECT open_time FROM btc_candles").fetchall()
+    assert [row[0] for row in physical] == [
+        _local(entry[0]) for entry in make_klines(100)
+    ]
+    assert summary["labeled_rows"] == 98
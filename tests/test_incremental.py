@@ -0,0 +1,89 @@
+"""Resuming ``partial_fit`` training from a logged model and its high-water mark."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+import mlflow
+import numpy as np
+import pytest
+from conftest import store_feature_klines
+from sklearn.linear_model import SGDClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+from stand_in import MINUTE_MS, START_MS
+
+from MLOps_service.tracking import (
+    TRAINED_UNTIL_TAG,
+    run_incremental_training_with_tracking,
+)
+from model_training_service.incremental import train_incremental_sgd_classifier
+from model_training_service.training import FEATURE_COLUMNS
+
+
+def _latest_labeled_open_time(storage) -> datetime:
+    return storage.conn.execute(
+        "SELECT MAX(open_time) FROM btc_features_v1 "
+        "WHERE next_close_price_gt_curr IS NOT NULL"
+    ).fetchone()[0]
+
+
+def test_resume_streams_only_rows_after_trained_until(storage):
+    store_feature_klines(storage, 200)
+    first = train_incremental_sgd_classifier(batch_size=64)
+    assert first.trained_until == _latest_labeled_open_time(storage)
+
+    store_feature_klines(storage, 50, START_MS + 200 * MINUTE_MS)
+    coef_before = first.model.named_steps["clf"].coef_.copy()
+    resumed = train_incremental_sgd_classifier(
+        base_model=first.model, trained_until=first.trained_until, batch_size=64
+    )
+
+    # The row that was newest before is labeled now, plus 49 new ones.
+    assert resumed.rows_trained == 50
+    assert resumed.trained_until == _latest_labeled_open_time(storage)
+    assert set(resumed.metrics) == {"prequential_accuracy", "prequential_log_loss"}
+    assert resumed.model is first.model
+    assert not np.array_equal(resumed.model.named_steps["clf"].coef_, coef_before)
+
+
+def test_resume_rejects_a_model_of_another_feature_width(storage):
+    store_feature_klines(storage, 100)
+    rng = np.random.default_rng(0)
+    old_features = rng.normal(size=(20, 10))
+    old_model = Pipeline(
+        steps=[("scaler", StandardScaler()), ("clf", SGDClassifier(loss="log_loss"))]
+    ).fit(old_features, np.arange(20) % 2)
+
+    with pytest.raises(ValueError, match=f"10 features .* {len(FEATURE_COLUMNS)}"):
+        train_incremental_sgd_classifier(
+            base_model=old_model, trained_until=datetime(2024, 1, 1)
+        )
+
+
+def test_tracked_resume_round_trips_trained_until(storage, mlflow_tracking):
+    store_feature_klines(storage, 150)
+    first = run_incremental_training_with_tracking("incremental", batch_size=64)
+    first_run = mlflow.last_active_run()
+    tag = first_run.data.tags[TRAINED_UNTIL_TAG]
+    assert datetime.fromisoformat(tag) == first.trained_until
+
+    # Nothing newer than the tag: no run is created.
+    assert (
+        run_incremental_training_with_tracking(
+            "incremental", resume_run_id=first_run.info.run_id
+        )
+        is None
+    )
+
+    store_feature_klines(storage, 30, START_MS + 150 * MINUTE_MS)
+    resumed = run_incremental_training_with_tracking(
+        "incremental", resume_run_id=first_run.info.run_id, batch_size=64
+    )
+    resumed_run = mlflow.last_active_run()
+    assert resumed.rows_trained == 30
+    assert resumed_run.info.run_id != first_run.info.run_id
+    assert resumed_run.data.params["resumed_from"] == first_run.info.run_id
+    assert datetime.fromisoformat(
+        resumed_run.data.tags[TRAINED_UNTIL_TAG]
+    ) == _latest_labeled_open_time(storage)
@@ -0,0 +1,66 @@
+"""The columnar kline decoder agrees with ``BitcoinCandle.from_binance``."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from stand_in import START_MS, make_kline, make_klines
+
+from feature_delivery_service.tools.binance_client import BitcoinCandle
+from feature_delivery_service.tools.schemas import (
+    BASE_COLUMN_NAMES,
+    decode_klines_columnar,
+)
+
+HOUR_MS = 3_600_000
+# 2024-03-31T00:00Z and 2024-10-27T00:00Z: hourly candles around the
+# Europe/Berlin DST changes, including the skipped and the repeated hour.
+DST_KLINES = [
+    *make_klines(6, 1_711_843_200_000, HOUR_MS),
+    *make_klines(6, 1_729_987_200_000, HOUR_MS),
+]
+
+
+def _assert_decoders_agree(entries: list[list]) -> None:
+    columns = decode_klines_columnar(entries)
+    candles = [BitcoinCandle.from_binance(entry) for entry in entries]
+
+    assert list(columns) == BASE_COLUMN_NAMES
+    for name in BASE_COLUMN_NAMES:
+        expected = [getattr(candle, name) for candle in candles]
+        assert columns[name].tolist() == expected, name
+
+
+@pytest.mark.parametrize(
+    "entries",
+    [
+        pytest.param(make_klines(500), id="minutes"),
+        pytest.param(DST_KLINES, id="dst"),
+        pytest.param(
+            # Binance sends prices and volumes as decimal strings.
+            [make_kline(START_MS, 42_123.456789), make_kline(START_MS, 0.01)],
+            id="precision",
+        ),
+    ],
+)
+def test_columnar_decoder_matches_row_decoder(entries):
+    _assert_decoders_agree(entries)
+
+
+def test_columnar_decoder_matches_row_decoder_across_dst(berlin_tz):
+    _assert_decoders_agree(DST_KLINES)
+
+
+def test_columnar_decoder_keeps_epoch_ms():
+    entries = make_klines(3)
+    columns = decode_klines_columnar(entries, epoch_ms=True)
+
+    assert columns["open_time"].dtype == np.int64
+    assert columns["open_time"].tolist() == [entry[0] for entry in entries]
+    assert columns["close_time"].tolist() == [entry[6] for entry in entries]
+
+
+def test_columnar_decoder_handles_no_entries():
+    columns = decode_klines_columnar([])
+
+    assert all(len(values) == 0 for values in columns.values())
@@ -0,0 +1,47 @@
+"""The compiled linear scorer reproduces the sklearn pipeline it folds."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from api.scorers import CompiledLinearScorer
+
+
+def _fitted_pipeline(with_mean: bool, with_std: bool) -> tuple[Pipeline, np.ndarray]:
+    rng = np.random.default_rng(0)
+    # Offset, unevenly scaled features so a wrongly folded mean or scale shows.
+    features = rng.normal(size=(2_000, 6)) * [1, 5, 0.1, 20, 2, 3] + 50
+    signal = features @ [1.0, -0.2, 4.0, 0.05, -0.5, 0.3]
+    labels = (signal > np.median(signal)).astype(int)
+    pipeline = Pipeline(
+        [
+            ("scaler", StandardScaler(with_mean=with_mean, with_std=with_std)),
+            ("classifier", LogisticRegression(max_iter=5_000)),
+        ]
+    ).fit(features, labels)
+    return pipeline, rng.normal(size=(5_000, 6)) * [1, 5, 0.1, 20, 2, 3] + 50
+
+
+@pytest.mark.parametrize("with_std", [True, False])
+@pytest.mark.parametrize("with_mean", [True, False])
+def test_compiled_scorer_matches_pipeline(with_mean, with_std):
+    pipeline, features = _fitted_pipeline(with_mean, with_std)
+    scorer = CompiledLinearScorer(pipeline)
+
+    np.testing.assert_allclose(
+        features @ scorer.weights + scorer.intercept,
+        pipeline.decision_function(features),
+        rtol=1e-9,
+        atol=1e-9,
+    )
+    np.testing.assert_array_equal(scorer.predict(features), pipeline.predict(features))
+
+
+def test_compiled_scorer_rejects_other_pipelines():
+    pipeline, _ = _fitted_pipeline(True, True)
+    with pytest.raises(TypeError, match="two-step"):
+        CompiledLinearScorer(Pipeline(pipeline.steps[:1]))
@@ -0,0 +1,60 @@
+"""Arrays shared with worker processes through memory-mapped ``.npy`` files."""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from model_training_service.shared_arrays import (
+    attach_arrays,
+    attached_array,
+    shared_arrays,
+)
+
+
+def _column_sum(name: str) -> list[float]:
+    return attached_array(name).sum(axis=0).tolist()
+
+
+def test_workers_read_the_shared_arrays():
+    features = np.arange(12, dtype=np.float64).reshape(4, 3)
+
+    with (
+        shared_arrays({"features": features}) as directory,
+        ProcessPoolExecutor(
+            max_workers=2, initializer=attach_arrays, initargs=(directory,)
+        ) as pool,
+    ):
+        sums = list(pool.map(_column_sum, ["features"] * 3))
+
+    assert sums == [features.sum(axis=0).tolist()] * 3
+    assert not os.path.exists(directory)
+
+
+def test_attached_arrays_are_read_only_memory_maps():
+    # A strided view is written out contiguously.
+    labels = np.arange(10, dtype=np.int8)[::2]
+
+    with shared_arrays({"labels": labels, "other": np.zeros(2)}) as directory:
+        with open(os.path.join(directory, "notes.txt"), "w") as handle:
+            handle.write("not an array")
+        attach_arrays(directory)
+        attached = attached_array("labels")
+
+        assert isinstance(attached, np.memmap)
+        np.testing.assert_array_equal(attached, labels)
+        assert attached.dtype == np.int8
+        with pytest.raises(ValueError):
+            attached[0] = 1
+        with pytest.raises(RuntimeError, match="'notes'"):
+            attached_array("notes")
+
+    # Attaching another directory replaces what was attached before.
+    with shared_arrays({"features": np.ones(3)}) as directory:
+        attach_arrays(directory)
+        with pytest.raises(RuntimeError, match="'labels'"):
+            attached_array("labels")
+        del attached
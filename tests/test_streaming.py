@@ -0,0 +1,79 @@
+"""Streaming sources and the StreamIngestor write path."""
+
+from __future__ import annotations
+
+import asyncio
+
+from stand_in import START_MS, make_klines
+
+from feature_delivery_service.features import DEFAULT_FEATURE_SET
+from feature_delivery_service.streaming import (
+    PollingSource,
+    ReplaySource,
+    StreamIngestor,
+)
+from feature_delivery_service.tools.async_binance_client import AsyncBinanceClient
+
+
+def _first_batch(binance) -> list[list]:
+    async def _run() -> list[list]:
+        async with AsyncBinanceClient(base_url=binance.url, max_retries=0) as client:
+            source = PollingSource(
+                client, interval="1s", start_time=START_MS, poll_delay=0.0
+            )
+            async for entries in source:
+                return entries
+        return []
+
+    return asyncio.run(asyncio.wait_for(_run(), timeout=10))
+
+
+def test_polling_survives_a_malformed_payload(binance):
+    binance.script.append((200, {}, b'[[1,"2"],'))
+
+    entries = _first_batch(binance)
+
+    assert entries == make_klines(1000, START_MS, 1000)
+    assert binance.requests == 2
+
+
+def test_polling_survives_an_api_error(binance):
+    binance.script.append((400, {}, b'{"code":-1100}'))
+
+    entries = _first_batch(binance)
+
+    assert len(entries) == 1000
+    assert binance.requests == 2
+
+
+def test_stream_ingestor_replays_into_candles_labels_and_features(storage):
+    ingestor = StreamIngestor(interval="1m", max_batch_rows=64, report_every=3600)
+    batch_sizes: list[int] = []
+    write_batch = ingestor._write_batch
+
+    def _record_batch(batch):
+        batch_sizes.append(len(batch))
+        write_batch(batch)
+
+    ingestor._write_batch = _record_batch
+
+    stats = asyncio.run(
+        asyncio.wait_for(ingestor.run(ReplaySource(make_klines(300))), timeout=60)
+    )
+
+    assert storage.count_rows("btc_candles") == 300
+    # The first and last candles lack a neighbour to be labeled against.
+    assert storage.count_rows("btc_candles_labeled") == 298
+    assert storage.count_rows(DEFAULT_FEATURE_SET.table) == 240
+    # The replay is queued faster than it is written, so batches fill up.
+    assert batch_sizes == [64, 64, 64, 64, 44]
+
+    summary = stats.summary()
+    assert summary["klines"] == 300
+    assert summary["new_rows"] == 300
+    assert summary["batches"] == len(batch_sizes)
+    assert summary["pushed_rows"] == 0
+    assert summary["close_to_stored_p50"] <= summary["close_to_stored_p95"]
+    assert summary["close_to_stored_p95"] <= summary["close_to_stored_max"]
+    assert summary["receive_to_stored_max"] >= 0
+    assert "close_to_pushed_p50" not in summary
@@ -0,0 +1,146 @@
+"""Search-space expansion, estimator construction and failed trials."""
+
+from __future__ import annotations
+
+import json
+
+import mlflow
+import numpy as np
+import pytest
+from conftest import store_feature_klines
+
+from MLOps_service.tracking import run_tuning_with_tracking
+from model_training_service import tuning
+from model_training_service.tuning import (
+    Trial,
+    build_estimator,
+    expand_search_space,
+    iter_trial_results,
+)
+
+
+def test_expand_search_space_skips_unsupported_penalty_solver_pairs():
+    trials = expand_search_space(
+        {
+            "logistic_regression": {
+                "C": [0.1, 1.0],
+                "penalty": ["l1", "l2", "elasticnet"],
+                "solver": ["liblinear", "saga", "lbfgs"],
+            },
+            "xgboost": {"max_depth": [3, 6]},
+        }
+    )
+
+    pairs = {
+        (trial.params["penalty"], trial.params["solver"])
+        for trial in trials
+        if trial.family == "logistic_regression"
+    }
+    assert pairs == {
+        ("l1", "liblinear"),
+        ("l1", "saga"),
+        ("l2", "liblinear"),
+        ("l2", "saga"),
+        ("l2", "lbfgs"),
+        ("elasticnet", "saga"),
+    }
+    assert len(trials) == 2 * len(pairs) + 2
+    assert [trial.number for trial in trials] == list(range(len(trials)))
+    assert trials[-1] == Trial(len(trials) - 1, "xgboost", {"max_depth": 6})
+
+
+def test_expand_search_space_defaults_to_l2_and_lbfgs():
+    trials = expand_search_space(
+        {
+            "logistic_regression": {"penalty": ["l1", "l2"]},
+            "xgboost": {},
+        }
+    )
+
+    # l1 needs an explicit solver; lbfgs (the default) cannot fit it. An
+    # empty grid still yields the family's default trial.
+    assert [(trial.family, trial.params) for trial in trials] == [
+        ("logistic_regression", {"penalty": "l2"}),
+        ("xgboost", {}),
+    ]
+
+
+@pytest.mark.parametrize(("penalty", "l1_ratio"), [("l1", 1.0), ("l2", 0.0)])
+def test_build_estimator_translates_penalty_to_l1_ratio(monkeypatch, penalty, l1_ratio):
+    monkeypatch.setattr(tuning, "_PENALTY_AS_L1_RATIO", True)
+
+    model = build_estimator(
+        "logistic_regression", {"C": 0.5, "penalty": penalty, "solver": "saga"}, 7
+    )
+
+    assert [name for name, _ in model.steps] == ["scaler", "clf"]
+    params = model.named_steps["clf"].get_params()
+    assert params["l1_ratio"] == l1_ratio
+    assert params["C"] == 0.5
+    assert params["solver"] == "saga"
+    assert params["random_state"] == 7
+    assert params["max_iter"] == 500
+
+
+def test_build_estimator_keeps_penalty_before_l1_ratio_deprecation(monkeypatch):
+    monkeypatch.setattr(tuning, "_PENALTY_AS_L1_RATIO", False)
+
+    model = build_estimator("logistic_regression", {"penalty": "l1"})
+
+    assert model.named_steps["clf"].get_params()["penalty"] == "l1"
+
+
+def test_build_estimator_builds_xgboost_and_rejects_unknown_families():
+    model = build_estimator("xgboost", {"max_depth": 2}, 3)
+
+    assert [name for name, _ in model.steps] == ["clf"]
+    params = model.named_steps["clf"].get_params()
+    assert (params["max_depth"], params["n_jobs"], params["random_state"]) == (2, 1, 3)
+    with pytest.raises(ValueError, match="Unknown model family"):
+        build_estimator("random_forest", {})
+
+
+def _split(rows: int = 200):
+    rng = np.random.default_rng(0)
+    features = rng.normal(size=(rows, 3))
+    labels = (features[:, 0] > 0).astype(np.int8)
+    cut = rows * 4 // 5
+    return features[:cut], features[cut:], labels[:cut], labels[cut:]
+
+
+def test_iter_trial_results_collects_failed_trials():
+    trials = [
+        Trial(0, "logistic_regression", {"C": 1.0}),
+        Trial(1, "logistic_regression", {"C": -1.0}),
+    ]
+    failed: list[Trial] = []
+
+    results = list(iter_trial_results(_split(), trials, max_workers=2, failed=failed))
+
+    assert [result.trial for result in results] == [trials[0]]
+    assert results[0].metrics["accuracy"] > 0.9
+    assert failed == [trials[1]]
+
+
+def test_tuning_fails_when_every_trial_of_a_family_fails(
+    storage, mlflow_tracking, tmp_path
+):
+    store_feature_klines(storage, 300)
+    space = tmp_path / "space.json"
+    space.write_text(
+        json.dumps(
+            {
+                "logistic_regression": {"C": [-1.0, -2.0]},
+                "xgboost": {"max_depth": [2]},
+            }
+        )
+    )
+
+    with pytest.raises(RuntimeError, match="logistic_regression"):
+        run_tuning_with_tracking(
+            "tuning", search_space_path=space, max_workers=2, limit=None
+        )
+
+    parent = mlflow.last_active_run()
+    assert parent.data.metrics["failed_trials"] == 2
+    assert parent.info.status == "FAILED"